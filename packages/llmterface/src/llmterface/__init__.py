@@ -1,13 +1,19 @@
 import logging
 
 from llmterface.llmterface import LLMterface
+from llmterface.models.chat_history import ChatHistory, ChatTurn
+from llmterface.models.context_window import ContextWindow
 from llmterface.models.generic_chat import GenericChat
 from llmterface.models.generic_config import GenericConfig
 from llmterface.models.generic_model_types import GenericModelType
-from llmterface.models.generic_response import GenericResponse
+from llmterface.models.generic_response import Answer, GenericResponse, ResponseMetadata, StreamChunk
 from llmterface.models.question import Question
-from llmterface.providers.provider_chat import ProviderChat
+from llmterface.models.retry_policy import RetryPolicy
+from llmterface.providers.circuit_breaker import CircuitBreakerPolicy, CircuitState
+from llmterface.providers.provider_chat import BatchState, ProviderChat
 from llmterface.providers.provider_config import ProviderConfig
+from llmterface.providers.rate_limiter import RateLimit
+from llmterface.router import Route, Router
 
 logging.getLogger("llmterface").addHandler(logging.NullHandler())
 
@@ -15,10 +21,23 @@ logging.getLogger("llmterface").addHandler(logging.NullHandler())
 __all__ = [
     "LLMterface",
     "Question",
+    "RetryPolicy",
+    "ContextWindow",
     "GenericChat",
+    "ChatHistory",
+    "ChatTurn",
     "GenericConfig",
     "GenericModelType",
     "GenericResponse",
+    "Answer",
+    "ResponseMetadata",
+    "StreamChunk",
     "ProviderConfig",
     "ProviderChat",
+    "BatchState",
+    "RateLimit",
+    "CircuitBreakerPolicy",
+    "CircuitState",
+    "Route",
+    "Router",
 ]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+if t.TYPE_CHECKING:
+    from llmterface.models.generic_chat import GenericChat
+
+logger = logging.getLogger("llmterface")
+
+
+@dataclass(slots=True)
+class ChatStoreStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ChatStore(ABC):
+    """
+    Storage for the persistent chats of an `LLMterface`, keyed by chat id.
+    """
+
+    stats: ChatStoreStats
+
+    @abstractmethod
+    def get(self, chat_id: str) -> GenericChat | None: ...
+
+    @abstractmethod
+    def set(self, chat: GenericChat) -> None: ...
+
+    @abstractmethod
+    def pop(self, chat_id: str) -> GenericChat | None: ...
+
+    @abstractmethod
+    def values(self) -> list[GenericChat]: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def __contains__(self, chat_id: str) -> bool:
+        return self.get(chat_id) is not None
+
+    def close(self) -> None:
+        """
+        Close and remove every chat in the store.
+        """
+        for chat in self.values():
+            self.pop(chat.id)
+            chat.close()
+
+
+class MemoryChatStore(ChatStore):
+    """
+    In-process chat store with optional LRU and idle-time eviction.
+
+    max_size:
+        Maximum number of chats kept. When exceeded, the least recently used chats are evicted.
+        `None` keeps every chat.
+    idle_ttl:
+        Seconds a chat may go unused before it is evicted. `None` disables idle eviction.
+    on_evict:
+        Called with each evicted chat before it is closed, e.g. to persist its history.
+
+    Evicted chats are closed with `GenericChat.close()`. Eviction happens on access,
+    or explicitly through `evict_idle()`.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        idle_ttl: float | None = None,
+        on_evict: t.Callable[[GenericChat], None] | None = None,
+    ):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self.stats = ChatStoreStats()
+        self._chats: OrderedDict[str, tuple[GenericChat, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chat_id: str) -> GenericChat | None:
+        with self._lock:
+            evicted = self._collect_evictions()
+            entry = self._chats.get(chat_id)
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                self._chats[chat_id] = (entry[0], time.monotonic())
+                self._chats.move_to_end(chat_id)
+        self._evict(evicted)
+        return entry[0] if entry is not None else None
+
+    def set(self, chat: GenericChat) -> None:
+        with self._lock:
+            replaced = self._chats.pop(chat.id, None)
+            self._chats[chat.id] = (chat, time.monotonic())
+            evicted = self._collect_evictions()
+        self._evict(evicted)
+        if replaced is not None and replaced[0] is not chat:
+            replaced[0].close()
+
+    def pop(self, chat_id: str) -> GenericChat | None:
+        with self._lock:
+            entry = self._chats.pop(chat_id, None)
+        return entry[0] if entry is not None else None
+
+    def values(self) -> list[GenericChat]:
+        with self._lock:
+            return [chat for chat, _ in self._chats.values()]
+
+    def evict_idle(self) -> int:
+        """
+        Evict chats that exceeded the idle TTL or the size bound.
+        Returns the number of chats evicted.
+        """
+        with self._lock:
+            evicted = self._collect_evictions()
+        self._evict(evicted)
+        return len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._chats)
+
+    def __contains__(self, chat_id: str) -> bool:
+        return chat_id in self._chats
+
+    def _collect_evictions(self) -> list[GenericChat]:
+        evicted: list[GenericChat] = []
+        if self.idle_ttl is not None:
+            cutoff = time.monotonic() - self.idle_ttl
+            for chat_id, (chat, last_used) in list(self._chats.items()):
+                if last_used > cutoff:
+                    break
+                del self._chats[chat_id]
+                evicted.append(chat)
+        if self.max_size is not None:
+            while len(self._chats) > self.max_size:
+                evicted.append(self._chats.popitem(last=False)[1][0])
+        self.stats.evictions += len(evicted)
+        return evicted
+
+    def _evict(self, chats: list[GenericChat]) -> None:
+        for chat in chats:
+            try:
+                if self.on_evict is not None:
+                    self.on_evict(chat)
+            except Exception:
+                logger.warning("Error in chat eviction callback", exc_info=True)
+            try:
+                chat.close()
+            except Exception:
+                logger.warning("Error while closing evicted chat", exc_info=True)
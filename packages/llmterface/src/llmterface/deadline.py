@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import llmterface.exceptions as ex
+
+_EXPIRES_AT: ContextVar[float | None] = ContextVar("llmterface_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> t.Generator[float | None]:
+    """
+    Bound the enclosed block to `seconds` from now, or to the enclosing deadline if that ends sooner.
+
+    Yields the effective expiry as a `time.monotonic()` value, or None when no deadline applies.
+    Scopes nest, so a deadline set by `LLMterface.ask` carries through routing, retries and
+    every provider attempt below it.
+    """
+    with deadline_until(expiry_in(seconds)) as expires_at:
+        yield expires_at
+
+
+@contextmanager
+def deadline_until(expires_at: float | None) -> t.Generator[float | None]:
+    """
+    Like `deadline_scope`, but bounded by an absolute `time.monotonic()` expiry.
+    Generators re-enter the scope around each step with this, since a context
+    variable set inside a generator would leak to its caller between yields.
+    """
+    current = _EXPIRES_AT.get()
+    if expires_at is None or (current is not None and current <= expires_at):
+        yield current
+        return
+    token = _EXPIRES_AT.set(expires_at)
+    try:
+        yield expires_at
+    finally:
+        _EXPIRES_AT.reset(token)
+
+
+def expiry_in(seconds: float | None) -> float | None:
+    """
+    The `time.monotonic()` value `seconds` from now, capped by the current deadline.
+    """
+    current = _EXPIRES_AT.get()
+    if seconds is None:
+        return current
+    expires_at = time.monotonic() + seconds
+    return expires_at if current is None else min(current, expires_at)
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left before the current deadline, or None when there is none.
+    Providers read this to bound their own calls, e.g. with an HTTP timeout.
+    """
+    expires_at = _EXPIRES_AT.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def is_expired(expires_at: float | None) -> bool:
+    return expires_at is not None and time.monotonic() >= expires_at
+
+
+def check_deadline() -> None:
+    """
+    Raise `TimeoutError` when the current deadline has passed.
+    """
+    if (left := remaining_time()) is not None and left <= 0:
+        raise ex.TimeoutError("Deadline exceeded before the request could be sent")
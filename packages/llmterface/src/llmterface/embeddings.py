@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import typing as t
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Embeddings require the 'numpy' package. Install it with `pip install llmterface[embeddings]`."
+    ) from e
+
+
+def make_embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache stored in a SQLite database, shareable between processes.
+
+    Vectors are keyed by a hash of the embedding model and the text, and stored as raw
+    float32 bytes, so a hit costs no provider call and no parsing.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def get_many(self, model: str, texts: t.Sequence[str]) -> dict[str, np.ndarray]:
+        """
+        Return the cached vectors of `texts`, keyed by text. Missing texts are left out.
+        """
+        keys = {make_embedding_key(model, text): text for text in texts}
+        found: dict[str, np.ndarray] = dict()
+        items = list(keys)
+        with self._lock:
+            # stay below SQLite's limit on bound parameters
+            for start in range(0, len(items), 500):
+                chunk = items[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def set_many(self, model: str, vectors: t.Mapping[str, np.ndarray]) -> None:
+        rows = [
+            (make_embedding_key(model, text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in vectors.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def dedupe(texts: t.Sequence[str]) -> tuple[list[str], np.ndarray]:
+    """
+    Return the distinct texts in first-seen order, and for every input the index of its distinct text.
+    """
+    positions: dict[str, int] = dict()
+    inverse = np.fromiter(
+        (positions.setdefault(text, len(positions)) for text in texts), dtype=np.intp, count=len(texts)
+    )
+    return list(positions), inverse
+
+
+def assemble(unique: t.Sequence[str], inverse: np.ndarray, vectors: t.Mapping[str, np.ndarray]) -> np.ndarray:
+    """
+    Build the output matrix from the distinct texts' vectors: one row per input, in input order.
+    """
+    if not unique:
+        return np.empty((0, 0), dtype=np.float32)
+    matrix = np.stack([vectors[text] for text in unique]).astype(np.float32, copy=False)
+    return np.ascontiguousarray(matrix[inverse])
+
+
+def to_matrix(vectors: t.Sequence[t.Sequence[float] | np.ndarray]) -> np.ndarray:
+    """
+    Pack vectors into one contiguous float32 matrix.
+    """
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
@@ -18,6 +18,20 @@ class ProviderError(ClientError):
         self.original_exception = original_exception
 
 
+class CircuitOpenError(ProviderError):
+    """Raised without contacting the provider while its circuit breaker is open."""
+
+    def __init__(self, message: str = "", retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TimeoutError(ProviderError):
+    """Raised when a request timeout or the deadline of a question expires."""
+
+    pass
+
+
 class SchemaError(ClientError):
     """Raised when there is a schema validation error."""
 
@@ -1,8 +1,12 @@
+import threading
 import typing as t
+from collections import OrderedDict
 from copy import deepcopy
 
 from pydantic import BaseModel
 
+_MISSING: t.Any = object()
+
 
 def compile_values(base: t.Any, override: t.Any, merge: bool = True) -> t.Any:
     if override is None:
@@ -36,3 +40,75 @@ def compile_values(base: t.Any, override: t.Any, merge: bool = True) -> t.Any:
 
     result.update(deepcopy(dict(override)))
     return result
+
+
+def make_hashable(value: t.Any) -> t.Hashable:
+    """
+    Recursively convert a value into a hashable equivalent for use in cache keys.
+    """
+    if isinstance(value, BaseModel):
+        return (type(value), make_hashable(value.model_dump()))
+    if isinstance(value, t.Mapping):
+        return tuple(sorted(((make_hashable(k), make_hashable(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(make_hashable(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(make_hashable(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class LRUCache[K: t.Hashable, V]:
+    """
+    Thread-safe bounded mapping that evicts the least recently used entry.
+    """
+
+    def __init__(self, max_size: int = 128):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: K, factory: t.Callable[[], V]) -> V:
+        """
+        Return the cached value for `key`, building and storing it with `factory` on a miss.
+        The factory runs outside the lock, so concurrent misses may build the value more than once.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
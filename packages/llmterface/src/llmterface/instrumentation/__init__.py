@@ -0,0 +1,23 @@
+from llmterface.instrumentation.hooks import (
+    Event,
+    Hook,
+    Phase,
+    add_hook,
+    clear_hooks,
+    emit,
+    has_hooks,
+    remove_hook,
+    span,
+)
+
+__all__ = [
+    "Event",
+    "Hook",
+    "Phase",
+    "add_hook",
+    "clear_hooks",
+    "emit",
+    "has_hooks",
+    "remove_hook",
+    "span",
+]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+logger = logging.getLogger("llmterface")
+
+
+class Phase(StrEnum):
+    provider_config = "provider_config"  # resolving the provider config for a question
+    request = "request"  # one provider round-trip
+    parse = "parse"  # JSON decoding of a response
+    # response-model validation of the decoded response. Pydantic models are decoded and validated
+    # in one pydantic-core pass, timed under `parse`; their `validate` event has a zero duration.
+    validate = "validate"
+    retry = "retry"  # a failed attempt that will be retried; duration is the backoff delay
+    circuit = "circuit"  # a circuit breaker changed state; attributes hold the new and previous state
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """
+    One timed phase of an ask. Times are in seconds.
+    """
+
+    phase: Phase | str
+    duration: float = 0.0
+    chat_id: str | None = None
+    provider: str | None = None
+    model_id: str | None = None
+    attempt: int | None = None
+    error: BaseException | None = None
+    prompt_tokens: int | None = None
+    output_tokens: int | None = None
+    attributes: t.Mapping[str, t.Any] = field(default_factory=dict)
+
+
+type Hook = t.Callable[[Event], None]
+
+_HOOKS: list[Hook] = []
+_HOOKS_LOCK = threading.Lock()
+
+
+def add_hook(hook: Hook) -> Hook:
+    """
+    Register a callable that receives every instrumentation event.
+    Returns the hook so it can be used as a decorator.
+    """
+    with _HOOKS_LOCK:
+        _HOOKS.append(hook)
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    with _HOOKS_LOCK:
+        if hook in _HOOKS:
+            _HOOKS.remove(hook)
+
+
+def clear_hooks() -> None:
+    with _HOOKS_LOCK:
+        _HOOKS.clear()
+
+
+def has_hooks() -> bool:
+    return bool(_HOOKS)
+
+
+def emit(event: Event) -> None:
+    """
+    Send an event to every hook. Hook failures are logged and never reach the caller.
+    """
+    for hook in tuple(_HOOKS):
+        try:
+            hook(event)
+        except Exception:
+            logger.warning("Instrumentation hook %r failed", hook, exc_info=True)
+
+
+@contextmanager
+def span(phase: Phase | str, **fields: t.Any) -> t.Generator[dict[str, t.Any]]:
+    """
+    Time the enclosed block and emit it as an `Event`.
+
+    Yields a dict the block can fill with further `Event` fields, such as token counts
+    known only once the block has run. Nothing is timed when no hooks are registered.
+    """
+    extra: dict[str, t.Any] = {}
+    if not _HOOKS:
+        yield extra
+        return
+    started = time.perf_counter()
+    error = None
+    try:
+        yield extra
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        emit(Event(phase=phase, duration=time.perf_counter() - started, error=error, **{**fields, **extra}))
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+import typing as t
+
+from llmterface.instrumentation.hooks import Event
+
+if t.TYPE_CHECKING:
+    from opentelemetry.trace import Tracer
+
+
+class OpenTelemetryExporter:
+    """
+    Instrumentation hook that records every event as an OpenTelemetry span.
+
+    Requires the optional `opentelemetry-api` package (`pip install llmterface[otel]`).
+    Register it with `llmterface.instrumentation.add_hook(OpenTelemetryExporter())`.
+    """
+
+    def __init__(self, tracer: Tracer | None = None):
+        try:
+            from opentelemetry import trace
+            from opentelemetry.trace import Status, StatusCode
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires the 'opentelemetry-api' package. "
+                "Install it with `pip install llmterface[otel]`."
+            ) from e
+        self._status_error = Status(StatusCode.ERROR)
+        self.tracer = tracer or trace.get_tracer("llmterface")
+
+    def __call__(self, event: Event) -> None:
+        end = time.time_ns()
+        start = end - int(event.duration * 1e9)
+        otel_span = self.tracer.start_span(
+            f"llmterface.{event.phase}",
+            start_time=start,
+            attributes=self.attributes(event),
+        )
+        if event.error is not None:
+            otel_span.record_exception(event.error)
+            otel_span.set_status(self._status_error)
+        otel_span.end(end_time=end)
+
+    @staticmethod
+    def attributes(event: Event) -> dict[str, t.Any]:
+        values = {
+            "llmterface.chat_id": event.chat_id,
+            "llmterface.provider": event.provider,
+            "llmterface.model_id": event.model_id,
+            "llmterface.attempt": event.attempt,
+            "llmterface.prompt_tokens": event.prompt_tokens,
+            "llmterface.output_tokens": event.output_tokens,
+            **{f"llmterface.{k}": v for k, v in event.attributes.items()},
+        }
+        return {k: v for k, v in values.items() if isinstance(v, (str, bool, int, float))}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import defaultdict
+
+from llmterface.instrumentation.hooks import Event, Phase
+
+CIRCUIT_STATES: tuple[str, ...] = ("closed", "open", "half_open")
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+type _Labels = tuple[tuple[str, str], ...]
+
+
+class PrometheusExporter:
+    """
+    Instrumentation hook that aggregates events into Prometheus-style metrics.
+
+    Metrics (prefixed with `namespace`):
+        `<ns>_events_total{phase,provider,outcome}` counter
+        `<ns>_phase_duration_seconds{phase,provider}` histogram
+        `<ns>_tokens_total{provider,kind}` counter
+        `<ns>_circuit_state{provider,model_id,state}` gauge, 1 for each circuit's current state
+
+    `render()` returns the text exposition format, ready to be served from a
+    `/metrics` endpoint. No Prometheus client library is required.
+    """
+
+    def __init__(self, namespace: str = "llmterface", buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._events: dict[_Labels, int] = defaultdict(int)
+        self._tokens: dict[_Labels, int] = defaultdict(int)
+        self._bucket_counts: dict[_Labels, list[int]] = dict()
+        self._sums: dict[_Labels, float] = defaultdict(float)
+        self._circuits: dict[tuple[str, str], str] = dict()
+
+    def __call__(self, event: Event) -> None:
+        provider = event.provider or ""
+        phase = str(event.phase)
+        outcome = "error" if event.error is not None else "ok"
+        duration_labels = (("phase", phase), ("provider", provider))
+        with self._lock:
+            self._events[(("phase", phase), ("provider", provider), ("outcome", outcome))] += 1
+            counts = self._bucket_counts.setdefault(duration_labels, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, event.duration)] += 1
+            self._sums[duration_labels] += event.duration
+            for kind, value in (("prompt", event.prompt_tokens), ("output", event.output_tokens)):
+                if value:
+                    self._tokens[(("provider", provider), ("kind", kind))] += value
+            if phase == Phase.circuit and "state" in event.attributes:
+                self._circuits[(provider, event.model_id or "")] = event.attributes["state"]
+
+    def render(self) -> str:
+        ns = self.namespace
+        lines: list[str] = []
+        with self._lock:
+            lines += [f"# HELP {ns}_events_total Instrumented phases by outcome.", f"# TYPE {ns}_events_total counter"]
+            lines += [f"{ns}_events_total{_fmt(labels)} {value}" for labels, value in sorted(self._events.items())]
+            lines += [
+                f"# HELP {ns}_phase_duration_seconds Duration of instrumented phases.",
+                f"# TYPE {ns}_phase_duration_seconds histogram",
+            ]
+            for labels, counts in sorted(self._bucket_counts.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{ns}_phase_duration_seconds_bucket{_fmt((*labels, ('le', le)))} {cumulative}")
+                lines.append(f"{ns}_phase_duration_seconds_sum{_fmt(labels)} {self._sums[labels]}")
+                lines.append(f"{ns}_phase_duration_seconds_count{_fmt(labels)} {cumulative}")
+            lines += [f"# HELP {ns}_tokens_total Tokens reported by providers.", f"# TYPE {ns}_tokens_total counter"]
+            lines += [f"{ns}_tokens_total{_fmt(labels)} {value}" for labels, value in sorted(self._tokens.items())]
+            lines += [f"# HELP {ns}_circuit_state Circuit breaker state.", f"# TYPE {ns}_circuit_state gauge"]
+            for (provider, model_id), current in sorted(self._circuits.items()):
+                for state in CIRCUIT_STATES:
+                    labels = (("provider", provider), ("model_id", model_id), ("state", state))
+                    lines.append(f"{ns}_circuit_state{_fmt(labels)} {int(state == current)}")
+        return "\n".join(lines) + "\n"
+
+
+def _fmt(labels: _Labels) -> str:
+    parts = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
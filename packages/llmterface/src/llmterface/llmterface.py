@@ -1,11 +1,27 @@
+import asyncio
 import logging
 import typing as t
 import uuid
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 
-from llmterface.models.generic_chat import GenericChat
+import llmterface.exceptions as ex
+from llmterface.chat_store import ChatStore, MemoryChatStore
+from llmterface.deadline import deadline_scope
+from llmterface.models.chat_history import ChatHistory
+from llmterface.models.generic_chat import GenericChat, poll_batches
 from llmterface.models.generic_config import AllowedResponseTypes, GenericConfig
+from llmterface.models.generic_response import Answer, StreamChunk
 from llmterface.models.question import Question
+from llmterface.providers.provider_config import ProviderConfig
+from llmterface.response_cache import ResponseCache
+from llmterface.router import Router
+
+if t.TYPE_CHECKING:
+    import numpy as np
+
+    from llmterface.embeddings import EmbeddingCache
+    from llmterface.semantic_cache import SemanticCache
 
 logger = logging.getLogger("llmterface")
 
@@ -14,12 +30,41 @@ class LLMterface[TRes: AllowedResponseTypes]:
     def __init__(
         self,
         config: GenericConfig[TRes] | None = None,
-        chats: dict[str, GenericChat] = None,
+        chats: ChatStore | dict[str, GenericChat] | None = None,
+        response_cache: ResponseCache | None = None,
+        router: Router | None = None,
+        semantic_cache: "SemanticCache | None" = None,
+        embedding_cache: "EmbeddingCache | None" = None,
     ):
-        if chats is None:
-            chats = dict()
+        """
+        chats:
+            Store for persistent chats. Defaults to an unbounded `MemoryChatStore`;
+            pass a bounded one to evict idle chats. A plain dict is copied into a new store.
+        response_cache:
+            Optional exact-match cache used by questions asked without a `chat_id`.
+            Persistent chats always bypass it.
+        router:
+            Optional `Router` that picks the provider for questions asked without a `chat_id`,
+            failing over between providers. Persistent chats stay on their own provider.
+        semantic_cache:
+            Optional `SemanticCache` that also answers paraphrases of earlier questions
+            asked without a `chat_id`. Requires a provider with an embedding endpoint.
+        embedding_cache:
+            Optional on-disk `EmbeddingCache` consulted by `embed()` before calling the provider.
+        """
+        if not isinstance(chats, ChatStore):
+            store = MemoryChatStore()
+            for chat in (chats or dict()).values():
+                store.set(chat)
+            chats = store
         self.chats = chats
+        if config is None and router is not None:
+            config = GenericConfig()
         self.base_config = config
+        self.response_cache = response_cache
+        self.router = router
+        self.semantic_cache = semantic_cache
+        self.embedding_cache = embedding_cache
 
     @t.overload
     def ask(self, question: Question[None] | str, chat_id: None = None) -> TRes: ...
@@ -36,6 +81,299 @@ class LLMterface[TRes: AllowedResponseTypes]:
         question: Question | str,
         chat_id: str | None = None,
     ):
+        return self.ask_with_metadata(question, chat_id=chat_id).result
+
+    @t.overload
+    async def aask(self, question: Question[None] | str, chat_id: None = None) -> TRes: ...
+    @t.overload
+    async def aask(self, question: Question[None] | str, chat_id: str) -> AllowedResponseTypes: ...
+    @t.overload
+    async def aask(self, question: str, chat_id: str | None) -> AllowedResponseTypes: ...
+    @t.overload
+    async def aask[TReturn: AllowedResponseTypes](
+        self, question: Question[TReturn], chat_id: str | None = None
+    ) -> TReturn: ...
+    async def aask(
+        self,
+        question: Question | str,
+        chat_id: str | None = None,
+    ):
+        """
+        Asynchronous counterpart of `ask`.
+        """
+        return (await self.aask_with_metadata(question, chat_id=chat_id)).result
+
+    def ask_with_metadata(self, question: Question | str, chat_id: str | None = None) -> Answer:
+        """
+        Like `ask`, but returns an `Answer` holding the validated result, the provider
+        response and its usage and timing metadata.
+        """
+        question, chat = self._resolve(question, chat_id)
+        if chat:
+            return chat.ask_with_metadata(question)
+        if self.router is not None:
+            with deadline_scope(question.get_deadline()):
+                return self.router.ask(self._ask_temp, question)
+        return self._ask_temp(question)
+
+    async def aask_with_metadata(self, question: Question | str, chat_id: str | None = None) -> Answer:
+        """
+        Asynchronous counterpart of `ask_with_metadata`.
+        """
+        question, chat = self._resolve(question, chat_id)
+        if chat:
+            return await chat.aask_with_metadata(question)
+        if self.router is not None:
+            with deadline_scope(question.get_deadline()):
+                return await self.router.aask(self._aask_temp, question)
+        return await self._aask_temp(question)
+
+    def _ask_temp(self, question: Question) -> Answer:
+        with self.temp_chat(config=None, provider=question.config.provider) as temp:
+            return temp.ask_with_metadata(question)
+
+    async def _aask_temp(self, question: Question) -> Answer:
+        with self.temp_chat(config=None, provider=question.config.provider) as temp:
+            return await temp.aask_with_metadata(question)
+
+    def stream(
+        self,
+        question: Question | str,
+        chat_id: str | None = None,
+        partial: bool = False,
+    ) -> t.Generator[StreamChunk]:
+        """
+        Streaming counterpart of `ask`. See `GenericChat.stream`.
+        """
+        question, chat = self._resolve(question, chat_id)
+        if chat:
+            yield from chat.stream(question, partial=partial)
+            return
+        with self.temp_chat(config=None, provider=question.config.provider) as temp:
+            yield from temp.stream(question, partial=partial)
+
+    def count_tokens(self, question: Question | str, chat_id: str | None = None, exact: bool = False) -> int:
+        """
+        Count the input tokens of a question without asking it. See `ProviderChat.count_tokens`.
+        """
+        question, chat = self._resolve(question, chat_id)
+        if chat:
+            return chat.count_tokens(question, exact=exact)
+        with self.temp_chat(config=None, provider=question.config.provider) as temp:
+            return temp.count_tokens(question, exact=exact)
+
+    def embed(
+        self,
+        texts: t.Iterable[str],
+        config: GenericConfig | None = None,
+        batch_size: int | None = None,
+        concurrency: int = 4,
+    ) -> "np.ndarray":
+        """
+        Embed texts with the provider's embedding model.
+
+        Returns one contiguous float32 array with a row per text, in input order.
+        Identical texts are embedded once and texts found in the `embedding_cache`
+        are not sent. The rest are split into batches of at most `batch_size` texts,
+        the provider's `EMBED_BATCH_SIZE` by default, which run concurrently on
+        temporary chats. Requires the optional `numpy` package.
+        """
+        from llmterface.embeddings import assemble, dedupe
+
+        config, provider_config, model_key = self._resolve_embedding(config, concurrency)
+        unique, inverse = dedupe(list(texts))
+        vectors = self._get_cached_embeddings(model_key, unique)
+        batches = self._embedding_batches(unique, vectors, batch_size or provider_config.EMBED_BATCH_SIZE)
+        if batches:
+            with ThreadPoolExecutor(
+                max_workers=min(concurrency, len(batches)), thread_name_prefix="llmterface-embed"
+            ) as executor:
+                results = list(executor.map(lambda batch: self._embed_batch(config, batch), batches))
+            self._add_embeddings(model_key, vectors, batches, results)
+        return assemble(unique, inverse, vectors)
+
+    async def aembed(
+        self,
+        texts: t.Iterable[str],
+        config: GenericConfig | None = None,
+        batch_size: int | None = None,
+        concurrency: int = 4,
+    ) -> "np.ndarray":
+        """
+        Asynchronous counterpart of `embed`; at most `concurrency` batches are in flight at once.
+        """
+        from llmterface.embeddings import assemble, dedupe
+
+        config, provider_config, model_key = self._resolve_embedding(config, concurrency)
+        unique, inverse = dedupe(list(texts))
+        vectors = self._get_cached_embeddings(model_key, unique)
+        batches = self._embedding_batches(unique, vectors, batch_size or provider_config.EMBED_BATCH_SIZE)
+        if batches:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def bounded_embed(batch: list[str]) -> list[list[float]]:
+                async with semaphore:
+                    with self.temp_chat(config=config) as chat:
+                        return self._check_embeddings(batch, await chat.aembed(batch, config))
+
+            results = await asyncio.gather(*(bounded_embed(batch) for batch in batches))
+            self._add_embeddings(model_key, vectors, batches, results)
+        return assemble(unique, inverse, vectors)
+
+    def _resolve_embedding(
+        self, config: GenericConfig | None, concurrency: int
+    ) -> tuple[GenericConfig, ProviderConfig, str]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        config = config or self.base_config
+        if config is None or not config.provider:
+            raise ValueError("A config with a provider is required to embed texts.")
+        provider_config = config.provider_overrides.get(config.provider) or GenericChat.get_provider_config(config)
+        return config, provider_config, f"{config.provider}:{provider_config.get_embedding_model_id()}"
+
+    def _get_cached_embeddings(self, model_key: str, texts: list[str]) -> dict[str, "np.ndarray"]:
+        if self.embedding_cache is None or not texts:
+            return dict()
+        return self.embedding_cache.get_many(model_key, texts)
+
+    @staticmethod
+    def _embedding_batches(texts: list[str], known: t.Container[str], batch_size: int) -> list[list[str]]:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        missing = [text for text in texts if text not in known]
+        return [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+
+    def _embed_batch(self, config: GenericConfig, batch: list[str]) -> list[list[float]]:
+        with self.temp_chat(config=config) as chat:
+            return self._check_embeddings(batch, chat.embed(batch, config))
+
+    @staticmethod
+    def _check_embeddings(batch: list[str], vectors: list[list[float]]) -> list[list[float]]:
+        if len(vectors) != len(batch):
+            raise ex.ProviderError(f"Provider returned {len(vectors)} embeddings for {len(batch)} texts")
+        return vectors
+
+    def _add_embeddings(
+        self,
+        model_key: str,
+        vectors: dict[str, "np.ndarray"],
+        batches: list[list[str]],
+        results: list[list[list[float]]],
+    ) -> None:
+        from llmterface.embeddings import to_matrix
+
+        new = dict()
+        for batch, result in zip(batches, results, strict=True):
+            new.update(zip(batch, to_matrix(result), strict=True))
+        vectors.update(new)
+        if self.embedding_cache is not None:
+            self.embedding_cache.set_many(model_key, new)
+
+    def ask_many(
+        self,
+        questions: t.Iterable[Question | str],
+        concurrency: int = 8,
+    ) -> list[AllowedResponseTypes | Exception]:
+        """
+        Ask many independent questions concurrently, each on its own temporary chat.
+        Results are returned in input order. A failed question yields its exception
+        in place of a result instead of failing the whole batch.
+        """
+        questions = list(questions)
+        results: list[AllowedResponseTypes | Exception] = [None] * len(questions)
+        for index, result in self.iter_ask_many(questions, concurrency=concurrency):
+            results[index] = result
+        return results
+
+    def iter_ask_many(
+        self,
+        questions: t.Iterable[Question | str],
+        concurrency: int = 8,
+    ) -> t.Generator[tuple[int, AllowedResponseTypes | Exception]]:
+        """
+        Like `ask_many`, but yields `(index, result)` pairs as soon as each question completes.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llmterface-ask")
+        try:
+            futures = {executor.submit(self.ask, question): i for i, question in enumerate(questions)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_batch(
+        self,
+        questions: t.Iterable[Question | str],
+        poll_interval: float = 30.0,
+        timeout: float | None = None,
+    ) -> list[AllowedResponseTypes | Exception]:
+        """
+        Answer many questions through the providers' offline batch APIs.
+        Results are returned in input order, with exceptions in place of failed items.
+        See `GenericChat.iter_batch`.
+        """
+        questions = list(questions)
+        results: list[AllowedResponseTypes | Exception] = [None] * len(questions)
+        for index, result in self.iter_batch(questions, poll_interval=poll_interval, timeout=timeout):
+            results[index] = result
+        return results
+
+    def iter_batch(
+        self,
+        questions: t.Iterable[Question | str],
+        poll_interval: float = 30.0,
+        timeout: float | None = None,
+    ) -> t.Generator[tuple[int, AllowedResponseTypes | Exception]]:
+        """
+        Like `run_batch`, but yields `(index, result)` pairs as each job completes.
+        The jobs of every provider are submitted first and then polled together.
+        """
+        by_provider: dict[str, list[tuple[int, Question]]] = dict()
+        for i, question in enumerate(questions):
+            question, _ = self._resolve(question, None)
+            by_provider.setdefault(question.config.provider, []).append((i, question))
+        with ExitStack() as stack:
+            items = list(by_provider.values())
+            runs = []
+            try:
+                for provider, provider_items in by_provider.items():
+                    chat = stack.enter_context(self.temp_chat(config=None, provider=provider))
+                    runs.append(chat.start_batch([q for _, q in provider_items], timeout=timeout))
+            except BaseException:
+                for run in runs:
+                    run.cancel()
+                raise
+            for r, j, result in poll_batches(runs, poll_interval=poll_interval):
+                yield items[r][j][0], result
+
+    async def aask_many(
+        self,
+        questions: t.Iterable[Question | str],
+        concurrency: int = 8,
+    ) -> list[AllowedResponseTypes | Exception]:
+        """
+        Asynchronous counterpart of `ask_many`; at most `concurrency` questions are in flight at once.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded_ask(question: Question | str) -> AllowedResponseTypes:
+            async with semaphore:
+                return await self.aask(question)
+
+        return await asyncio.gather(*(bounded_ask(q) for q in questions), return_exceptions=True)
+
+    def _resolve(self, question: Question | str, chat_id: str | None) -> tuple[Question, GenericChat | None]:
+        """
+        Normalize the question and apply config priority for the target chat.
+        Returns the chat to ask, or None when a temporary chat should be used.
+        """
         if isinstance(question, str):
             question: Question[str] = Question(
                 question=question,
@@ -44,11 +382,8 @@ class LLMterface[TRes: AllowedResponseTypes]:
             chat = self.chats.get(chat_id)
             if not chat:
                 raise KeyError(f"Chat with id '{chat_id}' not found.")
-            question = question.with_prioritized_config([chat.config, self.base_config])
-            return chat.ask(question)
-        question = question.with_prioritized_config([self.base_config])
-        with self.temp_chat(config=None, provider=question.config.provider) as temp:
-            return temp.ask(question)
+            return question.with_prioritized_config([chat.config, self.base_config]), chat
+        return question.with_prioritized_config([self.base_config]), None
 
     @contextmanager
     def temp_chat(
@@ -66,6 +401,8 @@ class LLMterface[TRes: AllowedResponseTypes]:
             provider=provider,
             chat_id=chat_id,
             config=config,
+            response_cache=self.response_cache,
+            semantic_cache=self.semantic_cache,
         )
         try:
             yield chat
@@ -76,9 +413,13 @@ class LLMterface[TRes: AllowedResponseTypes]:
         """
         Close all chats and perform any necessary cleanup.
         """
-        for chat in self.chats.values():
-            chat.close()
-        self.chats.clear()
+        self.chats.close()
+        if self.router is not None:
+            self.router.close()
+        if self.semantic_cache is not None:
+            self.semantic_cache.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
 
     def create_chat[TChatRes: AllowedResponseTypes](
         self,
@@ -87,5 +428,26 @@ class LLMterface[TRes: AllowedResponseTypes]:
         chat_id: str | None = None,
     ) -> GenericChat[TChatRes]:
         chat = GenericChat.create(provider, chat_id=chat_id or uuid.uuid4().hex, config=config)
-        self.chats[chat.id] = chat
+        self.chats.set(chat)
         return chat
+
+    def restore_chat[TChatRes: AllowedResponseTypes](
+        self,
+        provider: str,
+        history: ChatHistory,
+        config: GenericConfig[TChatRes] | None = None,
+        chat_id: str | None = None,
+    ) -> GenericChat[TChatRes]:
+        """
+        Rebuild a persistent chat from a saved `ChatHistory` and add it to the store.
+        """
+        chat = GenericChat.restore(provider, chat_id=chat_id or uuid.uuid4().hex, history=history, config=config)
+        self.chats.set(chat)
+        return chat
+
+    def close_chat(self, chat_id: str) -> None:
+        """
+        Close a persistent chat and remove it from the store.
+        """
+        if chat := self.chats.pop(chat_id):
+            chat.close()
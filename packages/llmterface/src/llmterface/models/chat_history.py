@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import typing as t
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+type Role = t.Literal["user", "model"]
+
+
+class ChatTurn(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    role: Role = Field(..., description="Who produced the turn: the user or the model.")
+    text: str = Field(..., description="Text sent to or received from the provider.")
+
+
+_TURN_ADAPTER = TypeAdapter(ChatTurn)
+
+
+class ChatHistory(BaseModel):
+    """
+    Provider-neutral record of a conversation, used to page chats out and rebuild them later.
+
+    Serialized as JSON lines, one turn per line, so histories can be appended to and
+    streamed without loading them whole.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+    turns: list[ChatTurn] = Field(default_factory=list, description="Turns in conversation order.")
+
+    def add_exchange(self, prompt: str, answer: str) -> None:
+        self.turns.append(ChatTurn(role="user", text=prompt))
+        self.turns.append(ChatTurn(role="model", text=answer))
+
+    def to_jsonl(self) -> str:
+        return "".join(turn.model_dump_json() + "\n" for turn in self.turns)
+
+    @classmethod
+    def from_jsonl(cls, data: str | bytes) -> ChatHistory:
+        lines = data.splitlines() if data else []
+        return cls(turns=[_TURN_ADAPTER.validate_json(line) for line in lines if line.strip()])
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(self.to_jsonl(), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> ChatHistory:
+        return cls.from_jsonl(Path(path).read_text(encoding="utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.turns)
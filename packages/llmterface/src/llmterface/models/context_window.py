@@ -0,0 +1,96 @@
+import typing as t
+
+from llmterface.models.chat_history import ChatTurn
+from llmterface.tokens import DEFAULT_CHARS_PER_TOKEN, estimate_tokens
+from pydantic import BaseModel, ConfigDict, Field
+
+type Summarizer = t.Callable[[t.Sequence[ChatTurn]], str]
+
+SUMMARY_ACK = "Understood."
+
+
+class ContextWindow(BaseModel):
+    """
+    Sliding window that keeps a chat's history within its token budget.
+
+    Before every ask, the history budget is `max_input_tokens` minus the estimated
+    size of the system instruction, the prompt and `reserve_tokens`. The system
+    instruction and the prompt are always sent; the oldest turns are dropped until
+    the rest of the history fits. With a `summarizer`, dropped turns are replaced
+    by a summary exchange at the start of the history instead.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    max_history_tokens: int | None = Field(
+        default=None,
+        ge=0,
+        description="Optional cap on history tokens, applied even when `max_input_tokens` is not set.",
+    )
+    reserve_tokens: int = Field(
+        default=0,
+        ge=0,
+        description="Headroom kept free of history to absorb errors of the local token estimate.",
+    )
+    chars_per_token: float = Field(
+        default=DEFAULT_CHARS_PER_TOKEN,
+        gt=0,
+        description="Characters per token used by the local estimate.",
+    )
+    summarizer: Summarizer | None = Field(
+        default=None,
+        description="Called with the dropped turns; returns a summary kept in their place.",
+    )
+    summary_prefix: str = Field(
+        default="Summary of the earlier conversation:",
+        description="Text introducing the summary turn.",
+    )
+
+    def fit(
+        self,
+        turns: t.Sequence[ChatTurn],
+        prompt: str,
+        system_instruction: str | None = None,
+        max_input_tokens: int | None = None,
+    ) -> list[ChatTurn] | None:
+        """
+        Return the turns to keep, or None when the history already fits.
+        Raises `ValueError` when the prompt and system instruction alone exceed `max_input_tokens`.
+        """
+        if max_input_tokens is None and self.max_history_tokens is None:
+            return None
+        budget = self.max_history_tokens
+        if max_input_tokens is not None:
+            fixed = self.estimate(prompt) + self.estimate(system_instruction) + self.reserve_tokens
+            if fixed > max_input_tokens:
+                raise ValueError(
+                    f"Prompt and system instruction need about {fixed} tokens, exceeding max_input_tokens={max_input_tokens}"
+                )
+            budget = max_input_tokens - fixed if budget is None else min(budget, max_input_tokens - fixed)
+
+        used = 0
+        start = len(turns)
+        for i in range(len(turns) - 1, -1, -1):
+            used += self.estimate(turns[i].text)
+            if used > budget:
+                break
+            start = i
+        # never start the window on a model turn
+        while start < len(turns) and turns[start].role != "user":
+            start += 1
+        if start == 0:
+            return None
+
+        kept = list(turns[start:])
+        if self.summarizer is None:
+            return kept
+        summary = [
+            ChatTurn(role="user", text=f"{self.summary_prefix}\n{self.summarizer(turns[:start])}"),
+            ChatTurn(role="model", text=SUMMARY_ACK),
+        ]
+        kept_tokens = sum(self.estimate(turn.text) for turn in kept)
+        if kept_tokens + sum(self.estimate(turn.text) for turn in summary) > budget:
+            return kept
+        return summary + kept
+
+    def estimate(self, text: str | None) -> int:
+        return estimate_tokens(text, self.chars_per_token)
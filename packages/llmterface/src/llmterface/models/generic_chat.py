@@ -1,12 +1,33 @@
+import asyncio
 import json
+import logging
+import time
 import typing as t
+from collections import defaultdict
+from contextlib import AbstractContextManager, nullcontext
 
 import llmterface.exceptions as ex
+from llmterface.deadline import check_deadline, deadline_scope, deadline_until, expiry_in, is_expired, remaining_time
+from llmterface.helpers import LRUCache
+from llmterface.instrumentation.hooks import Event, Phase, emit, has_hooks, span
+from llmterface.models.chat_history import ChatHistory, ChatTurn
 from llmterface.models.generic_config import AllowedResponseTypes, GenericConfig
+from llmterface.models.generic_response import Answer, GenericResponse, ResponseMetadata, StreamChunk
 from llmterface.models.question import Question
+from llmterface.models.response_registry import get_response_spec
+from llmterface.providers.circuit_breaker import get_circuit_breaker
 from llmterface.providers.discovery import get_provider_chat, get_provider_config
-from llmterface.providers.provider_chat import ProviderChat
+from llmterface.providers.provider_chat import BatchState, ProviderChat
 from llmterface.providers.provider_config import ProviderConfig
+from llmterface.providers.rate_limiter import RateLimiter, get_rate_limiter
+from llmterface.response_cache import ResponseCache, make_cache_key
+
+if t.TYPE_CHECKING:
+    from llmterface.semantic_cache import SemanticCache
+
+logger = logging.getLogger("llmterface")
+
+_PROVIDER_CONFIG_CACHE: LRUCache[t.Hashable, ProviderConfig] = LRUCache(max_size=256)
 
 
 class GenericChat[TRes: AllowedResponseTypes]:
@@ -15,15 +36,40 @@ class GenericChat[TRes: AllowedResponseTypes]:
         id: str,
         client_chat: ProviderChat | None = None,
         config: GenericConfig[TRes] | None = None,
+        response_cache: ResponseCache | None = None,
+        history: ChatHistory | None = None,
+        semantic_cache: "SemanticCache | None" = None,
     ):
+        """
+        response_cache:
+            Optional exact-match cache of provider responses. Only meant for
+            stateless chats, since a cached answer skips the provider conversation.
+        semantic_cache:
+            Optional cache that also answers paraphrased questions, matched by the
+            similarity of prompt embeddings from the provider. Stateless chats only.
+        history:
+            Provider-neutral record of the conversation. Every answered question is
+            appended, so the chat can be saved and rebuilt later with `restore()`.
+            It is kept whole; a `ContextWindow` only trims what is sent to the provider.
+        """
         self.id = id
         self.client = client_chat
         self.config = config
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.history = history if history is not None else ChatHistory()
+        # turns the provider holds in place of history.turns[:end] after the last trim, and that end
+        self._window: tuple[list[ChatTurn], int] | None = None
 
     @staticmethod
     def get_provider_config(
         config: GenericConfig,
     ) -> ProviderConfig:
+        """
+        Resolve the provider config for a GenericConfig.
+        Compiled configs are memoized per provider config class and config fingerprint,
+        so the returned instance may be shared and must not be mutated.
+        """
         if not config.provider:
             raise ValueError("Provider must be specified in the GenericConfig.")
         if override := config.provider_overrides.get(config.provider):
@@ -33,7 +79,10 @@ class GenericChat[TRes: AllowedResponseTypes]:
         if not provider_config_cls:
             raise NotImplementedError(f"No config factory found for provider: {config.provider}")
 
-        return provider_config_cls.from_generic_config(config)
+        return _PROVIDER_CONFIG_CACHE.get_or_set(
+            (provider_config_cls, config.fingerprint()),
+            lambda: provider_config_cls.from_generic_config(config),
+        )
 
     @t.overload
     def ask(self, question: Question[None]) -> TRes: ...
@@ -43,37 +92,486 @@ class GenericChat[TRes: AllowedResponseTypes]:
         """
         Ask a question using the chat's AI client and store the response.
         """
+        return self.ask_with_metadata(question).result
+
+    @t.overload
+    async def aask(self, question: Question[None]) -> TRes: ...
+    @t.overload
+    async def aask[TReturn: AllowedResponseTypes](self, question: Question[TReturn]) -> TReturn: ...
+    async def aask(self, question: Question):
+        """
+        Asynchronous counterpart of `ask`.
+        """
+        return (await self.aask_with_metadata(question)).result
+
+    def ask_with_metadata(self, question: Question) -> Answer:
+        """
+        Like `ask`, but returns the validated result together with the provider
+        response and its usage and timing metadata.
+
+        The question's `deadline` bounds the whole call, including context-window
+        trimming and the semantic-cache embedding; its `timeout` bounds each provider
+        attempt. Synchronous provider calls cannot be interrupted, so they are bounded
+        only when the provider reads `remaining_time()` (Gemini turns it into an HTTP
+        timeout); otherwise an overrun is detected once the call returns.
+        """
+        try:
+            question, provider_config = self._resolve_provider_config(question)
+            with deadline_scope(question.get_deadline()):
+                self._fit_context_window(question)
+                cache_key = self._get_cache_key(question, provider_config)
+                if (cached := self._get_cached(question, cache_key)) is not None:
+                    return cached
+                probe = self._probe_semantic(question, provider_config, self._embed_prompt(question, provider_config))
+                if isinstance(probe, Answer):
+                    return probe
+                answer = self._ask(question, provider_config, cache_key=cache_key)
+            self._store_semantic(probe, answer)
+            return answer
+        except Exception as e:
+            raise ex.ClientError(f"Error while asking question to AI client: [{type(e)}]{e}") from e
+
+    async def aask_with_metadata(self, question: Question) -> Answer:
+        """
+        Asynchronous counterpart of `ask_with_metadata`.
+        """
+        try:
+            question, provider_config = self._resolve_provider_config(question)
+            with deadline_scope(question.get_deadline()):
+                self._fit_context_window(question)
+                cache_key = self._get_cache_key(question, provider_config)
+                if (cached := self._get_cached(question, cache_key)) is not None:
+                    return cached
+                vector = await self._aembed_prompt(question, provider_config)
+                probe = self._probe_semantic(question, provider_config, vector)
+                if isinstance(probe, Answer):
+                    return probe
+                answer = await self._aask(question, provider_config, cache_key=cache_key)
+            self._store_semantic(probe, answer)
+            return answer
+        except Exception as e:
+            raise ex.ClientError(f"Error while asking question to AI client: [{type(e)}]{e}") from e
+
+    def stream(self, question: Question, partial: bool = False) -> t.Iterator[StreamChunk]:
+        """
+        Ask a question and yield the answer as it arrives.
+
+        Every chunk carries the new text. With `partial=True`, chunks also carry a
+        best-effort object parsed from the incomplete JSON. The final chunk has
+        `done=True` and the fully validated `result`. Streams are not retried,
+        because chunks have already been handed to the caller, so the question's
+        timeout and deadline both bound the whole stream.
+        """
+        try:
+            question, provider_config = self._resolve_provider_config(question)
+            spec = get_response_spec(question.config.response_model)
+            accumulated = ""
+            metadata = {}
+            limits = [limit for limit in (question.get_timeout(), question.get_deadline()) if limit is not None]
+            expires_at = expiry_in(min(limits, default=None))
+            limiter = self._get_rate_limiter(question, provider_config)
+            with deadline_until(expires_at):
+                self._fit_context_window(question)
+                reserved = provider_config.count_tokens(question) if limiter else 0
+                if limiter:
+                    limiter.acquire(reserved, max_wait=remaining_time())
+                check_deadline()
+            try:
+                with self._circuit(question, provider_config):
+                    for res in self._stream_until(question, provider_config, expires_at):
+                        metadata = {**metadata, **res.metadata}
+                        if not res.text:
+                            continue
+                        accumulated += res.text
+                        yield StreamChunk(
+                            text=res.text,
+                            accumulated=accumulated,
+                            partial=spec.parse_partial(accumulated) if partial else None,
+                            metadata=metadata,
+                        )
+            except ex.CircuitOpenError:
+                if limiter:
+                    limiter.release(reserved)
+                raise
+            except ex.AiHandlerError:
+                raise
+            except Exception as e:
+                raise ex.ProviderError(f"Error from provider: [{type(e)}]{e}", original_exception=e) from e
+            if limiter and (prompt_tokens := metadata.get("prompt_tokens")) is not None:
+                limiter.adjust_tokens(reserved, prompt_tokens)
+            try:
+                result = self._parse_response(question, GenericResponse(original=None, text=accumulated))
+            except ValueError as e:
+                raise ex.SchemaError(f"Error parsing response: [{type(e)}]{e}", original_exception=e) from e
+            self.history.add_exchange(question.prompt, accumulated)
+            yield StreamChunk(text="", accumulated=accumulated, result=result, done=True, metadata=metadata)
+        except Exception as e:
+            raise ex.ClientError(f"Error while streaming question to AI client: [{type(e)}]{e}") from e
+
+    def _stream_until(
+        self, question: Question, provider_config: ProviderConfig, expires_at: float | None
+    ) -> t.Iterator[GenericResponse]:
+        """
+        Advance the provider stream inside the deadline scope, one chunk at a time.
+        """
+        with deadline_until(expires_at):
+            chunks = iter(self.client.stream(question, provider_config))
+        while True:
+            with deadline_until(expires_at):
+                res = next(chunks, None)
+            if res is None:
+                return
+            if is_expired(expires_at):
+                raise ex.TimeoutError("Stream did not finish before the deadline")
+            yield res
+
+    def embed(self, texts: t.Sequence[str], config: GenericConfig | None = None) -> list[list[float]]:
+        """
+        Embed `texts` with the provider's embedding model, one vector per text.
+        See `ProviderChat.embed`.
+        """
+        provider_config = self._get_embedding_config(config)
         try:
-            question = question.with_prioritized_config([self.config])
+            return self.client.embed(texts, provider_config)
+        except (ex.AiHandlerError, NotImplementedError):
+            raise
+        except Exception as e:
+            raise ex.ProviderError(f"Error from provider: [{type(e)}]{e}", original_exception=e) from e
+
+    async def aembed(self, texts: t.Sequence[str], config: GenericConfig | None = None) -> list[list[float]]:
+        """
+        Asynchronous counterpart of `embed`.
+        """
+        provider_config = self._get_embedding_config(config)
+        try:
+            return await self.client.aembed(texts, provider_config)
+        except (ex.AiHandlerError, NotImplementedError):
+            raise
+        except Exception as e:
+            raise ex.ProviderError(f"Error from provider: [{type(e)}]{e}", original_exception=e) from e
+
+    def _get_embedding_config(self, config: GenericConfig | None) -> ProviderConfig:
+        config = config or self.config
+        if config is None:
+            raise ValueError("No configuration available to embed with.")
+        return config.provider_overrides.get(self.client.PROVIDER) or self.get_provider_config(config)
+
+    def count_tokens(self, question: Question, exact: bool = False) -> int:
+        """
+        Count the input tokens `question` would use on this chat's provider,
+        including the history sent along with it. See `ProviderChat.count_tokens`.
+        """
+        question, provider_config = self._resolve_provider_config(question)
+        return self.client.count_tokens(question, provider_config, exact=exact, history=self._sent_history())
+
+    def iter_batch(
+        self,
+        questions: t.Sequence[Question],
+        poll_interval: float = 30.0,
+        timeout: float | None = None,
+    ) -> t.Iterator[tuple[int, AllowedResponseTypes | Exception]]:
+        """
+        Answer questions through the provider's offline batch API.
+
+        Questions are submitted as one job per provider model, all up front, and the
+        jobs are then polled together. As each job finishes, every response goes
+        through the normal validation and `(index, result)` pairs are yielded; an
+        item that failed, or whose whole job failed, yields its exception instead. Responses that fail validation
+        are retried as decided by `Question.on_retry`, in a follow-up job submitted
+        as soon as their job finishes, until no retries remain.
+
+        timeout:
+            Seconds to wait for all jobs, including retry passes. Jobs still running
+            when it expires are cancelled and a `ProviderError` is raised.
+        """
+        for _, index, result in poll_batches([self.start_batch(questions, timeout)], poll_interval):
+            yield index, result
+
+    def start_batch(self, questions: t.Sequence[Question], timeout: float | None = None) -> "BatchRun":
+        """
+        Submit `questions` as batch jobs without waiting for them. See `iter_batch` and `poll_batches`.
+        """
+        return BatchRun(self, [self._resolve_provider_config(question) for question in questions], timeout)
+
+    def _resolve_provider_config(self, question: Question) -> tuple[Question, ProviderConfig]:
+        question = question.with_prioritized_config([self.config])
+        with span(Phase.provider_config, chat_id=self.id, provider=self.client.PROVIDER):
             provider_config = question.config.provider_overrides.get(self.client.PROVIDER) or self.get_provider_config(
                 question.config
             )
-            return self._ask(question, provider_config)
-        except Exception as e:
-            raise ex.ClientError(f"Error while asking question to AI client: [{type(e)}]{e}") from e
+        return question, provider_config
 
-    def _ask(self, question: Question[TRes], provider_config: ProviderConfig) -> TRes:
+    def _fit_context_window(self, question: Question) -> None:
+        """
+        Trim the turns sent to the provider to the question's token budget and rebuild
+        the provider chat from what is kept. `self.history` keeps every turn.
+        """
+        config = question.config
+        if config.context_window is None or not self.history.turns:
+            return
+        turns = config.context_window.fit(
+            self._sent_history(),
+            question.prompt,
+            system_instruction=config.system_instruction,
+            max_input_tokens=config.max_input_tokens,
+        )
+        if turns is not None:
+            self._window = (turns, len(self.history.turns))
+            self.client.load_history(turns)
+
+    def _sent_history(self) -> list[ChatTurn]:
+        """
+        The turns the provider chat holds: the window kept by the last trim, followed by every later turn.
+        """
+        if self._window is None:
+            return self.history.turns
+        kept, end = self._window
+        return [*kept, *self.history.turns[end:]]
+
+    def _ask(
+        self, question: Question[TRes], provider_config: ProviderConfig, cache_key: str | None = None
+    ) -> Answer[TRes]:
         retries = 0
         res = None
+        started = time.monotonic()
         while True:
+            expires_at = None
             try:
-                res = self.client.ask(question, provider_config)
-                json_res = json.loads(res.text)
-                return question.config.validate_response(json_res)
+                limiter = self._get_rate_limiter(question, provider_config)
+                if limiter:
+                    reserved = provider_config.count_tokens(question)
+                    limiter.acquire(reserved, max_wait=remaining_time())
+                check_deadline()
+                with (
+                    deadline_scope(question.get_timeout()) as expires_at,
+                    self._circuit(question, provider_config),
+                    span(Phase.request, **self._event_fields(provider_config, retries)) as event,
+                ):
+                    res = self.client.ask(question, provider_config)
+                    event.update(self._usage_fields(res))
+                if limiter and (prompt_tokens := res.metadata.get("prompt_tokens")) is not None:
+                    limiter.adjust_tokens(reserved, prompt_tokens)
+                result = self._parse_in_phases(question, res, provider_config, retries)
+                self.history.add_exchange(question.prompt, res.text)
+                if cache_key is not None:
+                    self.response_cache.set(cache_key, res.text)
+                return Answer(result=result, response=res, retries=retries)
+            except ex.CircuitOpenError:
+                # the request was never sent, so it does not count against the rate limit
+                if limiter:
+                    limiter.release(reserved)
+                raise
             except ex.AiHandlerError:
                 raise
             except Exception as e:
-                if isinstance(e, (json.JSONDecodeError, ValueError)):
-                    exc = ex.SchemaError(f"Error parsing response: [{type(e)}]{e}", original_exception=e)
-                else:
-                    exc = ex.ProviderError(f"Error from provider: [{type(e)}]{e}", original_exception=e)
-                exc.__cause__ = e
-                retry_question = question.on_retry(question, response=res, e=exc, retries=retries)
-                if not retry_question:
-                    raise exc from e
-                question = retry_question
+                timed_out = isinstance(e, TimeoutError) or is_expired(expires_at)
+                question, delay = self._get_retry(question, provider_config, res, e, retries, started, timed_out)
+                if delay > 0:
+                    time.sleep(delay)
                 retries += 1
-                continue
+
+    async def _aask(
+        self, question: Question[TRes], provider_config: ProviderConfig, cache_key: str | None = None
+    ) -> Answer[TRes]:
+        retries = 0
+        res = None
+        started = time.monotonic()
+        while True:
+            expires_at = None
+            try:
+                limiter = self._get_rate_limiter(question, provider_config)
+                if limiter:
+                    reserved = provider_config.count_tokens(question)
+                    await limiter.aacquire(reserved, max_wait=remaining_time())
+                check_deadline()
+                with (
+                    deadline_scope(question.get_timeout()) as expires_at,
+                    self._circuit(question, provider_config),
+                    span(Phase.request, **self._event_fields(provider_config, retries)) as event,
+                ):
+                    async with asyncio.timeout(remaining_time()):
+                        res = await self.client.aask(question, provider_config)
+                    event.update(self._usage_fields(res))
+                if limiter and (prompt_tokens := res.metadata.get("prompt_tokens")) is not None:
+                    limiter.adjust_tokens(reserved, prompt_tokens)
+                result = self._parse_in_phases(question, res, provider_config, retries)
+                self.history.add_exchange(question.prompt, res.text)
+                if cache_key is not None:
+                    self.response_cache.set(cache_key, res.text)
+                return Answer(result=result, response=res, retries=retries)
+            except ex.CircuitOpenError:
+                # the request was never sent, so it does not count against the rate limit
+                if limiter:
+                    limiter.release(reserved)
+                raise
+            except ex.AiHandlerError:
+                raise
+            except Exception as e:
+                timed_out = isinstance(e, TimeoutError) or is_expired(expires_at)
+                question, delay = self._get_retry(question, provider_config, res, e, retries, started, timed_out)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                retries += 1
+
+    def _get_cache_key(self, question: Question, provider_config: ProviderConfig) -> str | None:
+        if self.response_cache is None:
+            return None
+        return make_cache_key(self.client.PROVIDER, question, provider_config)
+
+    def _get_cached(self, question: Question[TRes], cache_key: str | None) -> Answer[TRes] | None:
+        if cache_key is None or (text := self.response_cache.get(cache_key)) is None:
+            return None
+        return self._answer_from_cache(question, text)
+
+    def _embed_prompt(self, question: Question, provider_config: ProviderConfig) -> list[float] | None:
+        if self.semantic_cache is None:
+            return None
+        try:
+            return self.client.embed([question.prompt], provider_config)[0]
+        except NotImplementedError:
+            return None
+        except Exception:
+            logger.warning("Could not embed prompt for the semantic cache", exc_info=True)
+            return None
+
+    async def _aembed_prompt(self, question: Question, provider_config: ProviderConfig) -> list[float] | None:
+        if self.semantic_cache is None:
+            return None
+        try:
+            return (await self.client.aembed([question.prompt], provider_config))[0]
+        except NotImplementedError:
+            return None
+        except Exception:
+            logger.warning("Could not embed prompt for the semantic cache", exc_info=True)
+            return None
+
+    def _probe_semantic(
+        self, question: Question[TRes], provider_config: ProviderConfig, vector: list[float] | None
+    ) -> Answer[TRes] | tuple[str, list[float]] | None:
+        """
+        Look the prompt up in the semantic cache.
+        Returns the cached answer on a hit, the scope and vector to store the answer under
+        on a miss, or None when the semantic cache is not used.
+        """
+        if vector is None:
+            return None
+        from llmterface.semantic_cache import make_scope_key
+
+        scope = make_scope_key(self.client.PROVIDER, question, provider_config)
+        if (text := self.semantic_cache.get(scope, vector)) is not None:
+            if (answer := self._answer_from_cache(question, text)) is not None:
+                return answer
+        return scope, vector
+
+    def _store_semantic(self, probe: tuple[str, list[float]] | None, answer: Answer) -> None:
+        if probe is None:
+            return
+        try:
+            self.semantic_cache.set(*probe, answer.response.text)
+        except Exception:
+            logger.warning("Could not store answer in the semantic cache", exc_info=True)
+
+    def _answer_from_cache(self, question: Question[TRes], text: str) -> Answer[TRes] | None:
+        res = GenericResponse(original=None, text=text, metadata=ResponseMetadata(from_cache=True))
+        try:
+            return Answer(result=self._parse_response(question, res), response=res)
+        except ValueError:
+            return None
+
+    def _get_rate_limiter(self, question: Question, provider_config: ProviderConfig) -> RateLimiter | None:
+        limit = provider_config.rate_limit or question.config.rate_limit
+        if limit is None:
+            return None
+        return get_rate_limiter(self.client.PROVIDER, provider_config.get_model_id(), limit)
+
+    def _circuit(self, question: Question, provider_config: ProviderConfig) -> AbstractContextManager[None]:
+        """
+        Admit one provider request through the model's circuit breaker, if the config sets one.
+        """
+        if question.config.circuit_breaker is None:
+            return nullcontext()
+        breaker = get_circuit_breaker(
+            self.client.PROVIDER, provider_config.get_model_id(), question.config.circuit_breaker
+        )
+        return breaker.guard()
+
+    def _event_fields(self, provider_config: ProviderConfig, attempt: int) -> dict[str, t.Any]:
+        return {
+            "chat_id": self.id,
+            "provider": self.client.PROVIDER,
+            "model_id": provider_config.get_model_id(),
+            "attempt": attempt,
+        }
+
+    @staticmethod
+    def _usage_fields(res: GenericResponse) -> dict[str, t.Any]:
+        return {
+            "prompt_tokens": res.metadata.get("prompt_tokens"),
+            "output_tokens": res.metadata.get("output_tokens"),
+        }
+
+    @staticmethod
+    def _parse_response(question: Question[TRes], res: GenericResponse) -> TRes:
+        return question.config.validate_response_json(res.text)
+
+    def _parse_in_phases(
+        self, question: Question[TRes], res: GenericResponse, provider_config: ProviderConfig, attempt: int
+    ) -> TRes:
+        """
+        Parse a response, emitting JSON decoding and validation as the `parse` and `validate` phases.
+        """
+        if not has_hooks():
+            return self._parse_response(question, res)
+        fields = self._event_fields(provider_config, attempt)
+        spec = get_response_spec(question.config.response_model)
+        if spec.wrapper is None:
+            with span(Phase.parse, **fields):
+                result = self._parse_response(question, res)
+            emit(Event(phase=Phase.validate, **fields))
+            return result
+        with span(Phase.parse, **fields):
+            data = json.loads(res.text)
+        with span(Phase.validate, **fields):
+            return spec.validate(data)
+
+    def _get_retry(
+        self,
+        question: Question[TRes],
+        provider_config: ProviderConfig,
+        res: GenericResponse | None,
+        e: Exception,
+        retries: int,
+        started: float,
+        timed_out: bool = False,
+    ) -> tuple[Question[TRes], float]:
+        """
+        Classify a failed attempt and ask the question for its retry.
+        Returns the question to retry with and the backoff delay before retrying.
+        Raises the classified error when the question does not want to retry,
+        or the retry policy's time budget or the deadline is spent.
+        """
+        if timed_out:
+            exc = ex.TimeoutError(f"Provider did not answer in time: [{type(e)}]{e}", original_exception=e)
+        elif isinstance(e, (json.JSONDecodeError, ValueError)):
+            exc = ex.SchemaError(f"Error parsing response: [{type(e)}]{e}", original_exception=e)
+        else:
+            exc = ex.ProviderError(f"Error from provider: [{type(e)}]{e}", original_exception=e)
+        exc.__cause__ = e
+        retry_question = question.on_retry(question, response=res, e=exc, retries=retries)
+        if not retry_question:
+            raise exc from e
+        policy = question.config.retry_policy
+        delay = policy.get_delay(retries, exc) if policy else 0.0
+        if policy and not policy.allows(time.monotonic() - started, delay):
+            raise exc from e
+        if (left := remaining_time()) is not None and left <= delay:
+            raise ex.TimeoutError(
+                f"Deadline leaves {left:.2f}s, too little for another attempt: [{type(exc)}]{exc}",
+                original_exception=exc,
+            ) from e
+        if has_hooks():
+            emit(Event(phase=Phase.retry, duration=delay, error=exc, **self._event_fields(provider_config, retries)))
+        return retry_question, delay
 
     def close(self) -> None:
         """
@@ -87,6 +585,8 @@ class GenericChat[TRes: AllowedResponseTypes]:
         provider: str,
         chat_id: str,
         config: GenericConfig | None = None,
+        response_cache: ResponseCache | None = None,
+        semantic_cache: "SemanticCache | None" = None,
     ) -> "GenericChat":
         """
         Factory method to create a GenericChat with the specified provider.
@@ -95,4 +595,145 @@ class GenericChat[TRes: AllowedResponseTypes]:
         if not ProviderChatCls:
             raise NotImplementedError(f"No provider chat class found for provider: {provider}")
         client_chat = ProviderChatCls(id=chat_id, config=config)
-        return cls(client_chat.id, client_chat=client_chat, config=config)
+        return cls(
+            client_chat.id,
+            client_chat=client_chat,
+            config=config,
+            response_cache=response_cache,
+            semantic_cache=semantic_cache,
+        )
+
+    @classmethod
+    def restore(
+        cls,
+        provider: str,
+        chat_id: str,
+        history: ChatHistory,
+        config: GenericConfig | None = None,
+    ) -> "GenericChat":
+        """
+        Rebuild a chat from a saved history, e.g. after it was evicted or the process restarted.
+        """
+        chat = cls.create(provider, chat_id, config=config)
+        chat.client.load_history(history.turns)
+        chat.history = history
+        return chat
+
+
+class BatchRun:
+    """
+    The batch jobs answering one set of questions on one chat: a job per provider
+    model, plus follow-up jobs for items retried after failing validation.
+    """
+
+    def __init__(
+        self,
+        chat: GenericChat,
+        prepared: list[tuple[Question, ProviderConfig]],
+        timeout: float | None = None,
+    ):
+        self.chat = chat
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._prepared = prepared
+        self._retries = [0] * len(prepared)
+        self._jobs: dict[str, list[int]] = dict()
+        self._submit(range(len(prepared)))
+
+    @property
+    def done(self) -> bool:
+        return not self._jobs
+
+    def poll(self) -> list[tuple[int, AllowedResponseTypes | Exception]]:
+        """
+        Check every outstanding job once, without waiting, and return the results of those that finished.
+        """
+        results: list[tuple[int, AllowedResponseTypes | Exception]] = []
+        retried: list[int] = []
+        for job_id, indices in list(self._jobs.items()):
+            state = self.chat.client.get_batch_state(job_id)
+            if not state.done:
+                continue
+            del self._jobs[job_id]
+            if state != BatchState.succeeded:
+                error = ex.ProviderError(f"Batch job {job_id} ended in state '{state}'")
+                results.extend((i, error) for i in indices)
+                continue
+            responses = list(self.chat.client.get_batch_results(job_id))
+            for i, res in zip(indices, responses, strict=True):
+                result = self._check(i, res)
+                if result is None:
+                    retried.append(i)
+                else:
+                    results.append((i, result))
+        self._submit(retried)
+        return results
+
+    def cancel(self) -> None:
+        """
+        Cancel the jobs that are still running, where the provider supports it.
+        """
+        jobs, self._jobs = self._jobs, dict()
+        for job_id in jobs:
+            try:
+                self.chat.client.cancel_batch(job_id)
+            except NotImplementedError:
+                return
+            except Exception as e:
+                logger.warning("Could not cancel batch job %s: %s", job_id, e)
+
+    def _submit(self, indices: t.Iterable[int]) -> None:
+        by_model: dict[str | None, list[int]] = defaultdict(list)
+        for i in indices:
+            by_model[self._prepared[i][1].get_model_id()].append(i)
+        for model_indices in by_model.values():
+            job_id = self.chat.client.submit_batch([self._prepared[i] for i in model_indices])
+            self._jobs[job_id] = model_indices
+
+    def _check(self, i: int, res: GenericResponse | Exception) -> AllowedResponseTypes | Exception | None:
+        """
+        Validate one item's response. Returns None when the item is to be retried.
+        """
+        question, provider_config = self._prepared[i]
+        if isinstance(res, Exception):
+            return ex.ProviderError(f"Error from provider: [{type(res)}]{res}", original_exception=res)
+        try:
+            return self.chat._parse_response(question, res)
+        except ValueError as e:
+            exc = ex.SchemaError(f"Error parsing response: [{type(e)}]{e}", original_exception=e)
+        retry_question = question.on_retry(question, response=res, e=exc, retries=self._retries[i])
+        if not retry_question:
+            return exc
+        self._retries[i] += 1
+        self._prepared[i] = (retry_question, provider_config)
+        return None
+
+
+def poll_batches(
+    runs: t.Sequence[BatchRun], poll_interval: float = 30.0
+) -> t.Iterator[tuple[int, int, AllowedResponseTypes | Exception]]:
+    """
+    Poll batch runs together until all of their jobs finish, yielding
+    `(run index, question index, result)` as each job completes. Every item of
+    a job that failed as a whole yields a `ProviderError`.
+
+    Polls are `poll_interval` apart, and one more falls on a run's timeout.
+    Raises `ProviderError` when jobs are still running after that poll. Jobs
+    still running when this stops early, for an error or because the caller
+    stopped iterating, are cancelled.
+    """
+    try:
+        while True:
+            for r, run in enumerate(runs):
+                for index, result in run.poll():
+                    yield r, index, result
+            pending = [run for run in runs if not run.done]
+            if not pending:
+                return
+            now = time.monotonic()
+            left = [run.deadline - now for run in pending if run.deadline is not None]
+            if left and min(left) <= 0:
+                raise ex.ProviderError("Batch jobs did not finish before the timeout")
+            time.sleep(min([poll_interval, *left]))
+    finally:
+        for run in runs:
+            run.cancel()
@@ -1,10 +1,15 @@
 import typing as t
 
+from llmterface.helpers import make_hashable
+from llmterface.models.context_window import ContextWindow
 from llmterface.models.generic_model_types import GenericModelType
-from llmterface.models.simple_answers import SIMPLE_MAP
+from llmterface.models.response_registry import get_response_spec
+from llmterface.models.retry_policy import RetryPolicy
+from llmterface.providers.circuit_breaker import CircuitBreakerPolicy
 from llmterface.providers.discovery import get_provider_config
 from llmterface.providers.provider_config import ProviderConfig
-from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, field_validator
+from llmterface.providers.rate_limiter import RateLimit
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, SerializeAsAny, field_validator
 
 AllowedResponseTypes: t.TypeAlias = BaseModel | str | int | float | bool  # noqa: UP040
 
@@ -87,6 +92,51 @@ class GenericConfig[TRes: AllowedResponseTypes = str](BaseModel):
         ),
     )
 
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds a single provider request may take before it is abandoned and retried.",
+    )
+    deadline: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds a whole ask may take, across every retry and backoff, "
+            "including context-window trimming and semantic-cache embeddings. "
+            "Each attempt only gets the time that is left."
+        ),
+    )
+    retry_policy: RetryPolicy | None = Field(
+        default_factory=RetryPolicy,
+        description=(
+            "Backoff applied between retries of a question. "
+            "Set to None to retry immediately, as decided by `Question.on_retry`."
+        ),
+    )
+    context_window: ContextWindow | None = Field(
+        default=None,
+        description=(
+            "Opt-in sliding window keeping the history persistent chats send within `max_input_tokens`. "
+            "Oldest turns are dropped or summarized first. None always sends the full history."
+        ),
+    )
+    rate_limit: RateLimit | None = Field(
+        default=None,
+        description=(
+            "Client-side requests/tokens per minute budget, shared by every ask to the same provider model. "
+            "Callers wait for capacity instead of hitting provider quota errors."
+        ),
+    )
+    circuit_breaker: CircuitBreakerPolicy | None = Field(
+        default=None,
+        description=(
+            "Circuit breaker shared by every ask to the same provider model. While it is open, "
+            "asks fail fast with `CircuitOpenError` instead of waiting on a failing provider."
+        ),
+    )
+
+    _fingerprint: tuple[t.Hashable, ...] | None = PrivateAttr(default=None)
+
     @field_validator("provider_overrides", mode="before")
     @classmethod
     def validate_provider_overrides(cls, v: t.Any) -> dict[str, ProviderConfig]:
@@ -125,18 +175,39 @@ class GenericConfig[TRes: AllowedResponseTypes = str](BaseModel):
         except ValueError as e:
             raise ValueError(f"Invalid model enum value: {v}") from e
 
+    def fingerprint(self) -> t.Hashable:
+        """
+        Hashable identity of the settings used to compile provider configs.
+        `provider_overrides` is excluded because overrides are used as-is.
+
+        It is computed once per instance and dropped whenever a field is assigned or
+        the config is copied, since it is looked up on every ask. The nested policy
+        models are frozen, so they cannot change under a cached fingerprint.
+        """
+        # read the private slot directly: attribute access to private attrs goes through pydantic's __getattr__
+        private = self.__pydantic_private__
+        if (fingerprint := private["_fingerprint"]) is None:
+            fingerprint = private["_fingerprint"] = tuple(
+                make_hashable(getattr(self, name)) for name in type(self).model_fields if name != "provider_overrides"
+            )
+        return fingerprint
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        if name in type(self).model_fields:
+            self._fingerprint = None
+        super().__setattr__(name, value)
+
+    def model_copy(self, *, update: t.Mapping[str, t.Any] | None = None, deep: bool = False) -> t.Self:
+        copied = super().model_copy(update=update, deep=deep)
+        copied._fingerprint = None
+        return copied
+
     def get_response_schema(self) -> dict[str, t.Any]:
         """
         Get the JSON schema for the expected response model.
+        The schema is compiled once per response model and shared; do not mutate it.
         """
-        if not isinstance(self.response_model, type):
-            raise TypeError(f"response_model must be a type, got: {type(self.response_model)}")
-        if issubclass(self.response_model, BaseModel):
-            return self.response_model.model_json_schema()
-        elif self.response_model in SIMPLE_MAP:
-            return SIMPLE_MAP[self.response_model].model_json_schema()
-        else:
-            raise NotImplementedError(f"Response schema generation not implemented for type: {self.response_model}")
+        return get_response_spec(self.response_model).json_schema
 
     def validate_response(
         self,
@@ -145,11 +216,17 @@ class GenericConfig[TRes: AllowedResponseTypes = str](BaseModel):
         """
         Validate the response data against the expected response model.
         """
-        if issubclass(self.response_model, BaseModel):
-            return self.response_model.model_validate(response_data)
-        if self.response_model not in SIMPLE_MAP:
-            raise NotImplementedError(f"Response validation not implemented for type: {self.response_model}")
-        return SIMPLE_MAP[self.response_model].model_validate(response_data).response
+        return get_response_spec(self.response_model).validate(response_data)
+
+    def validate_response_json(
+        self,
+        response_text: str | bytes,
+    ) -> TRes:
+        """
+        Validate a raw JSON response against the expected response model.
+        Malformed JSON raises a `ValueError` just like failed validation.
+        """
+        return get_response_spec(self.response_model).validate_json(response_text)
 
     def __str__(self) -> str:
         return (
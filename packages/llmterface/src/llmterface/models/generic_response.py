@@ -2,8 +2,64 @@ import typing as t
 from dataclasses import dataclass, field
 
 
+class ResponseMetadata(t.TypedDict, total=False):
+    """
+    Standard keys of `GenericResponse.metadata`. Providers fill in what they know.
+    Times are wall-clock seconds measured around the provider request.
+    """
+
+    prompt_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    model_id: str
+    finish_reason: str
+    time_to_first_byte: float
+    total_time: float
+    from_cache: bool
+
+
 @dataclass(frozen=True, slots=True)
 class GenericResponse[T]:
     original: T
     text: str
-    metadata: t.Mapping[str, t.Any] = field(default_factory=dict)
+    metadata: ResponseMetadata | t.Mapping[str, t.Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class Answer[T]:
+    """
+    A validated result together with the provider response it was parsed from.
+    """
+
+    result: T
+    response: GenericResponse
+    retries: int = 0
+
+    @property
+    def metadata(self) -> ResponseMetadata | t.Mapping[str, t.Any]:
+        return self.response.metadata
+
+
+@dataclass(frozen=True, slots=True)
+class StreamChunk[T]:
+    """
+    One increment of a streamed answer.
+
+    text:
+        Text received in this chunk.
+    accumulated:
+        All text received so far.
+    partial:
+        Best-effort, unvalidated object parsed from the partial JSON when partial parsing is enabled.
+    result:
+        The fully validated result. Only set on the final chunk.
+    metadata:
+        Usage and timing metadata reported so far. Complete on the final chunk.
+    """
+
+    text: str
+    accumulated: str
+    partial: T | None = None
+    result: T | None = None
+    done: bool = False
+    metadata: ResponseMetadata | t.Mapping[str, t.Any] = field(default_factory=dict)
@@ -17,6 +17,16 @@ class Question[TRes: AllowedResponseTypes](BaseModel):
     )
     question: str = Field(default="", description="The question to ask the AI.")
     max_retries: int = Field(default=1, description="Maximum number of retries for this question.")
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds per provider request. Overrides `GenericConfig.timeout`.",
+    )
+    deadline: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds for the whole ask including retries. Overrides `GenericConfig.deadline`.",
+    )
 
     def get_question(self) -> str:
         """
@@ -65,6 +75,16 @@ class Question[TRes: AllowedResponseTypes](BaseModel):
         """
         return self.config
 
+    def get_timeout(self) -> float | None:
+        if self.timeout is not None or self.config is None:
+            return self.timeout
+        return self.config.timeout
+
+    def get_deadline(self) -> float | None:
+        if self.deadline is not None or self.config is None:
+            return self.deadline
+        return self.config.deadline
+
     @property
     def prompt(self) -> str:
         return self.get_question()
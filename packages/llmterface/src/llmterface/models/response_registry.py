@@ -0,0 +1,79 @@
+import json
+import typing as t
+from dataclasses import dataclass
+
+from llmterface.helpers import LRUCache
+from llmterface.models.simple_answers import SIMPLE_MAP, SimpleAnswersBase
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import from_json
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseSpec[T]:
+    """
+    Precompiled schema and validator for a `response_model`.
+
+    wrapper:
+        The `SIMPLE_MAP` model wrapping simple types such as `int`,
+        or None when the response model is a pydantic model itself.
+    """
+
+    response_model: type[T]
+    json_schema: dict[str, t.Any]
+    adapter: TypeAdapter[t.Any]
+    wrapper: type[SimpleAnswersBase] | None = None
+
+    def validate(self, data: t.Any) -> T:
+        value = self.adapter.validate_python(data)
+        return value.response if self.wrapper is not None else value
+
+    def validate_json(self, text: str | bytes) -> T:
+        """
+        Parse and validate raw JSON in a single pass with pydantic-core.
+        Simple types keep the two-step path through `json.loads`.
+        """
+        if self.wrapper is not None:
+            return self.validate(json.loads(text))
+        return self.adapter.validate_json(text)
+
+    def parse_partial(self, text: str | bytes) -> T | None:
+        """
+        Best-effort parse of incomplete JSON into a partially populated, unvalidated value.
+        Returns None when nothing usable can be parsed yet.
+        """
+        try:
+            data = from_json(text, allow_partial="trailing-strings")
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        if self.wrapper is not None:
+            return data.get("response")
+        return self.response_model.model_construct(**data)
+
+
+_RESPONSE_SPECS: LRUCache[type, ResponseSpec] = LRUCache(max_size=1024)
+
+
+def compile_response_spec[T](response_model: type[T]) -> ResponseSpec[T]:
+    if not isinstance(response_model, type):
+        raise TypeError(f"response_model must be a type, got: {type(response_model)}")
+    if issubclass(response_model, BaseModel):
+        target, wrapper = response_model, None
+    elif response_model in SIMPLE_MAP:
+        target = wrapper = SIMPLE_MAP[response_model]
+    else:
+        raise NotImplementedError(f"Response handling not implemented for type: {response_model}")
+    return ResponseSpec(
+        response_model=response_model,
+        json_schema=target.model_json_schema(),
+        adapter=TypeAdapter(target),
+        wrapper=wrapper,
+    )
+
+
+def get_response_spec[T](response_model: type[T]) -> ResponseSpec[T]:
+    """
+    Return the compiled spec for `response_model`, compiling it on first use.
+    """
+    return _RESPONSE_SPECS.get_or_set(response_model, lambda: compile_response_spec(response_model))
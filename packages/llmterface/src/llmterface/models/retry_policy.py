@@ -0,0 +1,118 @@
+import random
+import re
+import typing as t
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import llmterface.exceptions as ex
+from pydantic import BaseModel, ConfigDict, Field
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*s?\s*$")
+
+
+class RetryPolicy(BaseModel):
+    """
+    Backoff applied between retries of a question.
+
+    The delay before retry `n` is `initial_delay * multiplier**n`, capped at
+    `max_delay`, with up to `jitter` of it randomized away. Server `Retry-After`
+    hints raise the delay when they are longer.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    initial_delay: float = Field(default=0.5, ge=0, description="Delay in seconds before the first retry.")
+    multiplier: float = Field(default=2.0, ge=1, description="Factor applied to the delay after each retry.")
+    max_delay: float = Field(default=30.0, ge=0, description="Upper bound in seconds for a single delay.")
+    jitter: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        description="Fraction of each delay that is randomized. 1.0 is full jitter, 0.0 disables jitter.",
+    )
+    max_elapsed: float | None = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds since the first attempt after which no further retries are started.",
+    )
+    respect_retry_after: bool = Field(
+        default=True,
+        description="Honor retry hints such as a `Retry-After` header carried by the provider error.",
+    )
+    backoff_schema_errors: bool = Field(
+        default=False,
+        description="Also wait before retrying schema errors. By default they are retried immediately.",
+    )
+
+    def get_delay(self, retries: int, error: Exception) -> float:
+        """
+        Seconds to wait before retry number `retries` (0-based) after `error`.
+        """
+        if isinstance(error, ex.SchemaError) and not self.backoff_schema_errors:
+            return 0.0
+        delay = min(self.max_delay, self.initial_delay * self.multiplier**retries)
+        delay -= random.uniform(0, delay * self.jitter)
+        if self.respect_retry_after and (hint := get_retry_after(error)) is not None:
+            delay = max(delay, hint)
+        return delay
+
+    def allows(self, elapsed: float, delay: float) -> bool:
+        """
+        Whether a retry starting after `delay` more seconds still fits in `max_elapsed`.
+        """
+        return self.max_elapsed is None or elapsed + delay <= self.max_elapsed
+
+
+def get_retry_after(error: BaseException | None) -> float | None:
+    """
+    Extract a server retry hint in seconds from an error or its original exception.
+
+    Looks for a `retry_after` attribute, a `Retry-After` header on the error or its
+    response, and a `retryDelay` entry in structured error details.
+    """
+    seen: set[int] = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        for hint in _iter_retry_hints(error):
+            if (seconds := _parse_retry_after(hint)) is not None:
+                return seconds
+        error = getattr(error, "original_exception", None) or error.__cause__
+    return None
+
+
+def _iter_retry_hints(error: BaseException) -> t.Iterator[t.Any]:
+    yield getattr(error, "retry_after", None)
+    for holder in (error, getattr(error, "response", None)):
+        headers = getattr(holder, "headers", None)
+        if headers is not None and hasattr(headers, "get"):
+            yield headers.get("Retry-After") or headers.get("retry-after")
+    yield from _find_retry_delays(getattr(error, "details", None))
+
+
+def _find_retry_delays(details: t.Any) -> t.Iterator[t.Any]:
+    if isinstance(details, t.Mapping):
+        for key, value in details.items():
+            if key in ("retryDelay", "retry_delay"):
+                yield value
+            else:
+                yield from _find_retry_delays(value)
+    elif isinstance(details, list):
+        for item in details:
+            yield from _find_retry_delays(item)
+
+
+def _parse_retry_after(value: t.Any) -> float | None:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    if isinstance(value, str):
+        if match := _DURATION_RE.match(value):
+            return float(match.group(1))
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        return max(0.0, (when - datetime.now(UTC)).total_seconds())
+    return None
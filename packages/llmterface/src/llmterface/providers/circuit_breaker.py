@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from collections import deque
+from contextlib import contextmanager
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+import llmterface.exceptions as ex
+from llmterface.instrumentation.hooks import Event, Phase, emit, has_hooks
+
+
+class CircuitState(StrEnum):
+    closed = "closed"  # requests flow, outcomes are recorded
+    open = "open"  # requests fail fast with `CircuitOpenError`
+    half_open = "half_open"  # a few probe requests decide whether to close again
+
+
+class CircuitBreakerPolicy(BaseModel):
+    """
+    When to stop sending requests to a failing provider model, and when to try again.
+
+    The circuit opens once at least `min_calls` of the last `window` requests were
+    recorded and the share of them that failed with a provider error reaches
+    `failure_rate`. After `open_duration` seconds, up to `half_open_calls` probe
+    requests are let through; if all of them succeed the circuit closes, a single
+    failure opens it again.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    failure_rate: float = Field(default=0.5, gt=0, le=1, description="Failure share that opens the circuit.")
+    window: int = Field(default=20, ge=1, description="Number of recent requests the failure rate covers.")
+    min_calls: int = Field(default=10, ge=1, description="Requests needed before the circuit may open.")
+    open_duration: float = Field(default=30.0, ge=0, description="Seconds the circuit stays open before probing.")
+    half_open_calls: int = Field(default=1, ge=1, description="Probe requests allowed while half-open.")
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit for one provider model.
+
+    Every state change is emitted as an instrumentation `Event` with phase
+    `Phase.circuit` and the new and previous state in its attributes.
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy, provider: str | None = None, model_id: str | None = None):
+        self.policy = policy
+        self.provider = provider
+        self.model_id = model_id
+        self.rejected = 0
+        self._state = CircuitState.closed
+        self._outcomes: deque[bool] = deque(maxlen=policy.window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        Admit a request or raise `CircuitOpenError`.
+        An admitted request must be followed by `record_success`, `record_failure` or `release`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state is CircuitState.closed:
+                return
+            if state is CircuitState.half_open and self._probes < self.policy.half_open_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self._opened_at + self.policy.open_duration - now)
+        raise ex.CircuitOpenError(
+            f"Circuit for {self.provider}:{self.model_id} is {state}; not sending request",
+            retry_after=retry_after,
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                self._probes = max(0, self._probes - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.policy.half_open_calls:
+                    self._transition(CircuitState.closed)
+                return
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                self._probes = max(0, self._probes - 1)
+                self._transition(CircuitState.open)
+                return
+            self._outcomes.append(True)
+            if self._state is CircuitState.closed and self._should_open():
+                self._transition(CircuitState.open)
+
+    def release(self) -> None:
+        """
+        Give back an admitted request that ended without an outcome, e.g. because it was cancelled.
+        """
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                self._probes = max(0, self._probes - 1)
+
+    @contextmanager
+    def guard(self) -> t.Generator[None]:
+        """
+        Admit the enclosed request and record its outcome. Any exception counts as a failure.
+        """
+        self.before_call()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+    def _should_open(self) -> bool:
+        calls = len(self._outcomes)
+        return calls >= self.policy.min_calls and sum(self._outcomes) / calls >= self.policy.failure_rate
+
+    def _current_state(self, now: float) -> CircuitState:
+        if self._state is CircuitState.open and now - self._opened_at >= self.policy.open_duration:
+            self._transition(CircuitState.half_open)
+        return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        previous, self._state = self._state, state
+        if state is CircuitState.open:
+            self._opened_at = time.monotonic()
+        elif state is CircuitState.half_open:
+            self._probes = self._probe_successes = 0
+        else:
+            self._outcomes.clear()
+        if has_hooks():
+            emit(
+                Event(
+                    phase=Phase.circuit,
+                    provider=self.provider,
+                    model_id=self.model_id,
+                    attributes={"state": str(state), "previous_state": str(previous)},
+                )
+            )
+
+
+_BREAKERS: dict[tuple[str, str | None, CircuitBreakerPolicy], CircuitBreaker] = dict()
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, model_id: str | None, policy: CircuitBreakerPolicy) -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker for a provider model and its policy.
+    """
+    key = (provider, model_id, policy)
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = _BREAKERS[key] = CircuitBreaker(policy, provider=provider, model_id=model_id)
+        return breaker
+
+
+def get_circuit_states() -> dict[tuple[str, str | None], CircuitState]:
+    """
+    Current state of every circuit, keyed by provider and model id.
+    """
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {(breaker.provider, breaker.model_id): breaker.state for breaker in breakers}
+
+
+def clear_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
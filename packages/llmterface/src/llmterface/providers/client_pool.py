@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("llmterface")
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    client: t.Any
+    closer: t.Callable[[t.Any], None] | None = None
+    leases: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ClientPool:
+    """
+    Thread-safe pool of provider SDK clients.
+
+    Clients are keyed by provider and credentials so that every chat talking to
+    the same account shares one client and its warm HTTP connections.
+    Chats lease a client with `acquire()` and hand it back with `release()`.
+
+    max_size:
+        Maximum number of clients kept in the pool. When exceeded, the least
+        recently used idle clients are closed. Leased clients are never evicted,
+        so the pool may temporarily grow past this bound while they are in use.
+    idle_ttl:
+        Seconds an unleased client may sit unused before it is closed.
+        `None` disables idle eviction.
+
+    Eviction runs only when the pool is used, on `acquire()` and `release()`; no
+    background thread sweeps it. A process that stops asking keeps its idle clients
+    open until it calls `evict_idle()` or `close()`, which runs at exit for the
+    process-wide pool.
+    """
+
+    def __init__(self, max_size: int = 32, idle_ttl: float | None = 300.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._entries: OrderedDict[t.Hashable, _PoolEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, *credentials: t.Any) -> tuple[str, str]:
+        """
+        Build a pool key for a provider and its credentials.
+        Credentials are hashed so that secrets are never kept as dict keys.
+        """
+        digest = hashlib.sha256(repr(credentials).encode()).hexdigest()
+        return provider, digest
+
+    def acquire[TClient](
+        self,
+        key: t.Hashable,
+        factory: t.Callable[[], TClient],
+        closer: t.Callable[[TClient], None] | None = None,
+    ) -> TClient:
+        """
+        Lease the client stored under `key`, creating it with `factory` if needed.
+        Every call must be paired with a `release()` of the same key.
+
+        `factory` runs outside the pool lock, so a slow client construction does not hold
+        up other keys. When two threads build a client for the same key at once, the first
+        one stored is leased to both and the other is closed.
+        """
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                client = self._lease(key, entry)
+                evicted = self._collect_evictions()
+        if entry is None:
+            created = _PoolEntry(client=factory(), closer=closer)
+            with self._lock:
+                entry = self._entries.setdefault(key, created)
+                client = self._lease(key, entry)
+                evicted = self._collect_evictions()
+            if entry is not created:
+                evicted.append(created)
+        self._close_entries(evicted)
+        return client
+
+    def _lease(self, key: t.Hashable, entry: _PoolEntry) -> t.Any:
+        self._entries.move_to_end(key)
+        entry.leases += 1
+        entry.last_used = time.monotonic()
+        return entry.client
+
+    def release(self, key: t.Hashable) -> None:
+        """
+        Return a leased client to the pool. The client stays warm for reuse.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.leases > 0:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+            evicted = self._collect_evictions()
+        self._close_entries(evicted)
+
+    @contextmanager
+    def lease[TClient](
+        self,
+        key: t.Hashable,
+        factory: t.Callable[[], TClient],
+        closer: t.Callable[[TClient], None] | None = None,
+    ) -> t.Generator[TClient]:
+        client = self.acquire(key, factory, closer)
+        try:
+            yield client
+        finally:
+            self.release(key)
+
+    def evict_idle(self) -> int:
+        """
+        Close clients that exceeded the idle TTL or the size bound.
+        Returns the number of clients closed.
+        """
+        with self._lock:
+            evicted = self._collect_evictions()
+        self._close_entries(evicted)
+        return len(evicted)
+
+    def close(self) -> None:
+        """
+        Close every pooled client, including leased ones, and empty the pool.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        self._close_entries(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        return key in self._entries
+
+    def _collect_evictions(self) -> list[_PoolEntry]:
+        evicted: list[_PoolEntry] = []
+        if self.idle_ttl is not None:
+            cutoff = time.monotonic() - self.idle_ttl
+            for key, entry in list(self._entries.items()):
+                if entry.leases == 0 and entry.last_used <= cutoff:
+                    evicted.append(self._entries.pop(key))
+        if len(self._entries) > self.max_size:
+            for key, entry in list(self._entries.items()):
+                if len(self._entries) <= self.max_size:
+                    break
+                if entry.leases == 0:
+                    evicted.append(self._entries.pop(key))
+        return evicted
+
+    @staticmethod
+    def _close_entries(entries: t.Iterable[_PoolEntry]) -> None:
+        for entry in entries:
+            try:
+                if entry.closer is not None:
+                    entry.closer(entry.client)
+                elif callable(close := getattr(entry.client, "close", None)):
+                    close()
+            except Exception:
+                logger.warning("Error while closing pooled client", exc_info=True)
+
+
+_default_pool: ClientPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """
+    Return the process-wide client pool, creating it on first use.
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ClientPool()
+                atexit.register(_default_pool.close)
+    return _default_pool
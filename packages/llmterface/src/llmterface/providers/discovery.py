@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 import typing as t
-from importlib.metadata import entry_points
+from importlib.metadata import EntryPoint, entry_points
 
 if t.TYPE_CHECKING:
     from llmterface.providers.provider_chat import ProviderChat
@@ -12,40 +13,78 @@ ENTRYPOINT_GROUP = "llmterface.providers"
 
 _loaded = False
 _PROVIDER_SPECS: dict[str, ProviderSpec] = dict()
+# entry points discovered from package metadata, not yet imported
+_PROVIDER_ENTRY_POINTS: dict[str, EntryPoint] = dict()
+_LOAD_LOCK = threading.RLock()
 
 
 def load_provider_configs() -> None:
-    from llmterface.providers.provider_spec import ProviderSpec
+    """
+    Eagerly import every installed provider plugin and register its spec.
+    """
+    discover_providers()
+    for name in list(_PROVIDER_ENTRY_POINTS):
+        _load_entry_point(name)
 
-    eps = entry_points(group=ENTRYPOINT_GROUP)
-    for ep in eps:
-        obj = ep.load()
-        if not isinstance(obj, ProviderSpec):
-            raise ValueError(f"Entry point {ep.name} did not return a ProviderSpec instance")
-        _PROVIDER_SPECS[obj.provider] = obj
+
+def discover_providers() -> None:
+    """
+    Register installed providers by name from entry-point metadata without importing them.
+    A plugin module, and the SDK it pulls in, is imported the first time its provider is requested.
+    """
+    with _LOAD_LOCK:
+        for ep in entry_points(group=ENTRYPOINT_GROUP):
+            if ep.name not in _PROVIDER_SPECS:
+                _PROVIDER_ENTRY_POINTS[ep.name] = ep
 
 
 def load_provider_configs_once() -> None:
     global _loaded
     if _loaded:
         return
-    load_provider_configs()
+    discover_providers()
     _loaded = True
 
 
-def get_provider_config(provider: str) -> type[ProviderConfig]:
+def available_providers() -> list[str]:
+    """
+    Names of all registered providers, whether or not their plugin has been imported yet.
+    """
     load_provider_configs_once()
-    if provider not in _PROVIDER_SPECS:
-        if not isinstance(provider, str):
-            raise TypeError(f"provider must be a str, got {type(provider)}")
-        raise NotImplementedError(f"No provider spec found for provider: '{provider}'. Did you install it correctly?")
-    return _PROVIDER_SPECS[provider].config_cls
+    return sorted({*_PROVIDER_SPECS, *_PROVIDER_ENTRY_POINTS})
 
 
-def get_provider_chat(provider: str) -> type[ProviderChat]:
+def get_provider_spec(provider: str) -> ProviderSpec:
+    if not isinstance(provider, str):
+        raise TypeError(f"provider must be a str, got {type(provider)}")
     load_provider_configs_once()
-    if provider not in _PROVIDER_SPECS:
-        if not isinstance(provider, str):
-            raise TypeError(f"provider must be a str, got {type(provider)}")
-        raise NotImplementedError(f"No provider spec found for provider: '{provider}'. Did you install it correctly?")
-    return _PROVIDER_SPECS[provider].chat_cls
+    if provider in _PROVIDER_SPECS:
+        return _PROVIDER_SPECS[provider]
+    if provider in _PROVIDER_ENTRY_POINTS:
+        return _load_entry_point(provider)
+    raise NotImplementedError(f"No provider spec found for provider: '{provider}'. Did you install it correctly?")
+
+
+def get_provider_config(provider: str) -> type[ProviderConfig]:
+    return get_provider_spec(provider).config_cls
+
+
+def get_provider_chat(provider: str) -> type[ProviderChat]:
+    return get_provider_spec(provider).chat_cls
+
+
+def _load_entry_point(name: str) -> ProviderSpec:
+    from llmterface.providers.provider_spec import ProviderSpec
+
+    with _LOAD_LOCK:
+        if name in _PROVIDER_SPECS:
+            return _PROVIDER_SPECS[name]
+        ep = _PROVIDER_ENTRY_POINTS[name]
+        obj = ep.load()
+        if not isinstance(obj, ProviderSpec):
+            raise ValueError(f"Entry point {ep.name} did not return a ProviderSpec instance")
+        if obj.provider != ep.name:
+            raise ValueError(f"Entry point {ep.name} registered a spec for provider '{obj.provider}'")
+        _PROVIDER_SPECS[obj.provider] = obj
+        del _PROVIDER_ENTRY_POINTS[name]
+        return obj
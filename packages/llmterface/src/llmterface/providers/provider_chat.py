@@ -1,12 +1,33 @@
+import asyncio
+import hashlib
 import typing as t
 from abc import ABC, abstractmethod
+from enum import StrEnum
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from llmterface.helpers import LRUCache
+from llmterface.models.chat_history import ChatTurn
 from llmterface.models.generic_config import GenericConfig
 from llmterface.models.generic_response import GenericResponse
 from llmterface.models.question import Question
 from llmterface.providers.provider_config import ProviderConfig
+from llmterface.tokens import estimate_tokens
+
+# exact token counts reported by providers, keyed by provider, model and a digest of the input text
+_TOKEN_COUNTS: LRUCache[tuple[str, str | None, str], int] = LRUCache(max_size=4096)
+
+
+class BatchState(StrEnum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+    @property
+    def done(self) -> bool:
+        return self in (BatchState.succeeded, BatchState.failed, BatchState.cancelled)
 
 
 class ProviderChat(BaseModel, ABC):
@@ -23,8 +44,115 @@ class ProviderChat(BaseModel, ABC):
         """
         ...
 
+    async def aask(self, question: Question, provider_config: ProviderConfig) -> GenericResponse:
+        """
+        Asynchronously ask a question to the AI chat provider.
+        Providers without a native async client fall back to running `ask` in a worker thread.
+        """
+        return await asyncio.to_thread(self.ask, question, provider_config)
+
+    def stream(self, question: Question, provider_config: ProviderConfig) -> t.Iterator[GenericResponse]:
+        """
+        Ask a question and yield the response text incrementally.
+        Providers without streaming support yield the complete response as a single chunk.
+        """
+        yield self.ask(question, provider_config)
+
+    def count_tokens(
+        self,
+        question: Question,
+        provider_config: ProviderConfig,
+        exact: bool = False,
+        history: t.Sequence[ChatTurn] = (),
+    ) -> int:
+        """
+        Count the input tokens of `question`, sent after the turns in `history`.
+
+        By default this is the provider config's calibrated local estimate, cheap enough
+        for the hot path. With `exact=True`, the provider's own count is used when it
+        offers one; those counts are cached, since each costs a round-trip.
+        """
+        if not exact:
+            return self._estimate_tokens(question, provider_config, history)
+        key = (self.PROVIDER, provider_config.get_model_id(), _input_digest(question, history))
+        if (count := _TOKEN_COUNTS.get(key)) is not None:
+            return count
+        try:
+            count = self.count_tokens_remote(question, provider_config, history=history)
+        except NotImplementedError:
+            return self._estimate_tokens(question, provider_config, history)
+        _TOKEN_COUNTS.set(key, count)
+        return count
+
+    def count_tokens_remote(
+        self, question: Question, provider_config: ProviderConfig, history: t.Sequence[ChatTurn] = ()
+    ) -> int:
+        """
+        Ask the provider for the exact input token count of `question` after `history`.
+        Providers without a counting endpoint leave this unimplemented.
+        """
+        raise NotImplementedError(f"{self.PROVIDER} does not offer remote token counting")
+
+    @staticmethod
+    def _estimate_tokens(question: Question, provider_config: ProviderConfig, history: t.Sequence[ChatTurn]) -> int:
+        return provider_config.count_tokens(question) + sum(
+            estimate_tokens(turn.text, provider_config.CHARS_PER_TOKEN) for turn in history
+        )
+
+    def embed(self, texts: t.Sequence[str], provider_config: ProviderConfig) -> list[list[float]]:
+        """
+        Return one embedding vector per text, in input order, from the provider's embedding model.
+        Providers without an embedding endpoint leave this unimplemented.
+        """
+        raise NotImplementedError(f"{self.PROVIDER} does not offer embeddings")
+
+    async def aembed(self, texts: t.Sequence[str], provider_config: ProviderConfig) -> list[list[float]]:
+        """
+        Asynchronous counterpart of `embed`, running it in a worker thread unless overridden.
+        """
+        return await asyncio.to_thread(self.embed, texts, provider_config)
+
+    def submit_batch(self, requests: t.Sequence[tuple[Question, ProviderConfig]]) -> str:
+        """
+        Submit questions as one offline batch job and return the job id.
+        Providers without a batch API leave the batch methods unimplemented.
+        """
+        raise NotImplementedError(f"{self.PROVIDER} does not support batch jobs")
+
+    def get_batch_state(self, job_id: str) -> BatchState:
+        raise NotImplementedError(f"{self.PROVIDER} does not support batch jobs")
+
+    def get_batch_results(self, job_id: str) -> t.Iterator[GenericResponse | Exception]:
+        """
+        Yield one response per submitted question, in submission order.
+        A question the provider failed to answer yields an exception in its place.
+        """
+        raise NotImplementedError(f"{self.PROVIDER} does not support batch jobs")
+
+    def cancel_batch(self, job_id: str) -> None:
+        raise NotImplementedError(f"{self.PROVIDER} does not support batch jobs")
+
+    def load_history(self, turns: t.Sequence[ChatTurn]) -> None:
+        """
+        Seed the provider chat with earlier turns, replacing any conversation state it holds.
+        Stateless providers have nothing to rebuild; providers that keep history must override this.
+        """
+        pass
+
     def close(self) -> None:
         """
         Optional standard method to close the chat and perform any necessary cleanup.
         """
         pass
+
+
+def _input_digest(question: Question, history: t.Sequence[ChatTurn]) -> str:
+    digest = hashlib.sha256()
+    for text in (
+        question.config.system_instruction or "",
+        *(f"{turn.role}:{turn.text}" for turn in history),
+        question.prompt,
+    ):
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
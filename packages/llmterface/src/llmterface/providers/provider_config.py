@@ -3,10 +3,14 @@ from __future__ import annotations
 import typing as t
 from abc import ABC, abstractmethod
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from llmterface.providers.rate_limiter import RateLimit
+from llmterface.tokens import DEFAULT_CHARS_PER_TOKEN, estimate_tokens
 
 if t.TYPE_CHECKING:
     from llmterface.models.generic_config import GenericConfig
+    from llmterface.models.question import Question
 
 
 class ProviderConfig(BaseModel, ABC):
@@ -14,9 +18,20 @@ class ProviderConfig(BaseModel, ABC):
 
     PROVIDER:
         Provider identifier for this config subclass.
+    CHARS_PER_TOKEN:
+        Calibration of the local token estimate: average characters per token
+        of this provider's tokenizer.
+    EMBED_BATCH_SIZE:
+        Most texts the provider accepts in one embedding request.
     """
 
     PROVIDER: t.ClassVar[str]
+    CHARS_PER_TOKEN: t.ClassVar[float] = DEFAULT_CHARS_PER_TOKEN
+    EMBED_BATCH_SIZE: t.ClassVar[int] = 100
+    rate_limit: RateLimit | None = Field(
+        default=None,
+        description="Client-side rate limit for this provider. Takes precedence over `GenericConfig.rate_limit`.",
+    )
 
     @classmethod
     @abstractmethod
@@ -24,3 +39,27 @@ class ProviderConfig(BaseModel, ABC):
         cls,
         config: GenericConfig | None,
     ) -> ProviderConfig: ...
+
+    def get_model_id(self) -> str | None:
+        """
+        Identifier of the concrete provider model requests are sent to, if known.
+        Used to key per-model state such as rate limits.
+        """
+        return None
+
+    def get_embedding_model_id(self) -> str | None:
+        """
+        Identifier of the provider model used by `ProviderChat.embed`, if the provider offers embeddings.
+        Vectors from different embedding models are not comparable, so caches key them by this id.
+        """
+        return None
+
+    def count_tokens(self, question: Question) -> int:
+        """
+        Local estimate of the input tokens of `question`: its prompt plus the system instruction.
+        No request is sent to the provider.
+        """
+        system_instruction = question.config.system_instruction if question.config else None
+        return estimate_tokens(question.prompt, self.CHARS_PER_TOKEN) + estimate_tokens(
+            system_instruction, self.CHARS_PER_TOKEN
+        )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from pydantic import BaseModel, ConfigDict, Field
+
+import llmterface.exceptions as ex
+
+
+class RateLimit(BaseModel):
+    """
+    Client-side request and token budgets for one provider model.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    requests_per_minute: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of requests started per minute.",
+    )
+    tokens_per_minute: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of estimated input tokens sent per minute.",
+    )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously.
+
+    Reservations never block while holding the lock: a caller takes its tokens
+    immediately, possibly going into debt, and is told how long to wait until
+    the debt is repaid. This keeps waiters in arrival order and lets threads
+    and asyncio tasks share one bucket.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` tokens and return the seconds to wait before using them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_second
+
+    def refund(self, amount: float) -> None:
+        """
+        Return tokens that were reserved but not used, or take more when `amount` is negative.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets for one provider model.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.requests = self._bucket(limit.requests_per_minute)
+        self.tokens = self._bucket(limit.tokens_per_minute)
+
+    @staticmethod
+    def _bucket(per_minute: float | None) -> TokenBucket | None:
+        if per_minute is None:
+            return None
+        return TokenBucket(capacity=per_minute, refill_per_second=per_minute / 60.0)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve one request and `tokens` tokens. Returns the seconds to wait before sending.
+        """
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens > 0:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0, max_wait: float | None = None) -> float:
+        """
+        Block the calling thread until the request fits in the budget. Returns the time waited.
+        Raises `TimeoutError` without waiting, and gives the reservation back, when the wait
+        would exceed `max_wait` seconds.
+        """
+        wait = self._reserve_within(tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0, max_wait: float | None = None) -> float:
+        """
+        Asynchronous counterpart of `acquire`.
+        """
+        wait = self._reserve_within(tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def release(self, tokens: int = 0) -> None:
+        """
+        Give back a reservation that will not be used.
+        """
+        if self.requests is not None:
+            self.requests.refund(1)
+        if self.tokens is not None and tokens > 0:
+            self.tokens.refund(min(tokens, self.tokens.capacity))
+
+    def _reserve_within(self, tokens: int, max_wait: float | None) -> float:
+        wait = self.reserve(tokens)
+        if max_wait is not None and wait > max_wait:
+            self.release(tokens)
+            raise ex.TimeoutError(
+                f"Rate limit wait of {wait:.2f}s exceeds the {max_wait:.2f}s left before the deadline"
+            )
+        return wait
+
+    def adjust_tokens(self, reserved: int, actual: int) -> None:
+        """
+        Reconcile a reservation with the token count reported by the provider.
+        """
+        if self.tokens is not None:
+            self.tokens.refund(reserved - actual)
+
+
+_LIMITERS: dict[tuple[str, str | None, RateLimit], RateLimiter] = dict()
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model_id: str | None, limit: RateLimit) -> RateLimiter:
+    """
+    Return the process-wide limiter for a provider model and its limits.
+    """
+    key = (provider, model_id, limit)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = RateLimiter(limit)
+        return limiter
+
+
+def clear_rate_limiters() -> None:
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from llmterface.helpers import LRUCache
+
+if t.TYPE_CHECKING:
+    from llmterface.models.question import Question
+    from llmterface.providers.provider_config import ProviderConfig
+
+
+class ResponseCache(ABC):
+    """
+    Storage backend for exact-match response caching.
+    Values are the raw response text, which is validated again on every hit.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def set(self, key: str, text: str) -> None: ...
+
+    def close(self) -> None:  # noqa: B027
+        """
+        Optional standard method to release resources held by the backend.
+        """
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    In-process LRU cache.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._cache: LRUCache[str, str] = LRUCache(max_size=max_size)
+
+    def get(self, key: str) -> str | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, text: str) -> None:
+        self._cache.set(key, text)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Persistent cache stored in a SQLite database, shareable between processes.
+
+    ttl:
+        Seconds an entry stays valid. `None` keeps entries forever.
+    """
+
+    def __init__(self, path: str | Path, ttl: float | None = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        text, created = row
+        if self.ttl is not None and time.time() - created > self.ttl:
+            return None
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, created) VALUES (?, ?, ?)",
+                (key, text, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def make_cache_key(provider: str, question: Question, provider_config: ProviderConfig) -> str:
+    """
+    Key a question by everything that determines its answer: provider, resolved model,
+    system instruction, prompt, response schema and temperature.
+    """
+    config = question.config
+    payload = [
+        provider,
+        provider_config.get_model_id() or config.model.value,
+        config.system_instruction,
+        question.prompt,
+        config.get_response_schema(),
+        config.temperature,
+    ]
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from pydantic import BaseModel, ConfigDict, Field
+
+import llmterface.exceptions as ex
+from llmterface.models.generic_config import GenericConfig
+from llmterface.models.generic_model_types import GenericModelType
+
+if t.TYPE_CHECKING:
+    from llmterface.models.question import Question
+
+type Strategy = t.Literal["ordered", "weighted", "latency"]
+
+
+class Route(BaseModel):
+    """
+    One provider, and optionally model tier, the router may send a question to.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    provider: str = Field(..., description="Provider to ask.")
+    model: GenericModelType | None = Field(default=None, description="Model tier; keeps the question's when None.")
+    weight: float = Field(default=1.0, gt=0, description="Relative share of traffic with the weighted strategy.")
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}:{self.model.value}" if self.model else self.provider
+
+    def apply[T: Question](self, question: T) -> T:
+        update: dict[str, t.Any] = {"provider": self.provider}
+        if self.model is not None:
+            update["model"] = self.model
+        config = question.config or GenericConfig()
+        return question.model_copy(update={"config": config.model_copy(update=update)})
+
+
+@dataclass(frozen=True, slots=True)
+class RouteSnapshot:
+    samples: int
+    error_rate: float
+    p50: float | None
+    p99: float | None
+
+
+class RouteStats:
+    """
+    Rolling latency and error record of a route over its last `window` calls.
+    """
+
+    def __init__(self, window: int = 100):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._errors: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self._errors.append(error)
+            if not error:
+                self._latencies.append(latency)
+
+    def snapshot(self) -> RouteSnapshot:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            errors = list(self._errors)
+        return RouteSnapshot(
+            samples=len(errors),
+            error_rate=sum(errors) / len(errors) if errors else 0.0,
+            p50=_percentile(latencies, 50),
+            p99=_percentile(latencies, 99),
+        )
+
+
+class Router:
+    """
+    Spreads stateless asks over several providers and fails over between them.
+
+    A question is sent to the first route of the current order. When it fails with a
+    `ProviderError`, the next route is tried. Routes whose recent error rate exceeds
+    `max_error_rate` are moved to the back until they recover.
+
+    strategy:
+        "ordered" keeps the given order, "weighted" picks the first route at random by
+        `Route.weight`, "latency" prefers the route with the lowest rolling p50.
+    hedge_after:
+        Seconds after which a duplicate request is sent to the next route while the first
+        is still running; whichever answers first wins. `None` disables hedging.
+        Hedged requests cost a second call, so set this near the routes' p95 or p99.
+    window:
+        Number of recent calls per route the statistics are computed over.
+    min_samples:
+        Calls a route needs before its error rate or latency affects the order.
+    """
+
+    def __init__(
+        self,
+        routes: t.Sequence[Route | str],
+        strategy: Strategy = "ordered",
+        hedge_after: float | None = None,
+        max_error_rate: float = 0.5,
+        window: int = 100,
+        min_samples: int = 10,
+    ):
+        if not routes:
+            raise ValueError("A router needs at least one route.")
+        self.routes = [route if isinstance(route, Route) else Route(provider=route) for route in routes]
+        self.strategy = strategy
+        self.hedge_after = hedge_after
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._stats = {route.key: RouteStats(window) for route in self.routes}
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def stats(self) -> dict[str, RouteSnapshot]:
+        return {key: stats.snapshot() for key, stats in self._stats.items()}
+
+    def order(self) -> list[Route]:
+        """
+        Routes in the order the next question tries them.
+        """
+        snapshots = self.stats()
+        routes = list(self.routes)
+        if self.strategy == "weighted":
+            # weighted shuffle: sort by u ** (1 / weight)
+            routes.sort(key=lambda route: random.random() ** (1 / route.weight), reverse=True)
+        elif self.strategy == "latency":
+            routes.sort(key=lambda route: self._latency_key(snapshots[route.key]))
+        return sorted(routes, key=lambda route: self._is_unhealthy(snapshots[route.key]))
+
+    def ask[T](self, ask: t.Callable[[Question], T], question: Question) -> T:
+        """
+        Answer `question` with `ask`, applying each route to the question in turn.
+        """
+        routes = self.order()
+        if self.hedge_after is None:
+            last_error: Exception | None = None
+            for route in routes:
+                try:
+                    return self._call(ask, question, route)
+                except Exception as e:
+                    if not self._fails_over(e):
+                        raise
+                    last_error = e
+            raise last_error
+
+        pending: dict[Future[T], Route] = dict()
+        remaining = iter(routes)
+        last_error = None
+
+        def launch() -> bool:
+            route = next(remaining, None)
+            if route is not None:
+                # run in a copy of this context so deadlines carry into the worker thread
+                context = contextvars.copy_context()
+                pending[self._get_executor().submit(context.run, self._call, ask, question, route)] = route
+            return route is not None
+
+        launch()
+        hedged = False
+        while pending:
+            done, _ = wait(pending, timeout=None if hedged else self.hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                launch()
+                continue
+            for future in done:
+                del pending[future]
+                try:
+                    return future.result()
+                except Exception as e:
+                    if not self._fails_over(e):
+                        raise
+                    last_error = e
+            if not pending:
+                launch()
+        raise last_error
+
+    async def aask[T](self, ask: t.Callable[[Question], t.Awaitable[T]], question: Question) -> T:
+        """
+        Asynchronous counterpart of `ask`. A hedged request that loses the race is cancelled.
+        """
+        pending: dict[asyncio.Task[T], Route] = dict()
+        remaining = iter(self.order())
+        last_error: Exception | None = None
+
+        def launch() -> bool:
+            route = next(remaining, None)
+            if route is not None:
+                pending[asyncio.ensure_future(self._acall(ask, question, route))] = route
+            return route is not None
+
+        launch()
+        hedged = self.hedge_after is None
+        try:
+            while pending:
+                timeout = None if hedged else self.hedge_after
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+                for task in done:
+                    del pending[task]
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        if not self._fails_over(e):
+                            raise
+                        last_error = e
+                if not pending:
+                    launch()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _call[T](self, ask: t.Callable[[Question], T], question: Question, route: Route) -> T:
+        started = time.perf_counter()
+        try:
+            result = ask(route.apply(question))
+        except Exception as e:
+            self._stats[route.key].record(time.perf_counter() - started, error=self._fails_over(e))
+            raise
+        self._stats[route.key].record(time.perf_counter() - started, error=False)
+        return result
+
+    async def _acall[T](self, ask: t.Callable[[Question], t.Awaitable[T]], question: Question, route: Route) -> T:
+        started = time.perf_counter()
+        try:
+            result = await ask(route.apply(question))
+        except Exception as e:
+            self._stats[route.key].record(time.perf_counter() - started, error=self._fails_over(e))
+            raise
+        self._stats[route.key].record(time.perf_counter() - started, error=False)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix="llmterface-router")
+        return self._executor
+
+    @staticmethod
+    def _fails_over(e: BaseException) -> bool:
+        """
+        Provider failures move on to the next route; other errors, such as schema errors, do not.
+        """
+        while e is not None:
+            if isinstance(e, ex.ProviderError):
+                return True
+            e = e.__cause__
+        return False
+
+    def _is_unhealthy(self, snapshot: RouteSnapshot) -> bool:
+        return snapshot.samples >= self.min_samples and snapshot.error_rate > self.max_error_rate
+
+    def _latency_key(self, snapshot: RouteSnapshot) -> float:
+        # routes without enough data are tried first so that they get measured
+        if snapshot.samples < self.min_samples or snapshot.p50 is None:
+            return 0.0
+        return snapshot.p50
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
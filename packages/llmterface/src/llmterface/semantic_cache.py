@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "The semantic cache requires the 'numpy' package. Install it with `pip install llmterface[embeddings]`."
+    ) from e
+
+if t.TYPE_CHECKING:
+    from llmterface.models.question import Question
+    from llmterface.providers.provider_config import ProviderConfig
+
+type IndexKind = t.Literal["flat", "hnsw"]
+
+
+@dataclass(slots=True)
+class SemanticCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def make_scope_key(provider: str, question: Question, provider_config: ProviderConfig) -> str:
+    """
+    Key everything that determines an answer except the prompt: provider, resolved and embedding
+    models, system instruction, response schema and temperature. Only prompts within one scope
+    are compared.
+    """
+    config = question.config
+    payload = [
+        provider,
+        provider_config.get_model_id() or config.model.value,
+        provider_config.get_embedding_model_id(),
+        config.system_instruction,
+        config.get_response_schema(),
+        config.temperature,
+    ]
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SemanticCache:
+    """
+    Response cache that also answers paraphrases of earlier questions.
+
+    Prompt embeddings are kept as unit vectors in one float32 matrix. A lookup is a
+    cosine-similarity search among the entries of the same scope; the closest entry
+    is a hit when its similarity is at least `threshold`. Values are the raw response
+    text, which is validated again on every hit.
+
+    threshold:
+        Minimum cosine similarity for a hit. Higher values trade hits for precision.
+    max_size:
+        Maximum number of entries. When full, the least recently used entry is replaced.
+    index:
+        "flat" scans the matrix with one matrix-vector product, exact and fast up to
+        tens of thousands of entries. "hnsw" uses an approximate `hnswlib` graph index
+        for larger caches and requires the optional `hnswlib` package.
+    path:
+        Optional file the cache is loaded from when it exists and saved to on `close()`.
+
+    All entries must share one embedding dimension.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_size: int = 10_000,
+        index: IndexKind = "flat",
+        path: str | Path | None = None,
+        hnsw_m: int = 16,
+        hnsw_ef: int = 64,
+    ):
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be a cosine similarity between -1 and 1")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if index == "hnsw":
+            try:
+                import hnswlib  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "The 'hnsw' index requires the 'hnswlib' package. Install it with `pip install llmterface[hnsw]`."
+                ) from e
+        self.threshold = threshold
+        self.max_size = max_size
+        self.index = index
+        self.path = Path(path) if path is not None else None
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef = hnsw_ef
+        self.stats = SemanticCacheStats()
+        self._size = 0
+        self._tick = 0
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._scopes = np.empty(0, dtype=np.int64)
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._texts: list[str] = []
+        self._scope_ids: dict[str, int] = dict()
+        self._hnsw: t.Any = None
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self.load(self.path)
+
+    @property
+    def dim(self) -> int | None:
+        return self._vectors.shape[1] if self._vectors.shape[1] else None
+
+    def get(self, scope: str, vector: t.Sequence[float] | np.ndarray) -> str | None:
+        """
+        Return the response text of the most similar prompt in `scope`, or None below the threshold.
+        """
+        query = _normalize(vector)
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            best = self._search(scope_id, query) if scope_id is not None and self._size else None
+            if best is None or best[1] < self.threshold:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._tick += 1
+            self._last_used[best[0]] = self._tick
+            return self._texts[best[0]]
+
+    def set(self, scope: str, vector: t.Sequence[float] | np.ndarray, text: str) -> None:
+        vector = _normalize(vector)
+        with self._lock:
+            if self.dim is not None and vector.shape[0] != self.dim:
+                raise ValueError(f"Embedding has {vector.shape[0]} dimensions, the cache holds {self.dim}")
+            scope_id = self._scope_ids.setdefault(scope, len(self._scope_ids))
+            if self._size < self.max_size:
+                slot = self._size
+                self._reserve(slot + 1, vector.shape[0])
+                self._texts.append(text)
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used[: self._size]))
+                self._texts[slot] = text
+                self.stats.evictions += 1
+            self._tick += 1
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope_id
+            self._last_used[slot] = self._tick
+            if self._hnsw is not None:
+                self._hnsw.add_items(vector[None, :], np.array([slot]))
+
+    def save(self, path: str | Path | None = None) -> None:
+        """
+        Write the cache to `path`, or to the path it was created with.
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the semantic cache to")
+        with self._lock:
+            scope_names = sorted(self._scope_ids, key=self._scope_ids.__getitem__)
+            arrays = {
+                "vectors": self._vectors[: self._size].copy(),
+                "scopes": self._scopes[: self._size].copy(),
+                "last_used": self._last_used[: self._size].copy(),
+                "texts": np.array(self._texts, dtype=np.str_),
+                "scope_names": np.array(scope_names, dtype=np.str_),
+            }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    def load(self, path: str | Path) -> None:
+        """
+        Replace the cache's entries with those saved at `path`. Entries beyond `max_size`
+        are dropped, least recently used first.
+        """
+        with np.load(Path(path), allow_pickle=False) as data:
+            vectors = data["vectors"].astype(np.float32)
+            scopes = data["scopes"]
+            last_used = data["last_used"]
+            texts = data["texts"].tolist()
+            scope_names = data["scope_names"].tolist()
+        keep = np.sort(np.argsort(last_used, kind="stable")[-self.max_size :]) if len(texts) else np.empty(0, int)
+        with self._lock:
+            self._size = 0
+            self._texts = []
+            self._scope_ids = {name: i for i, name in enumerate(scope_names)}
+            self._vectors = np.empty((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            self._hnsw = None
+            if len(keep):
+                self._reserve(len(keep), vectors.shape[1])
+                self._vectors[: len(keep)] = vectors[keep]
+                self._scopes[: len(keep)] = scopes[keep]
+                self._last_used[: len(keep)] = last_used[keep]
+                self._texts = [texts[i] for i in keep]
+                self._size = len(keep)
+                self._tick = int(last_used.max())
+                if self._hnsw is not None:
+                    self._hnsw.add_items(self._vectors[: self._size], np.arange(self._size))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._texts = []
+            self._scope_ids.clear()
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            self._scopes = np.empty(0, dtype=np.int64)
+            self._last_used = np.empty(0, dtype=np.int64)
+            self._hnsw = None
+
+    def close(self) -> None:
+        if self.path is not None:
+            self.save()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _search(self, scope_id: int, query: np.ndarray) -> tuple[int, float] | None:
+        if query.shape[0] != self.dim:
+            return None
+        if self._hnsw is not None:
+            scopes = self._scopes
+            try:
+                labels, distances = self._hnsw.knn_query(query, k=1, filter=lambda label: scopes[label] == scope_id)
+            except RuntimeError:  # fewer matching elements than k
+                return None
+            return int(labels[0][0]), 1.0 - float(distances[0][0])
+        sims = self._vectors[: self._size] @ query
+        sims[self._scopes[: self._size] != scope_id] = -np.inf
+        best = int(np.argmax(sims))
+        if sims[best] == -np.inf:
+            return None
+        return best, float(sims[best])
+
+    def _reserve(self, size: int, dim: int) -> None:
+        """
+        Grow the arrays, doubling their capacity, so that `size` entries fit.
+        """
+        capacity = self._vectors.shape[0]
+        if size <= capacity and self._vectors.shape[1] == dim:
+            return
+        new_capacity = min(self.max_size, max(size, 2 * capacity, 16))
+        vectors = np.zeros((new_capacity, dim), dtype=np.float32)
+        if self._size:
+            vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+        self._scopes = np.resize(self._scopes, new_capacity)
+        self._last_used = np.resize(self._last_used, new_capacity)
+        if self.index == "hnsw" and self._hnsw is None:
+            import hnswlib
+
+            self._hnsw = hnswlib.Index(space="ip", dim=dim)
+            self._hnsw.init_index(max_elements=self.max_size, M=self.hnsw_m, ef_construction=max(self.hnsw_ef, 100))
+            self._hnsw.set_ef(self.hnsw_ef)
+
+
+def _normalize(vector: t.Sequence[float] | np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
@@ -0,0 +1,12 @@
+import math
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str | None, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """
+    Cheap local token estimate based on character count.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / chars_per_token)
@@ -1,5 +1,6 @@
 from llmterface_gemini.chat import GeminiChat
 from llmterface_gemini.config import AllowedGeminiModels, GeminiConfig
+from llmterface_gemini.context_cache import ContextCacheManager, get_context_cache_manager
 from llmterface_gemini.models import (
     GeminiAudioModelType,
     GeminiEmbeddingModelType,
@@ -12,6 +13,8 @@ __all__ = [
     "GeminiConfig",
     "AllowedGeminiModels",
     "GeminiChat",
+    "ContextCacheManager",
+    "get_context_cache_manager",
     "GeminiTextModelType",
     "GeminiAudioModelType",
     "GeminiEmbeddingModelType",
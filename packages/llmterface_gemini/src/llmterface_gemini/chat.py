@@ -1,39 +1,420 @@
+import asyncio
+import concurrent.futures
+import functools
+import json
+import tempfile
+import time
 import typing as t
+from contextlib import contextmanager
 
+from google.genai.chats import AsyncChat as GenaiAsyncChat
 from google.genai.chats import Chat as GenaiChat
 from google.genai.client import Client as GenaiClient
-from google.genai.types import GenerateContentResponse
-from llmterface.models.generic_response import GenericResponse
+from google.genai.types import (
+    Content,
+    CountTokensConfig,
+    CreateBatchJobConfig,
+    EmbedContentConfig,
+    GenerateContentConfig,
+    GenerateContentResponse,
+    JobState,
+    Part,
+    UploadFileConfig,
+)
+from llmterface.deadline import remaining_time
+from llmterface.models.chat_history import ChatTurn
+from llmterface.models.generic_response import GenericResponse, ResponseMetadata
 from llmterface.models.question import Question
-from llmterface.providers.provider_chat import ProviderChat
+from llmterface.providers.client_pool import ClientPool, get_client_pool
+from llmterface.providers.provider_chat import BatchState, ProviderChat
 from pydantic import PrivateAttr
 
 from llmterface_gemini.config import (
     GeminiConfig,
+    deadline_http_options,
 )
+from llmterface_gemini.context_cache import GenaiContextCacheBackend, get_context_cache_manager
 
 
 def convert_response_to_generic(
     response: GenerateContentResponse,
+    total_time: float | None = None,
+    time_to_first_byte: float | None = None,
 ) -> GenericResponse[GenerateContentResponse]:
     return GenericResponse(
         original=response,
         text=response.text or "",
+        metadata=extract_metadata(response, total_time=total_time, time_to_first_byte=time_to_first_byte),
     )
 
 
+def extract_metadata(
+    response: GenerateContentResponse,
+    total_time: float | None = None,
+    time_to_first_byte: float | None = None,
+) -> ResponseMetadata:
+    """
+    Map the SDK's usage metadata and timings onto the standard metadata keys.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    candidates = getattr(response, "candidates", None) or []
+    finish_reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    values = {
+        "prompt_tokens": getattr(usage, "prompt_token_count", None),
+        "output_tokens": getattr(usage, "candidates_token_count", None),
+        "cached_tokens": getattr(usage, "cached_content_token_count", None),
+        "model_id": getattr(response, "model_version", None),
+        "finish_reason": getattr(finish_reason, "value", finish_reason),
+        "time_to_first_byte": time_to_first_byte,
+        "total_time": total_time,
+    }
+    return ResponseMetadata(**{k: v for k, v in values.items() if v is not None})
+
+
+_BATCH_STATES: dict[JobState, BatchState] = {
+    JobState.JOB_STATE_RUNNING: BatchState.running,
+    JobState.JOB_STATE_UPDATING: BatchState.running,
+    JobState.JOB_STATE_CANCELLING: BatchState.running,
+    JobState.JOB_STATE_SUCCEEDED: BatchState.succeeded,
+    JobState.JOB_STATE_PARTIALLY_SUCCEEDED: BatchState.succeeded,
+    JobState.JOB_STATE_FAILED: BatchState.failed,
+    JobState.JOB_STATE_EXPIRED: BatchState.failed,
+    JobState.JOB_STATE_CANCELLED: BatchState.cancelled,
+}
+
+
+def build_batch_request(question: Question, provider_config: GeminiConfig) -> dict[str, t.Any]:
+    """
+    Build the REST `GenerateContentRequest` for one line of a batch input file.
+    """
+    request: dict[str, t.Any] = {"contents": [{"role": "user", "parts": [{"text": question.prompt}]}]}
+    if provider_config.gen_content_config is None:
+        return request
+    generation_config = provider_config.gen_content_config.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if (system_instruction := generation_config.pop("systemInstruction", None)) is not None:
+        if isinstance(system_instruction, str):
+            system_instruction = {"parts": [{"text": system_instruction}]}
+        request["systemInstruction"] = system_instruction
+    if generation_config:
+        request["generationConfig"] = generation_config
+    return request
+
+
+@contextmanager
+def _forget_cached_content_on_error(gen_content_config: GenerateContentConfig | None) -> t.Generator[None]:
+    """
+    Drop a cached-content handle the request failed with, so the next request recreates it
+    instead of reusing a handle the provider may have expired.
+    """
+    try:
+        yield
+    except Exception:
+        if gen_content_config is not None and gen_content_config.cached_content:
+            get_context_cache_manager().invalidate(gen_content_config.cached_content)
+        raise
+
+
+def _apply_deadline(gen_content_config: GenerateContentConfig | None) -> GenerateContentConfig | None:
+    """
+    Bound the request's HTTP timeout by the time left before the current deadline.
+    """
+    if remaining_time() is None:
+        return gen_content_config
+    if gen_content_config is None:
+        return GenerateContentConfig(http_options=deadline_http_options())
+    return gen_content_config.model_copy(
+        update={"http_options": deadline_http_options(gen_content_config.http_options)}
+    )
+
+
+_CLOSING: set[asyncio.Task[None] | concurrent.futures.Future[None]] = set()
+
+
+def close_client(client: GenaiClient) -> None:
+    """
+    Close a pooled client's sync transport. Its async transport is never used: async
+    calls go through clients leased per event loop and closed by `close_async_client`.
+    """
+    client.close()
+
+
+def close_async_client(client: GenaiClient, loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Close the async transport of a client leased for `loop`, on that loop, since its
+    connections belong to it. Nothing is left to close once the loop itself is closed.
+    """
+    if loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        closing = loop.create_task(client.aio.aclose())
+    elif loop.is_running():
+        closing = asyncio.run_coroutine_threadsafe(client.aio.aclose(), loop)
+    else:
+        loop.run_until_complete(client.aio.aclose())
+        return
+    # the event loop only holds weak references to its tasks
+    _CLOSING.add(closing)
+    closing.add_done_callback(_CLOSING.discard)
+
+
+def _to_contents(turns: t.Iterable[ChatTurn]) -> list[Content]:
+    return [Content(role=turn.role, parts=[Part(text=turn.text)]) for turn in turns]
+
+
 class GeminiChat(ProviderChat):
     PROVIDER: t.ClassVar[str] = GeminiConfig.PROVIDER
     _client: GenaiClient | None = PrivateAttr(default=None)
     _sdk_chat: GenaiChat | None = PrivateAttr(default=None)
+    _async_sdk_chat: GenaiAsyncChat | None = PrivateAttr(default=None)
+    _pool_key: tuple[str, str] | None = PrivateAttr(default=None)
+    _async_client: GenaiClient | None = PrivateAttr(default=None)
+    _async_pool_key: tuple[str, str, asyncio.AbstractEventLoop] | None = PrivateAttr(default=None)
+    _history: list[Content] | None = PrivateAttr(default=None)
+    _batch_sizes: dict[str, int] = PrivateAttr(default_factory=dict)
 
     def ask(self, question: Question, provider_config: GeminiConfig | None = None) -> GenericResponse:
+        provider_config = self._require_config(provider_config)
+        sdk_chat = self._get_sdk_chat(provider_config)
+        gen_content_config = _apply_deadline(self._get_gen_content_config(provider_config))
+        started = time.perf_counter()
+        with _forget_cached_content_on_error(gen_content_config):
+            res = sdk_chat.send_message(question.prompt, config=gen_content_config)
+        return convert_response_to_generic(res, total_time=time.perf_counter() - started)
+
+    async def aask(self, question: Question, provider_config: GeminiConfig | None = None) -> GenericResponse:
+        """
+        Ask through the SDK's native async client, continuing the same conversation as `ask`.
+        """
+        provider_config = self._require_config(provider_config)
+        async_sdk_chat = self._get_async_sdk_chat(provider_config)
+        gen_content_config = provider_config.gen_content_config
+        if provider_config.cache_system_instruction:
+            gen_content_config = await asyncio.to_thread(self._get_gen_content_config, provider_config)
+        gen_content_config = _apply_deadline(gen_content_config)
+        started = time.perf_counter()
+        with _forget_cached_content_on_error(gen_content_config):
+            res = await async_sdk_chat.send_message(question.prompt, config=gen_content_config)
+        return convert_response_to_generic(res, total_time=time.perf_counter() - started)
+
+    def stream(self, question: Question, provider_config: GeminiConfig | None = None) -> t.Iterator[GenericResponse]:
+        provider_config = self._require_config(provider_config)
+        sdk_chat = self._get_sdk_chat(provider_config)
+        gen_content_config = _apply_deadline(self._get_gen_content_config(provider_config))
+        started = time.perf_counter()
+        first_byte = None
+        with _forget_cached_content_on_error(gen_content_config):
+            for res in sdk_chat.send_message_stream(question.prompt, config=gen_content_config):
+                elapsed = time.perf_counter() - started
+                if first_byte is None:
+                    first_byte = elapsed
+                yield convert_response_to_generic(res, total_time=elapsed, time_to_first_byte=first_byte)
+
+    def count_tokens_remote(
+        self, question: Question, provider_config: GeminiConfig | None = None, history: t.Sequence[ChatTurn] = ()
+    ) -> int:
+        """
+        Exact count from the Gemini `count_tokens` endpoint, including the system instruction and history.
+        """
+        provider_config = self._require_config(provider_config)
+        turns = list(history)
+        if question.config.system_instruction:
+            turns.insert(0, ChatTurn(role="user", text=question.config.system_instruction))
+        turns.append(ChatTurn(role="user", text=question.prompt))
+        res = self._get_client(provider_config).models.count_tokens(
+            model=provider_config.model.value,
+            contents=_to_contents(turns),
+            config=CountTokensConfig(http_options=deadline_http_options()),
+        )
+        return res.total_tokens or 0
+
+    def embed(self, texts: t.Sequence[str], provider_config: GeminiConfig | None = None) -> list[list[float]]:
+        provider_config = self._require_config(provider_config)
+        res = self._get_client(provider_config).models.embed_content(
+            model=provider_config.embedding_model.value,
+            contents=list(texts),
+            config=EmbedContentConfig(http_options=deadline_http_options()),
+        )
+        return [embedding.values for embedding in res.embeddings]
+
+    async def aembed(self, texts: t.Sequence[str], provider_config: GeminiConfig | None = None) -> list[list[float]]:
+        provider_config = self._require_config(provider_config)
+        res = await self._get_async_client(provider_config).aio.models.embed_content(
+            model=provider_config.embedding_model.value,
+            contents=list(texts),
+            config=EmbedContentConfig(http_options=deadline_http_options()),
+        )
+        return [embedding.values for embedding in res.embeddings]
+
+    def _require_config(self, provider_config: GeminiConfig | None) -> GeminiConfig:
         provider_config = provider_config or self.config
         if provider_config is None:
             raise ValueError("GeminiConfig must be provided to ask a question.")
+        return provider_config
+
+    def submit_batch(self, requests: t.Sequence[tuple[Question, GeminiConfig]]) -> str:
+        """
+        Upload the questions as a JSONL batch input file and start a batch job for it.
+        All requests must target the same model.
+        """
+        if not requests:
+            raise ValueError("A batch job needs at least one question.")
+        models = {self._require_config(provider_config).model.value for _, provider_config in requests}
+        if len(models) != 1:
+            raise ValueError(f"All questions of a Gemini batch job must use the same model, got: {sorted(models)}")
+        client = self._get_client(self._require_config(requests[0][1]))
+        with tempfile.TemporaryFile(suffix=".jsonl") as f:
+            for i, (question, provider_config) in enumerate(requests):
+                line = {"key": str(i), "request": build_batch_request(question, provider_config)}
+                f.write(json.dumps(line).encode() + b"\n")
+            f.seek(0)
+            uploaded = client.files.upload(
+                file=f, config=UploadFileConfig(mime_type="jsonl", display_name=f"llmterface-{self.id}")
+            )
+        job = client.batches.create(
+            model=models.pop(), src=uploaded.name, config=CreateBatchJobConfig(display_name=f"llmterface-{self.id}")
+        )
+        self._batch_sizes[job.name] = len(requests)
+        return job.name
+
+    def get_batch_state(self, job_id: str) -> BatchState:
+        job = self._require_client().batches.get(name=job_id)
+        return _BATCH_STATES.get(job.state, BatchState.pending)
+
+    def get_batch_results(self, job_id: str) -> t.Iterator[GenericResponse | Exception]:
+        """
+        Download the job's JSONL output and yield the responses in submission order.
+        """
+        client = self._require_client()
+        job = client.batches.get(name=job_id)
+        if job.dest is None or not job.dest.file_name:
+            raise ValueError(f"Batch job {job_id} has no output file.")
+        results: dict[int, GenericResponse | Exception] = dict()
+        for line in client.files.download(file=job.dest.file_name).splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if "error" in item:
+                results[int(item["key"])] = RuntimeError(f"Batch item failed: {item['error']}")
+            else:
+                res = GenerateContentResponse.model_validate(item["response"])
+                results[int(item["key"])] = convert_response_to_generic(res)
+        for i in range(self._batch_sizes.get(job_id, max(results, default=-1) + 1)):
+            yield results.get(i) or RuntimeError(f"Batch job {job_id} returned no result for item {i}")
+
+    def cancel_batch(self, job_id: str) -> None:
+        self._require_client().batches.cancel(name=job_id)
+
+    def _require_client(self) -> GenaiClient:
+        if self._client is None:
+            raise ValueError("No Gemini client; submit a batch job with this chat first.")
+        return self._client
+
+    def _get_gen_content_config(self, provider_config: GeminiConfig) -> GenerateContentConfig | None:
+        """
+        Swap a large system instruction for its cached-content handle when the config asks for it.
+        Falls back to the inline instruction when the content cannot be cached.
+        """
+        gen_content_config = provider_config.gen_content_config
+        if not provider_config.cache_system_instruction or gen_content_config is None:
+            return gen_content_config
+        if not isinstance(system_instruction := gen_content_config.system_instruction, str):
+            return gen_content_config
+        client = self._get_client(provider_config)
+        name = get_context_cache_manager().get(
+            GenaiContextCacheBackend(client), self._pool_key, provider_config.model.value, system_instruction
+        )
+        if name is None:
+            return gen_content_config
+        return gen_content_config.model_copy(update={"system_instruction": None, "cached_content": name})
+
+    def _get_sdk_chat(self, provider_config: GeminiConfig) -> GenaiChat:
         if not self._sdk_chat:
-            if self._client is None:
-                self._client = GenaiClient(api_key=provider_config.api_key)
-            self._sdk_chat = self._client.chats.create(model=provider_config.model.value)
-        res = self._sdk_chat.send_message(question.prompt, config=provider_config.gen_content_config)
-        return convert_response_to_generic(res)
+            history = self._current_history()
+            self._sdk_chat = self._get_client(provider_config).chats.create(
+                model=provider_config.model.value, history=history
+            )
+            self._async_sdk_chat = None
+        return self._sdk_chat
+
+    def _get_async_sdk_chat(self, provider_config: GeminiConfig) -> GenaiAsyncChat:
+        client = self._get_async_client(provider_config)
+        if not self._async_sdk_chat:
+            history = self._current_history()
+            self._async_sdk_chat = client.aio.chats.create(model=provider_config.model.value, history=history)
+            self._sdk_chat = None
+        return self._async_sdk_chat
+
+    def _current_history(self) -> list[Content] | None:
+        """
+        The conversation so far. Only one of the sync and async SDK chats is kept at a time,
+        and switching rebuilds the other one from this history, so `ask`, `aask` and `stream`
+        all continue the same conversation.
+        """
+        sdk_chat = self._sdk_chat or self._async_sdk_chat
+        if sdk_chat is not None:
+            self._history = list(sdk_chat.get_history())
+        return self._history
+
+    def _get_client(self, provider_config: GeminiConfig) -> GenaiClient:
+        """
+        Lease a client from the process-wide pool so that chats sharing an API key
+        reuse the same HTTP connections.
+        """
+        if self._client is None:
+            api_key = provider_config.api_key
+            self._pool_key = ClientPool.make_key(self.PROVIDER, api_key)
+            self._client = get_client_pool().acquire(
+                self._pool_key, lambda: GenaiClient(api_key=api_key), closer=close_client
+            )
+        return self._client
+
+    def _get_async_client(self, provider_config: GeminiConfig) -> GenaiClient:
+        """
+        Lease a client for the running event loop. The SDK's async transport is bound to
+        the loop it first ran on, so async clients are pooled per loop, never shared.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_pool_key is None or self._async_pool_key[-1] is not loop:
+            if self._async_sdk_chat is not None:
+                # keep the conversation, but not the SDK chat bound to the previous loop
+                self._current_history()
+                self._async_sdk_chat = None
+            self._release_async_client()
+            api_key = provider_config.api_key
+            self._async_pool_key = (*ClientPool.make_key(self.PROVIDER, api_key), loop)
+            self._async_client = get_client_pool().acquire(
+                self._async_pool_key,
+                lambda: GenaiClient(api_key=api_key),
+                closer=functools.partial(close_async_client, loop=loop),
+            )
+        return self._async_client
+
+    def _release_async_client(self) -> None:
+        if self._async_pool_key is not None:
+            get_client_pool().release(self._async_pool_key)
+        self._async_client = None
+        self._async_pool_key = None
+
+    def load_history(self, turns: t.Sequence[ChatTurn]) -> None:
+        """
+        Start the SDK chats from the given turns the next time they are created.
+        """
+        self._history = _to_contents(turns)
+        self._sdk_chat = None
+        self._async_sdk_chat = None
+
+    def close(self) -> None:
+        """
+        Drop the SDK chats and return the clients to the pool.
+        """
+        self._sdk_chat = None
+        self._async_sdk_chat = None
+        self._release_async_client()
+        if self._pool_key is not None:
+            get_client_pool().release(self._pool_key)
+        self._client = None
+        self._pool_key = None
@@ -1,10 +1,12 @@
 import typing as t
 
 import llmterface as llm
-from google.genai.types import GenerateContentConfig
+from google.genai.types import GenerateContentConfig, HttpOptions
+from llmterface.deadline import remaining_time
+from llmterface.tokens import estimate_tokens
 from pydantic import Field, field_validator
 
-from llmterface_gemini.models import GeminiTextModelType
+from llmterface_gemini.models import GeminiEmbeddingModelType, GeminiTextModelType
 
 AllowedGeminiModels = GeminiTextModelType
 
@@ -16,13 +18,29 @@ class GeminiConfig(llm.ProviderConfig):
         llm.GenericModelType.text_heavy: GeminiTextModelType.CHAT_2_5_PRO,
     }
     DEFAULT_MODEL: t.ClassVar[AllowedGeminiModels] = GeminiTextModelType.CHAT_2_0_FLASH
+    DEFAULT_EMBEDDING_MODEL: t.ClassVar[GeminiEmbeddingModelType] = GeminiEmbeddingModelType.GEMINI_EMBEDDING_001
     PROVIDER: t.ClassVar[str] = "gemini"
+    # Gemini documents roughly four characters per token
+    CHARS_PER_TOKEN: t.ClassVar[float] = 4.0
+    # system instructions at least this large are sent as Gemini cached content
+    CONTEXT_CACHE_MIN_TOKENS: t.ClassVar[int] = 4096
     api_key: str = Field(..., description="API key for authenticating with the Gemini service.")
     model: GeminiTextModelType = Field(default=DEFAULT_MODEL, description="Gemini model to use for requests.")
+    embedding_model: GeminiEmbeddingModelType = Field(
+        default=DEFAULT_EMBEDDING_MODEL,
+        description="Gemini model used for embeddings.",
+    )
     gen_content_config: GenerateContentConfig | None = Field(
         None,
         description="pre-configured GenerateContentConfig to use for requests.",
     )
+    cache_system_instruction: bool = Field(
+        default=False,
+        description=(
+            "Send the system instruction as provider-side cached content instead of inline. "
+            "Enabled automatically for instructions of at least `CONTEXT_CACHE_MIN_TOKENS` tokens."
+        ),
+    )
 
     @classmethod
     def from_generic_config(
@@ -40,8 +58,17 @@ class GeminiConfig(llm.ProviderConfig):
             api_key=config.api_key,
             model=config.model,
             gen_content_config=gen_content_config,
+            cache_system_instruction=(
+                estimate_tokens(config.system_instruction, cls.CHARS_PER_TOKEN) >= cls.CONTEXT_CACHE_MIN_TOKENS
+            ),
         )
 
+    def get_model_id(self) -> str | None:
+        return self.model.value if self.model else None
+
+    def get_embedding_model_id(self) -> str | None:
+        return self.embedding_model.value
+
     @field_validator("model", mode="before")
     @classmethod
     def validate_model(cls, v: AllowedGeminiModels | llm.GenericModelType | str | None) -> GeminiTextModelType | None:
@@ -57,3 +84,18 @@ class GeminiConfig(llm.ProviderConfig):
             return AllowedGeminiModels(v)
         except ValueError as e:
             raise ValueError(f"Invalid Gemini model type: {v}") from e
+
+
+def deadline_http_options(http_options: HttpOptions | None = None) -> HttpOptions | None:
+    """
+    Bound the HTTP timeout of `http_options` by the time left before the current deadline.
+    Returns `http_options` unchanged when no deadline applies.
+    """
+    if (left := remaining_time()) is None:
+        return http_options
+    timeout = max(1, int(left * 1000))
+    if http_options is None:
+        return HttpOptions(timeout=timeout)
+    if http_options.timeout is not None:
+        timeout = min(timeout, http_options.timeout)
+    return http_options.model_copy(update={"timeout": timeout})
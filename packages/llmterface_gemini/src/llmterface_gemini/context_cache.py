@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import threading
+import time
+import typing as t
+from dataclasses import dataclass, field
+
+from google.genai.client import Client as GenaiClient
+from google.genai.types import CreateCachedContentConfig, DeleteCachedContentConfig, UpdateCachedContentConfig
+
+from llmterface_gemini.config import deadline_http_options
+
+logger = logging.getLogger("llmterface")
+
+
+class ContextCacheBackend(t.Protocol):
+    """
+    Where cached contents live. `GenaiContextCacheBackend` talks to the Gemini API,
+    `LocalContextCacheBackend` keeps handles in memory for tests.
+    """
+
+    def create(self, model: str, system_instruction: str, ttl: float) -> str: ...
+
+    def refresh(self, name: str, ttl: float) -> None: ...
+
+    def delete(self, name: str) -> None: ...
+
+
+class GenaiContextCacheBackend:
+    """
+    Cache API calls are bounded by the current deadline, like the requests they serve.
+    """
+
+    def __init__(self, client: GenaiClient):
+        self.client = client
+
+    def create(self, model: str, system_instruction: str, ttl: float) -> str:
+        cached = self.client.caches.create(
+            model=model,
+            config=CreateCachedContentConfig(
+                system_instruction=system_instruction, ttl=f"{ttl:.0f}s", http_options=deadline_http_options()
+            ),
+        )
+        return cached.name
+
+    def refresh(self, name: str, ttl: float) -> None:
+        self.client.caches.update(
+            name=name, config=UpdateCachedContentConfig(ttl=f"{ttl:.0f}s", http_options=deadline_http_options())
+        )
+
+    def delete(self, name: str) -> None:
+        self.client.caches.delete(name=name, config=DeleteCachedContentConfig(http_options=deadline_http_options()))
+
+
+class LocalContextCacheBackend:
+    """
+    In-memory stand-in for the Gemini cache API that records every call.
+    """
+
+    def __init__(self):
+        self.contents: dict[str, tuple[str, str]] = dict()
+        self.calls: list[tuple[str, str]] = list()
+        self._ids = itertools.count()
+
+    def create(self, model: str, system_instruction: str, ttl: float) -> str:
+        name = f"cachedContents/local-{next(self._ids)}"
+        self.contents[name] = (model, system_instruction)
+        self.calls.append(("create", name))
+        return name
+
+    def refresh(self, name: str, ttl: float) -> None:
+        if name not in self.contents:
+            raise KeyError(name)
+        self.calls.append(("refresh", name))
+
+    def delete(self, name: str) -> None:
+        self.contents.pop(name, None)
+        self.calls.append(("delete", name))
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    name: str | None
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    """
+    Lock serializing creation and refresh of one handle, dropped once nobody holds or waits for it.
+    """
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    users: int = 0
+
+
+class ContextCacheManager:
+    """
+    Creates and reuses Gemini cached contents for large system instructions.
+
+    Handles are keyed by credentials, model and a hash of the instruction, so every
+    request sharing an instruction reuses one cached prefix. A handle is created on
+    first use, its TTL is extended once less than `refresh_margin` seconds remain,
+    and it is recreated after it expires. When the provider refuses to cache an
+    instruction, for instance because it is below the model's minimum size, the
+    refusal is remembered for one `ttl` and requests fall back to sending it inline.
+
+    ttl:
+        Lifetime in seconds requested for each cached content.
+    refresh_margin:
+        Remaining lifetime in seconds below which a handle's TTL is extended.
+    """
+
+    def __init__(self, ttl: float = 3600.0, refresh_margin: float = 300.0):
+        if refresh_margin >= ttl:
+            raise ValueError("refresh_margin must be shorter than ttl")
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._entries: dict[tuple[t.Hashable, str, str], _CacheEntry] = dict()
+        self._key_locks: dict[tuple[t.Hashable, str, str], _KeyLock] = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(credentials_key: t.Hashable, model: str, system_instruction: str) -> tuple[t.Hashable, str, str]:
+        return credentials_key, model, hashlib.sha256(system_instruction.encode()).hexdigest()
+
+    def get(
+        self,
+        backend: ContextCacheBackend,
+        credentials_key: t.Hashable,
+        model: str,
+        system_instruction: str,
+    ) -> str | None:
+        """
+        Return the cached-content name for the instruction, creating or refreshing it as needed.
+        Returns None when the instruction cannot be cached.
+        """
+        key = self.make_key(credentials_key, model, system_instruction)
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._is_fresh(entry, time.monotonic()):
+                return entry.name
+            key_lock = self._key_locks.setdefault(key, _KeyLock())
+            key_lock.users += 1
+        # network calls happen under the key's own lock only, so other instructions are not held up
+        try:
+            with key_lock.lock:
+                return self._create_or_refresh(backend, key, model, system_instruction)
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                if key_lock.users == 0 and self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def _create_or_refresh(
+        self,
+        backend: ContextCacheBackend,
+        key: tuple[t.Hashable, str, str],
+        model: str,
+        system_instruction: str,
+    ) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.monotonic()
+        if self._is_fresh(entry, now):
+            return entry.name
+        if entry is not None and entry.expires_at > now:
+            try:
+                backend.refresh(entry.name, self.ttl)
+                with self._lock:
+                    entry.expires_at = now + self.ttl
+                return entry.name
+            except Exception:
+                logger.warning("Could not refresh Gemini cached content %s", entry.name, exc_info=True)
+        try:
+            name = backend.create(model, system_instruction, self.ttl)
+        except Exception:
+            logger.warning("Could not create Gemini cached content; sending instruction inline", exc_info=True)
+            name = None
+        with self._lock:
+            self._entries[key] = _CacheEntry(name=name, expires_at=now + self.ttl)
+        return name
+
+    def _is_fresh(self, entry: _CacheEntry | None, now: float) -> t.TypeGuard[_CacheEntry]:
+        """
+        Whether `entry` can be used as is: unexpired, and either a remembered refusal
+        or a handle that does not need its TTL extended yet.
+        """
+        if entry is None or entry.expires_at <= now:
+            return False
+        return entry.name is None or entry.expires_at - now >= self.refresh_margin
+
+    def invalidate(self, name: str) -> None:
+        """
+        Forget a handle, e.g. after the provider rejected it, so the next request recreates it.
+        """
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.name == name:
+                    del self._entries[key]
+
+    def clear(self, backend: ContextCacheBackend | None = None) -> None:
+        """
+        Forget every handle, deleting them from `backend` when one is given.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        if backend is None:
+            return
+        for entry in entries:
+            if entry.name is None:
+                continue
+            try:
+                backend.delete(entry.name)
+            except Exception:
+                logger.warning("Could not delete Gemini cached content %s", entry.name, exc_info=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_manager: ContextCacheManager | None = None
+_default_manager_lock = threading.Lock()
+
+
+def get_context_cache_manager() -> ContextCacheManager:
+    """
+    Return the process-wide context cache manager, creating it on first use.
+    """
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                _default_manager = ContextCacheManager()
+    return _default_manager
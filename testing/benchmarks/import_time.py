@@ -0,0 +1,70 @@
+"""
+Cold-start cost of importing LLMterface and resolving a provider.
+
+Every scenario runs in a fresh interpreter, so nothing is cached between samples.
+
+    python -m testing.benchmarks.import_time
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCENARIOS: dict[str, str] = {
+    "import llmterface": "import llmterface",
+    "discover providers": (
+        "import llmterface\nfrom llmterface.providers.discovery import available_providers\navailable_providers()"
+    ),
+    "resolve gemini": (
+        "import llmterface\nfrom llmterface.providers.discovery import get_provider_chat\nget_provider_chat('gemini')"
+    ),
+}
+
+_TIMER = """
+import json, sys, time
+started = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "genai_imported": "google.genai" in sys.modules}}))
+"""
+
+
+def measure(code: str, runs: int = 5) -> dict[str, float | bool]:
+    """
+    Run `code` in `runs` fresh interpreters and return the median time it took.
+    """
+    samples = []
+    genai_imported = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        data = json.loads(out.strip().splitlines()[-1])
+        samples.append(data["seconds"])
+        genai_imported = data["genai_imported"]
+    return {"median_ms": statistics.median(samples) * 1e3, "genai_imported": genai_imported}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="where to write the JSON results")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(code, runs=args.runs) for name, code in SCENARIOS.items()}
+    for name, result in results.items():
+        print(f"{name:<20} {result['median_ms']:>8.1f}ms  google.genai imported: {result['genai_imported']}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
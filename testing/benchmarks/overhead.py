@@ -0,0 +1,372 @@
+"""
+Per-call overhead of LLMterface against a local fake provider.
+
+Every case asks the same question many times through `LLMterface.ask` and reports
+calls/sec and the p50/p99 time spent in the library, i.e. the wall time of a call
+minus the fake provider's simulated latency.
+
+    python -m testing.benchmarks.overhead
+    python -m testing.benchmarks.overhead --baseline testing/benchmarks/results/<earlier run>.json
+    python -m testing.benchmarks.overhead --output testing/benchmarks/baseline.json
+
+Results are written as JSON to `testing/benchmarks/results/` unless `--output` is given.
+Runs are compared against the committed `baseline.json` unless `--baseline` is given, and
+the command exits with status 1 when the p50 overhead of a zero-latency case grew by more
+than `--max-regression` over the baseline, even after the suspect cases are timed again.
+Fixed-latency cases are reported but not checked, since sleep jitter dominates them.
+Record a new baseline on the reference machine whenever an intended change moves the numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import typing as t
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import llmterface as llm
+from llmterface.providers.provider_chat import ProviderChat
+from llmterface.providers.provider_spec import ProviderSpec
+from pydantic import BaseModel, Field, PrivateAttr
+
+BENCH_PROVIDER = "bench"
+RESULTS_DIR = Path(__file__).parent / "results"
+BASELINE = Path(__file__).parent / "baseline.json"
+MODES = ("temp", "persistent", "retry")
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    country: str
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+    email: str
+    addresses: list[Address]
+    tags: list[str]
+
+
+RESPONSES: dict[type, str] = {
+    str: json.dumps({"response": "It depends on whether the swallow is African or European."}),
+    int: json.dumps({"response": 42}),
+    bool: json.dumps({"response": True}),
+    Person: json.dumps(
+        {
+            "name": "Arthur",
+            "age": 42,
+            "email": "arthur@camelot.example",
+            "addresses": [
+                {"street": "1 Castle Rd", "city": "Camelot", "country": "Britain"},
+                {"street": "2 Grail Way", "city": "Caerbannog", "country": "Britain"},
+            ],
+            "tags": ["king", "questing"],
+        }
+    ),
+}
+
+
+class BenchGenerationConfig(BaseModel):
+    temperature: float | None = None
+    max_output_tokens: int | None = None
+    system_instruction: str | None = None
+    response_mime_type: str = "application/json"
+    response_json_schema: dict[str, t.Any] = Field(default_factory=dict)
+
+
+class BenchProviderConfig(llm.ProviderConfig):
+    """
+    Compiles a GenericConfig into nested generation settings the way real provider
+    configs do, so resolving a config costs about what it costs for a real provider.
+    """
+
+    PROVIDER: t.ClassVar[str] = BENCH_PROVIDER
+    api_key: str | None = None
+    model: str | None = None
+    generation_config: BenchGenerationConfig = Field(default_factory=BenchGenerationConfig)
+
+    @classmethod
+    def from_generic_config(cls, config: llm.GenericConfig | None) -> BenchProviderConfig:
+        if config is None:
+            return cls()
+        generation_config = BenchGenerationConfig(
+            temperature=config.temperature,
+            max_output_tokens=config.max_output_tokens,
+            system_instruction=config.system_instruction,
+            response_json_schema=config.get_response_schema(),
+        )
+        return cls(api_key=config.api_key, model=config.model.value, generation_config=generation_config)
+
+
+class BenchChat(ProviderChat):
+    """
+    Fake provider answering with canned JSON after a fixed delay.
+
+    latency:
+        Seconds every call sleeps to simulate the network round-trip.
+    fail_first_attempt:
+        Answer every other call with invalid JSON, so each question is retried once.
+    """
+
+    PROVIDER: t.ClassVar[str] = BENCH_PROVIDER
+    latency: t.ClassVar[float] = 0.0
+    fail_first_attempt: t.ClassVar[bool] = False
+    _calls: int = PrivateAttr(default=0)
+
+    def ask(self, question: llm.Question, provider_config: llm.ProviderConfig) -> llm.GenericResponse:
+        self._calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_first_attempt and self._calls % 2:
+            return llm.GenericResponse(original=None, text="not json")
+        return llm.GenericResponse(original=None, text=RESPONSES[question.config.response_model])
+
+
+@contextmanager
+def bench_provider(latency: float = 0.0, fail_first_attempt: bool = False) -> t.Generator[None]:
+    """
+    Register the fake provider under `BENCH_PROVIDER` with the given behaviour for the
+    duration of the block, restoring whatever was registered under that name before.
+    """
+    from llmterface.providers.discovery import _PROVIDER_SPECS, load_provider_configs_once
+
+    load_provider_configs_once()
+    chat_cls = type(
+        "BenchChat",
+        (BenchChat,),
+        {"latency": latency, "fail_first_attempt": fail_first_attempt, "__module__": __name__},
+    )
+    previous = _PROVIDER_SPECS.get(BENCH_PROVIDER)
+    _PROVIDER_SPECS[BENCH_PROVIDER] = ProviderSpec(
+        provider=BENCH_PROVIDER, config_cls=BenchProviderConfig, chat_cls=chat_cls
+    )
+    try:
+        yield
+    finally:
+        if previous is None:
+            _PROVIDER_SPECS.pop(BENCH_PROVIDER, None)
+        else:
+            _PROVIDER_SPECS[BENCH_PROVIDER] = previous
+
+
+@dataclass(slots=True)
+class CaseResult:
+    response_model: str
+    mode: str
+    latency_ms: float
+    calls: int
+    calls_per_sec: float
+    p50_overhead_us: float
+    p99_overhead_us: float
+    mean_overhead_us: float
+
+
+def run_case(
+    response_model: type,
+    mode: str,
+    latency: float = 0.0,
+    iterations: int = 1000,
+    warmup: int = 50,
+) -> CaseResult:
+    """
+    Time `iterations` calls of `LLMterface.ask` for one response model and mode.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got: {mode!r}")
+    with bench_provider(latency=latency, fail_first_attempt=mode == "retry"):
+        config = llm.GenericConfig(provider=BENCH_PROVIDER, response_model=response_model)
+        handler = llm.LLMterface(config=config)
+        chat_id = handler.create_chat(BENCH_PROVIDER, config=config).id if mode == "persistent" else None
+        question = llm.Question(question="What is the airspeed velocity of an unladen swallow?")
+        # a retried call waits for the fake provider twice
+        provider_time = latency * (2 if mode == "retry" else 1)
+
+        try:
+            for _ in range(warmup):
+                handler.ask(question, chat_id=chat_id)
+            samples: list[float] = []
+            started = time.perf_counter()
+            for _ in range(iterations):
+                call_started = time.perf_counter()
+                handler.ask(question, chat_id=chat_id)
+                samples.append(time.perf_counter() - call_started)
+            elapsed = time.perf_counter() - started
+        finally:
+            handler.close()
+
+    overheads = sorted(max(sample - provider_time, 0.0) * 1e6 for sample in samples)
+    return CaseResult(
+        response_model=response_model.__name__,
+        mode=mode,
+        latency_ms=latency * 1e3,
+        calls=iterations,
+        calls_per_sec=iterations / elapsed,
+        p50_overhead_us=_percentile(overheads, 50),
+        p99_overhead_us=_percentile(overheads, 99),
+        mean_overhead_us=statistics.fmean(overheads),
+    )
+
+
+def time_provider_config(
+    response_model: type = Person, iterations: int = 2000, repeats: int = 5
+) -> tuple[float, float]:
+    """
+    Microseconds to resolve a provider config through `GenericChat.get_provider_config`
+    once it is memoized, and to rebuild it with `from_generic_config`.
+    Each is the best of `repeats` runs of `iterations` calls.
+    """
+    config = llm.GenericConfig(provider=BENCH_PROVIDER, response_model=response_model)
+    with bench_provider():
+        llm.GenericChat.get_provider_config(config)
+        hit = min(_time_calls(lambda: llm.GenericChat.get_provider_config(config), iterations) for _ in range(repeats))
+        rebuild = min(
+            _time_calls(lambda: BenchProviderConfig.from_generic_config(config), iterations) for _ in range(repeats)
+        )
+    return hit, rebuild
+
+
+def _time_calls(fn: t.Callable[[], t.Any], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_suite(
+    latencies: t.Iterable[float] = (0.0, 0.005),
+    response_models: t.Iterable[type] = tuple(RESPONSES),
+    modes: t.Iterable[str] = MODES,
+    iterations: int = 1000,
+    latency_iterations: int = 100,
+) -> list[CaseResult]:
+    """
+    Run every combination of latency, response model and mode.
+    Cases with a non-zero latency use `latency_iterations`, since they are dominated by sleeping.
+    """
+    results = []
+    for latency in latencies:
+        for response_model in response_models:
+            for mode in modes:
+                n = iterations if latency == 0 else latency_iterations
+                results.append(run_case(response_model, mode, latency=latency, iterations=n))
+    return results
+
+
+def save_results(results: list[CaseResult], output: Path | None = None) -> Path:
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"overhead-{datetime.now(UTC).strftime('%Y%m%dT%H%M%SZ')}.json"
+    payload = {
+        "created": datetime.now(UTC).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    output.write_text(json.dumps(payload, indent=2))
+    return output
+
+
+def format_results(results: list[CaseResult], baseline: Path | None = None) -> str:
+    """
+    Render results as a table. With a baseline, the p50 change against the matching
+    baseline case is appended to every row.
+    """
+    previous = load_baseline(baseline) if baseline is not None else {}
+    header = f"{'model':<8} {'mode':<11} {'latency':>8} {'calls/s':>10} {'p50 us':>9} {'p99 us':>9}"
+    lines = [header + ("  p50 vs baseline" if previous else ""), "-" * len(header)]
+    for r in results:
+        line = (
+            f"{r.response_model:<8} {r.mode:<11} {r.latency_ms:>6.1f}ms {r.calls_per_sec:>10.0f} "
+            f"{r.p50_overhead_us:>9.1f} {r.p99_overhead_us:>9.1f}"
+        )
+        if (old := previous.get((r.response_model, r.mode, r.latency_ms))) and old["p50_overhead_us"]:
+            line += f"  {(r.p50_overhead_us / old['p50_overhead_us'] - 1) * 100:+.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> dict[tuple[str, str, float], dict[str, t.Any]]:
+    """
+    Rows of a saved run keyed by response model, mode and latency.
+    """
+    return {
+        (row["response_model"], row["mode"], row["latency_ms"]): row for row in json.loads(path.read_text())["results"]
+    }
+
+
+def find_regressions(
+    results: list[CaseResult], baseline: Path, max_regression: float = 0.5
+) -> list[tuple[CaseResult, float]]:
+    """
+    Zero-latency cases whose p50 overhead grew by more than `max_regression` (a fraction)
+    over the matching baseline case, with the relative change of each.
+    """
+    previous = load_baseline(baseline)
+    regressions = []
+    for r in results:
+        old = previous.get((r.response_model, r.mode, r.latency_ms))
+        if r.latency_ms or not old or not old["p50_overhead_us"]:
+            continue
+        if (change := r.p50_overhead_us / old["p50_overhead_us"] - 1) > max_regression:
+            regressions.append((r, change))
+    return regressions
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000, help="calls per zero-latency case")
+    parser.add_argument("--latency-iterations", type=int, default=100, help="calls per fixed-latency case")
+    parser.add_argument("--latency", type=float, default=0.005, help="fixed provider latency in seconds")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", type=Path, help="where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="earlier results to compare against (default: baseline.json)")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.5,
+        help="allowed p50 growth of zero-latency cases over the baseline, as a fraction",
+    )
+    args = parser.parse_args(argv)
+    baseline = args.baseline or (BASELINE if BASELINE.exists() else None)
+
+    results = run_suite(
+        latencies=(0.0, args.latency),
+        modes=args.modes,
+        iterations=args.iterations,
+        latency_iterations=args.latency_iterations,
+    )
+    print(format_results(results, baseline=baseline))
+    print(f"\nResults written to {save_results(results, args.output)}")
+    if baseline is None:
+        return
+    if suspects := find_regressions(results, baseline, args.max_regression):
+        # a single noisy run should not fail the check, so suspects are timed again and keep their best p50
+        models = {model.__name__: model for model in RESPONSES}
+        retimed = [run_case(models[r.response_model], r.mode, iterations=args.iterations) for r, _ in suspects]
+        best = [min(r, again, key=lambda c: c.p50_overhead_us) for (r, _), again in zip(suspects, retimed, strict=True)]
+        regressions = find_regressions(best, baseline, args.max_regression)
+    else:
+        regressions = []
+    if regressions:
+        print(f"\np50 overhead regressed by more than {args.max_regression:.0%} against {baseline}:")
+        for r, change in regressions:
+            print(f"  {r.response_model} {r.mode}: {r.p50_overhead_us:.1f} us ({change:+.1%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -182,3 +182,442 @@ def test_create_builds_client_and_returns_generic_chat(monkeypatch):
     assert chat.id == "c1"
     assert chat.client.id == "c1"
     assert chat.config is cfg
+
+
+# -------------------------
+# client pool tests
+# -------------------------
+
+
+class _FakeSdkChat:
+    last_config = None
+
+    def send_message(self, message, config=None):
+        _FakeSdkChat.last_config = config
+
+        class _Res:
+            text = json.dumps({"response": "pooled"})
+
+        return _Res()
+
+    def send_message_stream(self, message, config=None):
+        _FakeSdkChat.last_config = config
+        for text in ('{"response": ', '"stre', 'amed"}'):
+
+            class _Res:
+                pass
+
+            res = _Res()
+            res.text = text
+            yield res
+
+
+class _FakeAsyncSdkChat:
+    async def send_message(self, message, config=None):
+        class _Res:
+            text = json.dumps({"response": "pooled-async"})
+
+        return _Res()
+
+
+class _FakeGenaiClient:
+    instances = 0
+
+    def __init__(self, api_key=None):
+        type(self).instances += 1
+        self.closed = False
+
+        class _Chats:
+            @staticmethod
+            def create(model, history=None):
+                _FakeGenaiClient.history = history
+                return _FakeSdkChat()
+
+        class _AsyncChats:
+            @staticmethod
+            def create(model, history=None):
+                return _FakeAsyncSdkChat()
+
+        class _Aio:
+            chats = _AsyncChats()
+            closed = False
+
+            async def aclose(self):
+                self.closed = True
+
+        self.chats = _Chats()
+        self.aio = _Aio()
+
+    def close(self):
+        self.closed = True
+
+
+def test_temp_chats_borrow_pooled_client(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+    _FakeGenaiClient.instances = 0
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    assert handler.ask("first") == "pooled"
+    assert handler.ask("second") == "pooled"
+
+    assert _FakeGenaiClient.instances == 1
+    assert len(pool) == 1
+    client = next(iter(pool._entries.values())).client
+    pool.close()
+    assert len(pool) == 0
+    assert client.closed
+
+
+def test_async_clients_are_leased_per_event_loop(monkeypatch):
+    import asyncio
+
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    assert asyncio.run(handler.aask("first")) == "pooled-async"
+    assert asyncio.run(handler.aask("second")) == "pooled-async"
+
+    loops = [key[-1] for key in pool._entries if len(key) == 3]
+    assert len(loops) == 2 and loops[0] is not loops[1]
+    clients = [entry.client for key, entry in pool._entries.items() if len(key) == 3]
+    pool.close()
+    # both loops are closed, and their connections with them
+    assert not any(client.aio.closed for client in clients)
+
+
+def test_close_async_client_closes_on_the_clients_loop():
+    import asyncio
+
+    from llmterface_gemini.chat import _CLOSING, close_async_client
+
+    async def close_on_running_loop(client):
+        close_async_client(client, asyncio.get_running_loop())
+        assert len(_CLOSING) == 1
+        await asyncio.sleep(0)
+
+    running = _FakeGenaiClient()
+    asyncio.run(close_on_running_loop(running))
+    assert running.aio.closed
+    assert not _CLOSING
+
+    idle, loop = _FakeGenaiClient(), asyncio.new_event_loop()
+    close_async_client(idle, loop)
+    assert idle.aio.closed
+    loop.close()
+
+    stale = _FakeGenaiClient()
+    close_async_client(stale, loop)
+    assert not stale.aio.closed
+
+
+def test_deadline_bounds_sdk_http_timeout(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: ClientPool())
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key", deadline=5.0))
+    assert handler.ask(llm.Question(question="first", timeout=2.0)) == "pooled"
+    assert 1000 < _FakeSdkChat.last_config.http_options.timeout <= 2000
+    assert handler.ask("second") == "pooled"
+    assert 4000 < _FakeSdkChat.last_config.http_options.timeout <= 5000
+    assert list(handler.stream(llm.Question(question="third", timeout=2.0)))[-1].result == "streamed"
+    assert 1000 < _FakeSdkChat.last_config.http_options.timeout <= 2000
+
+
+def test_aask_uses_native_async_client(monkeypatch):
+    import asyncio
+
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    assert asyncio.run(handler.aask("hello")) == "pooled-async"
+
+
+def test_stream_uses_send_message_stream(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    chunks = list(handler.stream("hello"))
+    assert len(chunks) == 4
+    assert chunks[-1].result == "streamed"
+
+
+# -------------------------
+# metadata tests
+# -------------------------
+
+
+def test_convert_response_to_generic_fills_standard_metadata():
+    from google.genai import types
+    from llmterface_gemini.chat import convert_response_to_generic
+
+    response = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(role="model", parts=[types.Part(text='{"response": "hi"}')]),
+                finish_reason=types.FinishReason.STOP,
+            )
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=11,
+            candidates_token_count=5,
+            cached_content_token_count=3,
+        ),
+        model_version="gemini-2.0-flash-lite",
+    )
+
+    res = convert_response_to_generic(response, total_time=0.25)
+
+    assert res.text == '{"response": "hi"}'
+    assert res.metadata == {
+        "prompt_tokens": 11,
+        "output_tokens": 5,
+        "cached_tokens": 3,
+        "model_id": "gemini-2.0-flash-lite",
+        "finish_reason": "STOP",
+        "total_time": 0.25,
+    }
+
+
+def test_restored_chat_seeds_sdk_history(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _FakeGenaiClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+    history = llm.ChatHistory()
+    history.add_exchange("hi", '{"response": "hello"}')
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    chat = handler.restore_chat(PROVIDER, history)
+    assert handler.ask("again", chat_id=chat.id) == "pooled"
+
+    assert [(c.role, c.parts[0].text) for c in _FakeGenaiClient.history] == [
+        ("user", "hi"),
+        ("model", '{"response": "hello"}'),
+    ]
+    assert len(chat.history) == 4
+
+
+def test_ask_and_aask_share_one_conversation(monkeypatch):
+    import asyncio
+
+    import llmterface_gemini.chat as gemini_chat_mod
+    from google.genai.types import Content, Part
+    from llmterface.providers.client_pool import ClientPool
+
+    class _HistoryChat:
+        def __init__(self, history):
+            self.history = list(history or [])
+
+        def get_history(self, curated=False):
+            return self.history
+
+        def _reply(self, message):
+            seen = [c.parts[0].text for c in self.history]
+            self.history += [
+                Content(role="user", parts=[Part(text=message)]),
+                Content(role="model", parts=[Part(text=json.dumps({"response": message}))]),
+            ]
+
+            class _Res:
+                text = json.dumps({"response": ",".join(seen)})
+
+            return _Res()
+
+        def send_message(self, message, config=None):
+            return self._reply(message)
+
+    class _AsyncHistoryChat(_HistoryChat):
+        async def send_message(self, message, config=None):
+            return self._reply(message)
+
+    class _Client(_FakeGenaiClient):
+        def __init__(self, api_key=None):
+            super().__init__(api_key)
+            self.chats.create = lambda model, history=None: _HistoryChat(history)
+            self.aio.chats.create = lambda model, history=None: _AsyncHistoryChat(history)
+
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _Client)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: ClientPool())
+
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+    chat = handler.create_chat(PROVIDER)
+    assert handler.ask("one", chat_id=chat.id) == ""
+    assert asyncio.run(handler.aask("two", chat_id=chat.id)) == 'one,{"response": "one"}'
+    assert handler.ask("three", chat_id=chat.id).startswith('one,{"response": "one"},two,')
+
+
+def test_count_tokens_remote_uses_models_endpoint(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.providers.client_pool import ClientPool
+
+    seen = {}
+
+    class _Models:
+        def count_tokens(self, model, contents, config=None):
+            seen.update(model=model, contents=contents)
+
+            class _Res:
+                total_tokens = 11
+
+            return _Res()
+
+    class _CountingClient(_FakeGenaiClient):
+        def __init__(self, api_key=None):
+            super().__init__(api_key=api_key)
+            self.models = _Models()
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _CountingClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+    config = llm.GenericConfig(provider=PROVIDER, api_key="pool-key", system_instruction="be brief")
+    chat = llm.GenericChat.create(PROVIDER, "count", config=config)
+
+    assert chat.count_tokens(llm.Question(question="how many tokens?"), exact=True) == 11
+    assert [(c.role, c.parts[0].text) for c in seen["contents"]] == [("user", "be brief"), ("user", "how many tokens?")]
+
+    chat.history.add_exchange("hi", "hello")
+    assert chat.count_tokens(llm.Question(question="how many tokens?"), exact=True) == 11
+    assert [c.parts[0].text for c in seen["contents"]] == ["be brief", "hi", "hello", "how many tokens?"]
+
+
+def test_embed_uses_embedding_model(monkeypatch):
+    import asyncio
+
+    import llmterface_gemini.chat as gemini_chat_mod
+    from llmterface.deadline import deadline_scope
+    from llmterface.providers.client_pool import ClientPool
+
+    seen, configs = [], []
+
+    def _embed_content(model, contents, config=None):
+        seen.append((model, contents))
+        configs.append(config)
+
+        class _Embedding:
+            def __init__(self, text):
+                self.values = [float(len(text)), 1.0]
+
+        class _Res:
+            embeddings = [_Embedding(text) for text in contents]
+
+        return _Res()
+
+    class _Models:
+        embed_content = staticmethod(_embed_content)
+
+    class _AsyncModels:
+        @staticmethod
+        async def embed_content(model, contents, config=None):
+            return _embed_content(model, contents, config)
+
+    class _EmbeddingClient(_FakeGenaiClient):
+        def __init__(self, api_key=None):
+            super().__init__(api_key=api_key)
+            self.models = _Models()
+            self.aio.models = _AsyncModels()
+
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _EmbeddingClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: ClientPool())
+    chat = llm.GenericChat.create(PROVIDER, "embed", config=llm.GenericConfig(provider=PROVIDER, api_key="pool-key"))
+
+    assert chat.embed(["a", "bcd"]) == [[1.0, 1.0], [3.0, 1.0]]
+    assert asyncio.run(chat.aembed(["ab"])) == [[2.0, 1.0]]
+    assert seen[0] == (gemini.GeminiEmbeddingModelType.GEMINI_EMBEDDING_001.value, ["a", "bcd"])
+    assert configs[0].http_options is None
+
+    with deadline_scope(2.0):
+        chat.embed(["bounded"])
+    assert 1000 < configs[-1].http_options.timeout <= 2000
+
+
+# -------------------------
+# batch tests
+# -------------------------
+
+
+def test_batch_job_round_trip(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+    from google.genai.types import JobState
+    from llmterface.providers.client_pool import ClientPool
+
+    uploaded = []
+
+    class _Files:
+        def upload(self, file, config=None):
+            uploaded.extend(json.loads(line) for line in file.read().splitlines())
+
+            class _File:
+                name = "files/input"
+
+            return _File()
+
+        def download(self, file):
+            assert file == "files/output"
+            lines = [
+                {"key": "1", "error": {"code": 400}},
+                {
+                    "key": "0",
+                    "response": {"candidates": [{"content": {"parts": [{"text": '{"response": "batched"}'}]}}]},
+                },
+            ]
+            return "\n".join(json.dumps(line) for line in lines).encode()
+
+    class _Job:
+        name = "batches/1"
+        state = JobState.JOB_STATE_SUCCEEDED
+
+        class dest:
+            file_name = "files/output"
+
+    class _Batches:
+        def create(self, model, src, config=None):
+            assert src == "files/input"
+            return _Job()
+
+        def get(self, name):
+            return _Job()
+
+    class _BatchClient(_FakeGenaiClient):
+        def __init__(self, api_key=None):
+            super().__init__(api_key=api_key)
+            self.files = _Files()
+            self.batches = _Batches()
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _BatchClient)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=PROVIDER, api_key="k", system_instruction="be brief"))
+
+    results = handler.run_batch(["first", llm.Question(question="second", max_retries=0)], poll_interval=0)
+
+    assert results[0] == "batched"
+    assert isinstance(results[1], ex.ProviderError)
+    assert uploaded[0]["key"] == "0"
+    assert uploaded[0]["request"]["contents"][0]["parts"][0]["text"] == "first"
+    assert uploaded[0]["request"]["systemInstruction"] == {"parts": [{"text": "be brief"}]}
+    assert uploaded[0]["request"]["generationConfig"]["responseMimeType"] == "application/json"
@@ -134,3 +134,22 @@ def test_gemini_config_model_validation_runs_on_init_for_string():
 def test_gemini_config_model_invalid_string_raises_on_init():
     with pytest.raises(ValueError, match=r"Invalid Gemini model type:"):
         GeminiConfig(api_key="abc123", model="definitely-not-a-real-model")
+
+
+def test_get_model_id_returns_concrete_model():
+    gem_cfg = GeminiConfig(api_key="abc123", model=llm.GenericModelType.text_heavy)
+    assert gem_cfg.get_model_id() == GeminiConfig.GENERIC_MODEL_MAPPING[llm.GenericModelType.text_heavy].value
+
+
+def test_deadline_http_options_bounds_the_timeout():
+    from google.genai.types import HttpOptions
+    from llmterface.deadline import deadline_scope
+    from llmterface_gemini.config import deadline_http_options
+
+    configured = HttpOptions(timeout=500, api_version="v1")
+    assert deadline_http_options() is None
+    assert deadline_http_options(configured) is configured
+    with deadline_scope(2.0):
+        assert 1000 < deadline_http_options().timeout <= 2000
+        assert deadline_http_options(configured) == configured
+        assert deadline_http_options(HttpOptions(api_version="v1")).api_version == "v1"
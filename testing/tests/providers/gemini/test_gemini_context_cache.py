@@ -0,0 +1,182 @@
+import json
+
+import llmterface as llm
+import llmterface_gemini as gemini
+import pytest
+from llmterface.providers.client_pool import ClientPool
+from llmterface_gemini.context_cache import ContextCacheManager, LocalContextCacheBackend
+
+PROVIDER = gemini.GeminiConfig.PROVIDER
+LARGE_INSTRUCTION = "Follow the house style. " * 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    import llmterface_gemini.context_cache as context_cache_mod
+
+    now = [1000.0]
+    monkeypatch.setattr(context_cache_mod.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_handles_are_reused_refreshed_and_recreated(clock):
+    backend = LocalContextCacheBackend()
+    manager = ContextCacheManager(ttl=100, refresh_margin=10)
+
+    first = manager.get(backend, "creds", "model", "instruction")
+    assert manager.get(backend, "creds", "model", "instruction") == first
+    assert manager.get(backend, "creds", "other-model", "instruction") != first
+
+    clock[0] += 95
+    assert manager.get(backend, "creds", "model", "instruction") == first
+    clock[0] += 101
+    recreated = manager.get(backend, "creds", "model", "instruction")
+
+    assert recreated != first
+    assert [call for call, name in backend.calls if name == first] == ["create", "refresh"]
+
+
+def test_failed_creation_falls_back_until_ttl_passes(clock):
+    class RefusingBackend(LocalContextCacheBackend):
+        def create(self, model, system_instruction, ttl):
+            self.calls.append(("create", None))
+            raise RuntimeError("content too small")
+
+    backend = RefusingBackend()
+    manager = ContextCacheManager(ttl=100, refresh_margin=10)
+
+    assert manager.get(backend, "creds", "model", "tiny") is None
+    assert manager.get(backend, "creds", "model", "tiny") is None
+    assert len(backend.calls) == 1
+
+
+def test_slow_creation_does_not_block_other_instructions():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    started, release = threading.Event(), threading.Event()
+
+    class SlowBackend(LocalContextCacheBackend):
+        def create(self, model, system_instruction, ttl):
+            if system_instruction == "slow":
+                started.set()
+                assert release.wait(5)
+            return super().create(model, system_instruction, ttl)
+
+    backend = SlowBackend()
+    manager = ContextCacheManager()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        slow = [executor.submit(manager.get, backend, "creds", "model", "slow") for _ in range(2)]
+        assert started.wait(5)
+        assert manager.get(backend, "creds", "model", "fast") is not None
+        release.set()
+        names = {future.result() for future in slow}
+
+    assert len(names) == 1
+    assert [call for call, _ in backend.calls] == ["create", "create"]
+    assert not manager._key_locks
+
+
+def test_key_locks_do_not_outlive_their_users():
+    class FailingBackend(LocalContextCacheBackend):
+        def create(self, model, system_instruction, ttl):
+            raise RuntimeError("too small to cache")
+
+    manager = ContextCacheManager()
+    for i in range(100):
+        manager.get(LocalContextCacheBackend(), "creds", "model", f"instruction {i}")
+        manager.get(FailingBackend(), "creds", "model", f"refused {i}")
+
+    assert len(manager) == 200
+    assert not manager._key_locks
+
+
+def test_invalidate_and_clear():
+    backend = LocalContextCacheBackend()
+    manager = ContextCacheManager()
+    name = manager.get(backend, "creds", "model", "instruction")
+    manager.invalidate(name)
+    assert len(manager) == 0
+
+    recreated = manager.get(backend, "creds", "model", "instruction")
+    assert recreated != name
+    manager.clear(backend)
+    assert backend.calls[-1] == ("delete", recreated)
+    assert len(manager) == 0
+
+
+def test_from_generic_config_enables_cache_above_threshold():
+    small = gemini.GeminiConfig.from_generic_config(llm.GenericConfig(api_key="k", system_instruction="short"))
+    large = gemini.GeminiConfig.from_generic_config(
+        llm.GenericConfig(api_key="k", system_instruction=LARGE_INSTRUCTION)
+    )
+    assert not small.cache_system_instruction
+    assert large.cache_system_instruction
+
+
+def test_chat_sends_cached_content_instead_of_instruction(monkeypatch):
+    import llmterface_gemini.chat as gemini_chat_mod
+
+    sent_configs = []
+    backend = LocalContextCacheBackend()
+
+    class _SdkChat:
+        def send_message(self, message, config=None):
+            sent_configs.append(config)
+
+            class _Res:
+                text = json.dumps({"response": "cached"})
+
+            return _Res()
+
+    class _Client:
+        def __init__(self, api_key=None):
+            class _Chats:
+                @staticmethod
+                def create(model, history=None):
+                    return _SdkChat()
+
+            self.chats = _Chats()
+
+    pool = ClientPool()
+    monkeypatch.setattr(gemini_chat_mod, "GenaiClient", _Client)
+    monkeypatch.setattr(gemini_chat_mod, "get_client_pool", lambda: pool)
+    monkeypatch.setattr(gemini_chat_mod, "GenaiContextCacheBackend", lambda client: backend)
+    monkeypatch.setattr(gemini_chat_mod, "get_context_cache_manager", lambda: manager)
+    manager = ContextCacheManager()
+
+    handler = llm.LLMterface(
+        config=llm.GenericConfig(provider=PROVIDER, api_key="cache-key", system_instruction=LARGE_INSTRUCTION)
+    )
+    assert handler.ask("first") == "cached"
+    assert handler.ask("second") == "cached"
+
+    assert [call for call, _ in backend.calls] == ["create"]
+    assert all(c.system_instruction is None and c.cached_content == backend.calls[0][1] for c in sent_configs)
+
+
+def test_genai_backend_bounds_cache_calls_by_the_deadline():
+    from llmterface.deadline import deadline_scope
+    from llmterface_gemini.context_cache import GenaiContextCacheBackend
+
+    calls = []
+
+    class _Caches:
+        def create(self, model, config):
+            calls.append(config)
+            return type("_Cached", (), {"name": "cachedContents/1"})()
+
+        def update(self, name, config):
+            calls.append(config)
+
+        def delete(self, name, config):
+            calls.append(config)
+
+    backend = GenaiContextCacheBackend(type("_Client", (), {"caches": _Caches()})())
+    with deadline_scope(2.0):
+        assert backend.create("model", "instruction", 60) == "cachedContents/1"
+        backend.refresh("cachedContents/1", 60)
+    backend.delete("cachedContents/1")
+
+    assert [1000 < c.http_options.timeout <= 2000 for c in calls[:2]] == [True, True]
+    assert calls[2].http_options is None
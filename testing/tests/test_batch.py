@@ -0,0 +1,141 @@
+import json
+import typing as t
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.providers.provider_spec import ProviderSpec
+from pydantic import PrivateAttr
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+class BatchChat(FakeChat):
+    """
+    Answers every batch immediately. Prompts containing "bad" get invalid JSON,
+    prompts containing "fail" get an item error.
+    """
+
+    jobs: t.ClassVar[list[list[str]]] = []
+    final_state: t.ClassVar[llm.BatchState] = llm.BatchState.succeeded
+    polls_needed: t.ClassVar[int] = 1
+    polls: t.ClassVar[dict[str, int]] = {}
+    _results: dict[str, list] = PrivateAttr(default_factory=dict)
+
+    def submit_batch(self, requests):
+        job_id = f"job-{len(self.jobs)}"
+        self.jobs.append([q.prompt for q, _ in requests])
+        results = []
+        for question, _ in requests:
+            if "fail" in question.prompt:
+                results.append(RuntimeError("item failed"))
+            elif "bad" in question.prompt and "previous erroneous response" not in question.prompt:
+                results.append(llm.GenericResponse(original=None, text="not json"))
+            else:
+                results.append(llm.GenericResponse(original=None, text=json.dumps({"response": question.prompt[:5]})))
+        self._results[job_id] = results
+        return job_id
+
+    def get_batch_state(self, job_id):
+        self.polls[job_id] = self.polls.get(job_id, 0) + 1
+        return self.final_state if self.polls[job_id] >= self.polls_needed else llm.BatchState.running
+
+    def get_batch_results(self, job_id):
+        yield from self._results[job_id]
+
+
+@pytest.fixture
+def batch_provider(monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    mock_all_prov()
+    monkeypatch.setattr(BatchChat, "jobs", [])
+    monkeypatch.setattr(BatchChat, "polls", {})
+    monkeypatch.setitem(
+        _PROVIDER_SPECS, "mock", ProviderSpec(provider="mock", config_cls=FakeProviderConfig, chat_cls=BatchChat)
+    )
+    return llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+
+
+def test_run_batch_returns_results_in_order(batch_provider):
+    results = batch_provider.run_batch(["alpha", "fail", "gamma"])
+
+    assert results[0] == "alpha" and results[2] == "gamma"
+    assert isinstance(results[1], ex.ProviderError)
+    assert len(BatchChat.jobs) == 1
+
+
+def test_schema_failures_are_retried_in_a_follow_up_job(batch_provider):
+    results = batch_provider.run_batch(["bad one", "good"], poll_interval=0)
+
+    assert results == ["bad o", "good"]
+    assert len(BatchChat.jobs) == 2
+    assert len(BatchChat.jobs[1]) == 1
+    assert "previous erroneous response" in BatchChat.jobs[1][0]
+
+
+def test_schema_failure_without_retries_left_is_returned(batch_provider):
+    results = batch_provider.run_batch([llm.Question(question="bad", max_retries=0)])
+    assert isinstance(results[0], ex.SchemaError)
+
+
+def test_jobs_of_every_provider_are_submitted_before_polling(batch_provider, monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    monkeypatch.setitem(
+        _PROVIDER_SPECS, "openai", ProviderSpec(provider="openai", config_cls=FakeProviderConfig, chat_cls=BatchChat)
+    )
+    monkeypatch.setattr(BatchChat, "polls_needed", 2)
+    questions = ["alpha", llm.Question(question="beta", config=llm.GenericConfig(provider="openai"))]
+
+    results = batch_provider.iter_batch(questions, poll_interval=0)
+    first = next(results)
+    assert len(BatchChat.jobs) == 2
+    assert sorted([first, *results]) == [(0, "alpha"), (1, "beta")]
+    assert all(polls == 2 for polls in BatchChat.polls.values())
+
+
+def test_failed_job_yields_errors_without_dropping_other_jobs(batch_provider, monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    class FailingBatchChat(BatchChat):
+        final_state: t.ClassVar[llm.BatchState] = llm.BatchState.failed
+
+    monkeypatch.setitem(
+        _PROVIDER_SPECS,
+        "openai",
+        ProviderSpec(provider="openai", config_cls=FakeProviderConfig, chat_cls=FailingBatchChat),
+    )
+    failing = llm.Question(question="beta", config=llm.GenericConfig(provider="openai"))
+
+    results = batch_provider.run_batch(["alpha", failing, "gamma"])
+
+    assert results[0] == "alpha" and results[2] == "gamma"
+    assert isinstance(results[1], ex.ProviderError)
+    assert "failed" in str(results[1])
+
+
+def test_unfinished_job_is_cancelled_on_timeout(batch_provider, monkeypatch):
+    cancelled = []
+    monkeypatch.setattr(BatchChat, "final_state", llm.BatchState.running)
+    monkeypatch.setattr(BatchChat, "cancel_batch", lambda self, job_id: cancelled.append(job_id), raising=False)
+
+    with pytest.raises(ex.ProviderError, match="timeout"):
+        batch_provider.run_batch(["alpha"], poll_interval=1.0, timeout=0.1)
+    assert cancelled == ["job-0"]
+
+
+def test_job_finishing_just_before_the_timeout_is_collected(batch_provider, monkeypatch):
+    monkeypatch.setattr(BatchChat, "polls_needed", 2)
+
+    results = batch_provider.run_batch(["alpha"], poll_interval=10.0, timeout=0.1)
+
+    assert results == ["alpha"]
+    assert BatchChat.polls == {"job-0": 2}
+
+
+def test_providers_without_batch_support_raise():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+    with pytest.raises(NotImplementedError):
+        handler.run_batch(["alpha"])
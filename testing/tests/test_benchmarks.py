@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from llmterface.providers.discovery import _PROVIDER_SPECS
+
+from testing.benchmarks.overhead import (
+    BASELINE,
+    BENCH_PROVIDER,
+    MODES,
+    RESPONSES,
+    CaseResult,
+    bench_provider,
+    find_regressions,
+    format_results,
+    load_baseline,
+    run_case,
+    run_suite,
+    save_results,
+    time_provider_config,
+)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("response_model", list(RESPONSES))
+def test_overhead_case_runs(response_model, mode):
+    result = run_case(response_model, mode, iterations=5, warmup=1)
+    assert result.calls == 5
+    assert result.calls_per_sec > 0
+    assert 0 <= result.p50_overhead_us <= result.p99_overhead_us
+
+
+def test_fixed_latency_is_subtracted():
+    result = run_case(int, "temp", latency=0.01, iterations=3, warmup=0)
+    assert result.calls_per_sec < 100
+    assert result.p50_overhead_us < 10_000
+
+
+def test_results_round_trip_against_baseline(tmp_path):
+    results = run_suite(latencies=(0.0,), response_models=(str,), modes=("temp",), iterations=3)
+    path = save_results(results, tmp_path / "bench.json")
+
+    assert json.loads(path.read_text())["results"][0]["mode"] == "temp"
+    assert "p50 vs baseline" in format_results(results, baseline=path)
+
+
+def test_bench_provider_is_unregistered_afterwards():
+    run_case(str, "temp", iterations=1, warmup=0)
+    assert BENCH_PROVIDER not in _PROVIDER_SPECS
+
+    with bench_provider():
+        assert BENCH_PROVIDER in _PROVIDER_SPECS
+    assert BENCH_PROVIDER not in _PROVIDER_SPECS
+
+
+def test_memoized_provider_config_is_cheaper_than_a_rebuild():
+    hit, rebuild = time_provider_config(iterations=500)
+    assert hit < rebuild
+
+
+def test_regressions_are_reported_for_zero_latency_cases(tmp_path):
+    def case(mode, latency_ms, p50):
+        return CaseResult("str", mode, latency_ms, 10, 1.0, p50, p50, p50)
+
+    baseline = save_results(
+        [case("temp", 0.0, 10.0), case("retry", 0.0, 10.0), case("temp", 5.0, 10.0)], tmp_path / "b.json"
+    )
+    results = [
+        case("temp", 0.0, 12.0),
+        case("retry", 0.0, 13.0),
+        case("temp", 5.0, 100.0),
+        case("persistent", 0.0, 99.0),
+    ]
+
+    regressions = find_regressions(results, baseline, max_regression=0.25)
+    assert [(r.mode, round(change, 2)) for r, change in regressions] == [("retry", 0.3)]
+    assert find_regressions(results, baseline, max_regression=0.1)[0][0].mode == "temp"
+
+
+def test_committed_baseline_covers_every_zero_latency_case():
+    rows = load_baseline(BASELINE)
+    for response_model in RESPONSES:
+        for mode in MODES:
+            assert (response_model.__name__, mode, 0.0) in rows
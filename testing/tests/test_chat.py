@@ -1,7 +1,10 @@
+import asyncio
+
 import llmterface as llm
+import llmterface.exceptions as ex
 import pytest
 
-from testing.helpers.fakes import FakeProviderConfig, mock_all_prov
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
 
 
 def test_instantiate_chat():
@@ -47,3 +50,168 @@ def test_response_model_types(response_model):
     chat = handler.create_chat(provider=FakeProviderConfig.PROVIDER, config=config)
     res = chat.ask(llm.Question(question="return a value of the correct type"))
     assert isinstance(res, response_model), f"Response should be of type {response_model}"
+
+
+def test_aask_retries_schema_errors():
+    mock_all_prov()
+
+    class FlakyChat(FakeChat):
+        calls: int = 0
+
+        async def aask(self, question, provider_config):
+            self.calls += 1
+            if self.calls == 1:
+                return llm.GenericResponse(original={}, text="not json")
+            return await super().aask(question, provider_config)
+
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=str)
+    client = FlakyChat(id="flaky", config=config)
+    chat = llm.GenericChat("flaky", client_chat=client, config=config)
+    res = asyncio.run(chat.aask(llm.Question(question="anything", max_retries=1)))
+    assert res == "mock response"
+    assert client.calls == 2
+
+
+def test_get_provider_config_is_memoized_per_fingerprint():
+    mock_all_prov()
+    calls = []
+
+    class CountingConfig(FakeProviderConfig):
+        @classmethod
+        def from_generic_config(cls, config):
+            calls.append(config)
+            return cls()
+
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+    from llmterface.providers.provider_spec import ProviderSpec
+
+    _PROVIDER_SPECS["mock"] = ProviderSpec(provider="mock", config_cls=CountingConfig, chat_cls=FakeChat)
+
+    first = llm.GenericChat.get_provider_config(llm.GenericConfig(provider="mock", temperature=0.0))
+    second = llm.GenericChat.get_provider_config(llm.GenericConfig(provider="mock", temperature=0.0))
+    third = llm.GenericChat.get_provider_config(llm.GenericConfig(provider="mock", temperature=0.5))
+
+    fourth = llm.GenericChat.get_provider_config(
+        llm.GenericConfig(provider="mock", temperature=0.0, retry_policy=llm.RetryPolicy(initial_delay=1.0))
+    )
+
+    assert first is second
+    assert third is not first
+    assert fourth is not first
+    assert len(calls) == 3
+
+
+def test_fingerprint_follows_config_changes():
+    config = llm.GenericConfig(provider="mock", temperature=0.0)
+    before = config.fingerprint()
+    assert config.fingerprint() is before
+
+    copied = config.model_copy(update={"temperature": 0.5})
+    assert copied.fingerprint() != before
+
+    config.temperature = 0.5
+    assert config.fingerprint() != before
+    assert config.fingerprint() == copied.fingerprint()
+
+
+def test_malformed_json_for_model_raises_schema_error_after_retry():
+    mock_all_prov()
+    from pydantic import BaseModel
+
+    class Entity(BaseModel):
+        name: str
+
+    class BrokenChat(FakeChat):
+        prompts: list[str] = []
+
+        def ask(self, question, provider_config):
+            self.prompts.append(question.prompt)
+            return llm.GenericResponse(original={}, text='{"name": ')
+
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=Entity)
+    client = BrokenChat(id="broken", config=config)
+    chat = llm.GenericChat("broken", client_chat=client, config=config)
+    with pytest.raises(ex.ClientError) as exc_info:
+        chat.ask(llm.Question(question="name?", max_retries=1))
+    assert isinstance(exc_info.value.__cause__, ex.SchemaError)
+    assert len(client.prompts) == 2
+    assert "strictly follows the required format" in client.prompts[1]
+
+
+class StreamingChat(FakeChat):
+    chunks: list[str] = []
+
+    def stream(self, question, provider_config):
+        for chunk in self.chunks:
+            yield llm.GenericResponse(original={}, text=chunk)
+
+
+def test_stream_yields_partial_objects_and_validated_result():
+    mock_all_prov()
+    from pydantic import BaseModel
+
+    class Weather(BaseModel):
+        temperature_c: float
+        condition: str
+
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=Weather)
+    client = StreamingChat(
+        id="stream",
+        config=config,
+        chunks=['{"temperature_c": 12.0, ', '"condition": "Sun', 'ny"}'],
+    )
+    chat = llm.GenericChat("stream", client_chat=client, config=config)
+
+    chunks = list(chat.stream(llm.Question(question="weather?"), partial=True))
+
+    assert [c.text for c in chunks[:-1]] == client.chunks
+    assert chunks[0].partial.temperature_c == 12.0
+    assert chunks[1].partial.condition == "Sun"
+    final = chunks[-1]
+    assert final.done is True
+    assert final.result == Weather(temperature_c=12.0, condition="Sunny")
+
+
+def test_stream_invalid_final_payload_raises_schema_error():
+    mock_all_prov()
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=int)
+    client = StreamingChat(id="stream", config=config, chunks=['{"response": "not', ' a number"}'])
+    chat = llm.GenericChat("stream", client_chat=client, config=config)
+
+    with pytest.raises(ex.ClientError) as exc_info:
+        list(chat.stream(llm.Question(question="number?")))
+    assert isinstance(exc_info.value.__cause__, ex.SchemaError)
+
+
+def test_handler_stream_falls_back_to_single_chunk():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+    chunks = list(handler.stream("hello", partial=True))
+    assert len(chunks) == 2
+    assert chunks[0].partial == "mock response"
+    assert chunks[-1].result == "mock response"
+
+
+def test_ask_with_metadata_returns_result_and_provider_metadata():
+    mock_all_prov()
+
+    class MeteredChat(FakeChat):
+        def ask(self, question, provider_config):
+            res = super().ask(question, provider_config)
+            return llm.GenericResponse(
+                original=res.original,
+                text=res.text,
+                metadata=llm.ResponseMetadata(prompt_tokens=7, output_tokens=3, total_time=0.1),
+            )
+
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=int)
+    chat = llm.GenericChat("m", client_chat=MeteredChat(id="m", config=config), config=config)
+
+    answer = chat.ask_with_metadata(llm.Question(question="how many?"))
+    assert answer.result == 42
+    assert answer.retries == 0
+    assert answer.metadata["prompt_tokens"] == 7
+    assert answer.metadata["output_tokens"] == 3
+
+    answer = asyncio.run(chat.aask_with_metadata(llm.Question(question="how many?")))
+    assert answer.metadata["total_time"] == 0.1
@@ -0,0 +1,40 @@
+import llmterface as llm
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+def test_history_round_trips_through_jsonl(tmp_path):
+    history = llm.ChatHistory()
+    history.add_exchange("line one\nline two", '{"response": "ok"}')
+    path = tmp_path / "chat.jsonl"
+    history.save(path)
+
+    assert len(path.read_text().splitlines()) == 2
+    assert llm.ChatHistory.load(path) == history
+    assert llm.ChatHistory.from_jsonl("") == llm.ChatHistory()
+
+
+def test_answered_questions_are_recorded():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+    chat = handler.create_chat(FakeProviderConfig.PROVIDER)
+    handler.ask("hello", chat_id=chat.id)
+
+    assert chat.history.turns == [
+        llm.ChatTurn(role="user", text="hello"),
+        llm.ChatTurn(role="model", text='{"response": "mock response"}'),
+    ]
+
+
+def test_restore_loads_history_into_provider_chat(monkeypatch):
+    mock_all_prov()
+    loaded = []
+    monkeypatch.setattr(FakeChat, "load_history", lambda self, turns: loaded.extend(turns))
+    history = llm.ChatHistory()
+    history.add_exchange("q", "a")
+
+    chat = llm.GenericChat.restore(FakeProviderConfig.PROVIDER, "restored", history)
+
+    assert chat.id == "restored"
+    assert chat.history is history
+    assert loaded == history.turns
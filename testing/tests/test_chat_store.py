@@ -0,0 +1,106 @@
+import llmterface as llm
+import pytest
+from llmterface.chat_store import ChatStore, ChatStoreStats, MemoryChatStore
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+class ClosingChat(FakeChat):
+    closed: bool = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _chat(chat_id: str) -> llm.GenericChat:
+    return llm.GenericChat(chat_id, client_chat=ClosingChat(id=chat_id))
+
+
+def test_lru_eviction_closes_least_recently_used():
+    evicted = []
+    store = MemoryChatStore(max_size=2, on_evict=evicted.append)
+    a, b, c = _chat("a"), _chat("b"), _chat("c")
+    store.set(a)
+    store.set(b)
+    assert store.get("a") is a
+    store.set(c)
+
+    assert evicted == [b]
+    assert b.client.closed and not a.client.closed
+    assert "b" not in store and len(store) == 2
+    assert store.stats == ChatStoreStats(hits=1, misses=0, evictions=1)
+
+
+def test_idle_ttl_evicts_on_access(monkeypatch):
+    import llmterface.chat_store as chat_store_mod
+
+    now = [100.0]
+    monkeypatch.setattr(chat_store_mod.time, "monotonic", lambda: now[0])
+    store = MemoryChatStore(idle_ttl=10)
+    store.set(_chat("a"))
+    store.set(_chat("b"))
+    now[0] += 5
+    store.get("b")
+    now[0] += 6
+
+    assert store.get("a") is None
+    assert store.get("b") is not None
+    assert store.stats.misses == 1 and store.stats.evictions == 1
+
+
+def test_failing_eviction_callback_still_closes_chat():
+    def broken(chat):
+        raise RuntimeError("boom")
+
+    store = MemoryChatStore(max_size=1, on_evict=broken)
+    first = _chat("a")
+    store.set(first)
+    store.set(_chat("b"))
+
+    assert first.client.closed
+
+
+def test_llmterface_uses_store_and_close_chat():
+    mock_all_prov()
+    store = MemoryChatStore(max_size=1)
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER), chats=store)
+    first = handler.create_chat(FakeProviderConfig.PROVIDER)
+    second = handler.create_chat(FakeProviderConfig.PROVIDER)
+
+    assert handler.chats is store
+    with pytest.raises(KeyError):
+        handler.ask("hello", chat_id=first.id)
+    assert handler.ask("hello", chat_id=second.id) == "mock response"
+
+    handler.close_chat(second.id)
+    assert len(store) == 0
+
+
+def test_llmterface_accepts_custom_store():
+    class DictStore(ChatStore):
+        def __init__(self):
+            self.stats = ChatStoreStats()
+            self.data = {}
+
+        def get(self, chat_id):
+            return self.data.get(chat_id)
+
+        def set(self, chat):
+            self.data[chat.id] = chat
+
+        def pop(self, chat_id):
+            return self.data.pop(chat_id, None)
+
+        def values(self):
+            return list(self.data.values())
+
+        def __len__(self):
+            return len(self.data)
+
+    mock_all_prov()
+    store = DictStore()
+    handler = llm.LLMterface(chats=store)
+    chat = handler.create_chat(FakeProviderConfig.PROVIDER)
+    assert chat.id in handler.chats
+    handler.close()
+    assert len(store) == 0
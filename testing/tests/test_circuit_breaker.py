@@ -0,0 +1,126 @@
+import typing as t
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.instrumentation import Phase, add_hook, clear_hooks
+from llmterface.instrumentation.prometheus import PrometheusExporter
+from llmterface.providers.circuit_breaker import (
+    CircuitBreaker,
+    clear_circuit_breakers,
+    get_circuit_breaker,
+    get_circuit_states,
+)
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    clear_circuit_breakers()
+    clear_hooks()
+    yield
+    clear_circuit_breakers()
+    clear_hooks()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    import llmterface.providers.circuit_breaker as circuit_breaker_mod
+
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker_mod.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_at_failure_rate_and_fails_fast(clock):
+    breaker = CircuitBreaker(llm.CircuitBreakerPolicy(min_calls=4, failure_rate=0.5, open_duration=30))
+    breaker.before_call()
+    breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state == llm.CircuitState.closed
+    _fail(breaker, 1)
+    assert breaker.state == llm.CircuitState.open
+
+    clock[0] += 10
+    with pytest.raises(ex.CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(20.0)
+    assert isinstance(exc_info.value, ex.ProviderError)
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    breaker = CircuitBreaker(llm.CircuitBreakerPolicy(min_calls=1, open_duration=5))
+    _fail(breaker, 1)
+    clock[0] += 5
+    assert breaker.state == llm.CircuitState.half_open
+
+    breaker.before_call()
+    with pytest.raises(ex.CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == llm.CircuitState.open
+
+    clock[0] += 5
+    with breaker.guard():
+        pass
+    assert breaker.state == llm.CircuitState.closed
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker(llm.CircuitBreakerPolicy(min_calls=1, open_duration=0))
+    _fail(breaker, 1)
+    with pytest.raises(KeyboardInterrupt), breaker.guard():
+        raise KeyboardInterrupt
+    assert breaker.state == llm.CircuitState.half_open
+    breaker.before_call()
+
+
+def test_generic_chat_stops_calling_provider_while_open(clock):
+    class DownChat(FakeChat):
+        calls: t.ClassVar[int] = 0
+
+        def ask(self, question, provider_config):
+            DownChat.calls += 1
+            raise RuntimeError("503 unavailable")
+
+    mock_all_prov()
+    events = []
+    add_hook(lambda event: events.append(event) if event.phase == Phase.circuit else None)
+    exporter = add_hook(PrometheusExporter())
+    policy = llm.CircuitBreakerPolicy(min_calls=2, open_duration=30)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, circuit_breaker=policy)
+    chat = llm.GenericChat("c", client_chat=DownChat(id="c", config=config), config=config)
+
+    for _ in range(2):
+        with pytest.raises(ex.ClientError):
+            chat.ask(llm.Question(question="hi", max_retries=0))
+    with pytest.raises(ex.ClientError) as exc_info:
+        chat.ask(llm.Question(question="hi", max_retries=3))
+
+    assert isinstance(exc_info.value.__cause__, ex.CircuitOpenError)
+    assert DownChat.calls == 2
+    assert [event.attributes["state"] for event in events] == ["open"]
+    assert get_circuit_states() == {(FakeProviderConfig.PROVIDER, None): llm.CircuitState.open}
+    assert 'llmterface_circuit_state{provider="mock",model_id="",state="open"} 1' in exporter.render()
+
+
+def test_schema_errors_do_not_trip_the_circuit(clock):
+    class BadJsonChat(FakeChat):
+        def ask(self, question, provider_config):
+            return llm.GenericResponse(original={}, text="not json")
+
+    mock_all_prov()
+    policy = llm.CircuitBreakerPolicy(min_calls=1)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, circuit_breaker=policy)
+    chat = llm.GenericChat("c", client_chat=BadJsonChat(id="c", config=config), config=config)
+    with pytest.raises(ex.ClientError):
+        chat.ask(llm.Question(question="hi", max_retries=0))
+    assert get_circuit_breaker(FakeProviderConfig.PROVIDER, None, policy).state == llm.CircuitState.closed
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+from llmterface.providers.client_pool import ClientPool
+
+
+class DummyClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_acquire_reuses_client_for_same_key():
+    pool = ClientPool()
+    key = ClientPool.make_key("mock", "secret")
+    first = pool.acquire(key, DummyClient)
+    pool.release(key)
+    second = pool.acquire(key, DummyClient)
+    assert first is second
+    assert len(pool) == 1
+
+
+def test_make_key_separates_credentials_and_hides_secret():
+    key_a = ClientPool.make_key("mock", "secret-a")
+    key_b = ClientPool.make_key("mock", "secret-b")
+    assert key_a != key_b
+    assert "secret-a" not in repr(key_a)
+
+
+def test_max_size_evicts_least_recently_used_idle_client():
+    pool = ClientPool(max_size=1)
+    with pool.lease("a", DummyClient) as a:
+        pass
+    with pool.lease("b", DummyClient):
+        pass
+    assert a.closed is True
+    assert "a" not in pool
+    assert "b" in pool
+
+
+def test_leased_clients_are_never_evicted():
+    pool = ClientPool(max_size=1)
+    a = pool.acquire("a", DummyClient)
+    b = pool.acquire("b", DummyClient)
+    assert not a.closed and not b.closed
+    assert len(pool) == 2
+    pool.release("a")
+    assert a.closed is True
+    assert len(pool) == 1
+
+
+def test_idle_ttl_evicts_unused_clients():
+    pool = ClientPool(idle_ttl=0.01)
+    with pool.lease("a", DummyClient) as a:
+        pass
+    time.sleep(0.02)
+    assert pool.evict_idle() == 1
+    assert a.closed is True
+
+
+def test_close_closes_all_clients_with_custom_closer():
+    closed = []
+    pool = ClientPool()
+    pool.acquire("a", DummyClient, closer=closed.append)
+    pool.acquire("b", DummyClient)
+    pool.close()
+    assert len(closed) == 1
+    assert len(pool) == 0
+
+
+def test_factory_runs_outside_the_pool_lock():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_factory():
+        started.set()
+        assert release.wait(5)
+        return DummyClient()
+
+    pool = ClientPool()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        slow = [executor.submit(pool.acquire, "slow", slow_factory) for _ in range(2)]
+        assert started.wait(5)
+        pool.acquire("fast", DummyClient)
+        release.set()
+        clients = [future.result() for future in slow]
+
+    assert clients[0] is clients[1]
+    assert len(pool) == 2
+
+
+def test_invalid_max_size_raises():
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        ClientPool(max_size=0)
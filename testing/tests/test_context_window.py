@@ -0,0 +1,106 @@
+import llmterface as llm
+import pytest
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+def _turns(*texts: str) -> list[llm.ChatTurn]:
+    return [llm.ChatTurn(role="user" if i % 2 == 0 else "model", text=text) for i, text in enumerate(texts)]
+
+
+def test_history_that_fits_is_left_alone():
+    window = llm.ContextWindow()
+    turns = _turns("a" * 40, "b" * 40)
+    assert window.fit(turns, "prompt", max_input_tokens=100) is None
+    assert window.fit(turns, "prompt") is None
+
+
+def test_oldest_exchanges_are_dropped_first():
+    window = llm.ContextWindow()
+    turns = _turns("a" * 40, "b" * 40, "c" * 40, "d" * 40)
+    # 10 tokens per turn, prompt 2 tokens and system instruction 3 tokens leave 25 for history
+    kept = window.fit(turns, "x" * 8, system_instruction="y" * 12, max_input_tokens=30)
+    assert kept == turns[2:]
+
+
+def test_window_never_starts_on_a_model_turn():
+    window = llm.ContextWindow(max_history_tokens=25)
+    turns = _turns("a" * 40, "b" * 40, "c" * 40, "d" * 40, "e" * 40)
+    assert window.fit(turns, "prompt") == turns[4:]
+
+
+def test_prompt_over_budget_raises():
+    with pytest.raises(ValueError, match="max_input_tokens"):
+        llm.ContextWindow().fit([], "x" * 400, max_input_tokens=10)
+
+
+def test_dropped_turns_are_summarized():
+    seen = []
+
+    def summarize(turns):
+        seen.extend(turns)
+        return "they talked"
+
+    window = llm.ContextWindow(max_history_tokens=60, summarizer=summarize)
+    turns = _turns("a" * 80, "b" * 80, "c" * 80, "d" * 80)
+    kept = window.fit(turns, "prompt")
+
+    assert seen == turns[:2]
+    assert kept[0].text == "Summary of the earlier conversation:\nthey talked"
+    assert kept[1].role == "model"
+    assert kept[2:] == turns[2:]
+
+
+def test_chat_trims_history_and_reloads_provider(monkeypatch):
+    mock_all_prov()
+    loaded = []
+    monkeypatch.setattr(FakeChat, "load_history", lambda self, turns: loaded.append(list(turns)))
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER, context_window=llm.ContextWindow(max_history_tokens=20)
+    )
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+    for i in range(3):
+        chat.ask(llm.Question(question=f"question {i}"))
+
+    assert len(loaded) == 1
+    assert loaded[0][0].text == "question 1"
+    assert chat.history.turns[0].text == "question 0"
+    assert len(chat.history) == 6
+
+
+def test_window_keeps_sliding_from_the_last_trim(monkeypatch):
+    mock_all_prov()
+    loaded = []
+    monkeypatch.setattr(FakeChat, "load_history", lambda self, turns: loaded.append(list(turns)))
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER, context_window=llm.ContextWindow(max_history_tokens=20)
+    )
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+    for i in range(5):
+        chat.ask(llm.Question(question=f"question {i}"))
+
+    assert [turns[0].text for turns in loaded] == ["question 1", "question 2", "question 3"]
+    assert len(chat.history) == 10
+
+
+def test_context_window_is_opt_in(monkeypatch):
+    mock_all_prov()
+    loaded = []
+    monkeypatch.setattr(FakeChat, "load_history", lambda self, turns: loaded.append(list(turns)))
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, max_input_tokens=10)
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+    for _ in range(3):
+        chat.ask(llm.Question(question="x" * 400))
+
+    assert config.context_window is None
+    assert loaded == []
+    assert len(chat.history) == 6
+
+
+def test_window_is_skipped_without_history():
+    mock_all_prov()
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER, max_input_tokens=10, context_window=llm.ContextWindow()
+    )
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+    assert chat.ask(llm.Question(question="x" * 400)) == "mock response"
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.deadline import deadline_scope, remaining_time
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+class SlowChat(FakeChat):
+    async def aask(self, question, provider_config):
+        await asyncio.sleep(1)
+        return self.ask(question, provider_config)
+
+
+def _chat(chat_cls=FakeChat, **config) -> llm.GenericChat:
+    mock_all_prov()
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, retry_policy=None, **config)
+    return llm.GenericChat("c", client_chat=chat_cls(id="c", config=config), config=config)
+
+
+def test_scopes_nest_to_the_earliest_deadline():
+    assert remaining_time() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert 9 < remaining_time() <= 10
+        with deadline_scope(1):
+            assert remaining_time() <= 1
+        assert remaining_time() > 9
+    assert remaining_time() is None
+
+
+def test_provider_sees_the_attempt_budget():
+    seen = []
+
+    class RecordingChat(FakeChat):
+        def ask(self, question, provider_config):
+            seen.append(remaining_time())
+            return super().ask(question, provider_config)
+
+    chat = _chat(RecordingChat, deadline=30)
+    chat.ask(llm.Question(question="hi", timeout=2))
+    chat.ask(llm.Question(question="hi"))
+    assert 1 < seen[0] <= 2
+    assert 29 < seen[1] <= 30
+
+
+def test_async_attempts_time_out_and_retry():
+    chat = _chat(SlowChat, timeout=0.05)
+    started = time.perf_counter()
+    with pytest.raises(ex.ClientError) as exc_info:
+        asyncio.run(chat.aask(llm.Question(question="hi", max_retries=2)))
+    assert time.perf_counter() - started < 0.5
+    assert isinstance(exc_info.value.__cause__, ex.TimeoutError)
+
+
+def test_deadline_spans_retries():
+    chat = _chat(SlowChat, timeout=0.5)
+    started = time.perf_counter()
+    with pytest.raises(ex.ClientError) as exc_info:
+        asyncio.run(chat.aask(llm.Question(question="hi", max_retries=5, deadline=0.1)))
+    assert time.perf_counter() - started < 0.4
+    assert isinstance(exc_info.value.__cause__, ex.TimeoutError)
+
+
+def test_backoff_longer_than_the_deadline_is_not_waited_out(monkeypatch):
+    import llmterface.models.generic_chat as generic_chat_mod
+
+    class DownChat(FakeChat):
+        def ask(self, question, provider_config):
+            raise TimeoutError("read timed out")
+
+    sleeps = []
+    monkeypatch.setattr(generic_chat_mod.time, "sleep", sleeps.append)
+    policy = llm.RetryPolicy(initial_delay=5, jitter=0)
+    chat = _chat(DownChat, deadline=1)
+    question = llm.Question(
+        question="hi", max_retries=3, config=chat.config.model_copy(update={"retry_policy": policy})
+    )
+    with pytest.raises(ex.ClientError) as exc_info:
+        chat.ask(question)
+    assert sleeps == []
+    assert isinstance(exc_info.value.__cause__, ex.TimeoutError)
+    assert "Deadline leaves" in str(exc_info.value.__cause__)
+
+
+def test_rate_limit_wait_past_the_deadline_fails_fast():
+    from llmterface.providers.rate_limiter import clear_rate_limiters
+
+    clear_rate_limiters()
+    chat = _chat(rate_limit=llm.RateLimit(requests_per_minute=1), deadline=0.2)
+    chat.ask(llm.Question(question="hi"))
+    started = time.perf_counter()
+    with pytest.raises(ex.ClientError) as exc_info:
+        chat.ask(llm.Question(question="hi"))
+    clear_rate_limiters()
+    assert time.perf_counter() - started < 0.1
+    assert isinstance(exc_info.value.__cause__, ex.TimeoutError)
+
+
+def test_stream_is_bounded_by_the_deadline():
+    seen = []
+
+    class SlowStreamChat(FakeChat):
+        def stream(self, question, provider_config):
+            for text in ('{"response": ', '"slow"}'):
+                seen.append(remaining_time())
+                time.sleep(0.1)
+                yield llm.GenericResponse(original=None, text=text)
+
+    chat = _chat(SlowStreamChat, deadline=0.15)
+    chunks = chat.stream(llm.Question(question="hi"))
+    next(chunks)
+    assert remaining_time() is None
+    with pytest.raises(ex.ClientError) as exc_info:
+        list(chunks)
+    assert isinstance(exc_info.value.__cause__, ex.TimeoutError)
+    assert 0 < seen[1] < seen[0] <= 0.15
+
+
+def test_hedged_router_threads_inherit_the_deadline():
+    seen = []
+    router = llm.Router(["slow", "fast"], hedge_after=0.01)
+
+    def ask(question):
+        seen.append(remaining_time())
+        if question.config.provider == "slow":
+            time.sleep(0.05)
+        return question.config.provider
+
+    with deadline_scope(5):
+        router.ask(ask, llm.Question(question="hi", config=llm.GenericConfig(provider="slow")))
+    router.close()
+    assert len(seen) == 2 and all(left is not None and left <= 5 for left in seen)
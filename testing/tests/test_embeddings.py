@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import typing as t
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.providers.provider_spec import ProviderSpec
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+np = pytest.importorskip("numpy")
+
+from llmterface.embeddings import EmbeddingCache, dedupe  # noqa: E402
+
+
+class EmbeddingChat(FakeChat):
+    batches: t.ClassVar[list[list[str]]] = []
+    threads: t.ClassVar[set[int]] = set()
+
+    def embed(self, texts, provider_config):
+        EmbeddingChat.batches.append(list(texts))
+        EmbeddingChat.threads.add(threading.get_ident())
+        return [[float(len(text)), float(text.count("a")), 1.0] for text in texts]
+
+
+class SmallBatchConfig(FakeProviderConfig):
+    EMBED_BATCH_SIZE: t.ClassVar[int] = 2
+
+    @classmethod
+    def from_generic_config(cls, config):
+        return cls()
+
+    def get_embedding_model_id(self) -> str | None:
+        return "fake-embedding"
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    mock_all_prov()
+    EmbeddingChat.batches = []
+    EmbeddingChat.threads = set()
+    monkeypatch.setitem(
+        _PROVIDER_SPECS, "mock", ProviderSpec(provider="mock", config_cls=SmallBatchConfig, chat_cls=EmbeddingChat)
+    )
+    return llm.LLMterface(config=llm.GenericConfig(provider="mock"))
+
+
+def test_dedupe_keeps_first_seen_order():
+    unique, inverse = dedupe(["b", "a", "b", "c", "a"])
+    assert unique == ["b", "a", "c"]
+    assert inverse.tolist() == [0, 1, 0, 2, 1]
+
+
+def test_embed_returns_contiguous_float32_rows_in_input_order(handler):
+    texts = ["a", "banana", "a", "cab", "abba", "dd"]
+    matrix = handler.embed(texts)
+
+    assert matrix.dtype == np.float32 and matrix.flags.c_contiguous
+    assert matrix.shape == (6, 3)
+    assert matrix[:, 0].tolist() == [1.0, 6.0, 1.0, 3.0, 4.0, 2.0]
+    assert np.array_equal(matrix[0], matrix[2])
+    assert sorted(len(batch) for batch in EmbeddingChat.batches) == [1, 2, 2]
+    assert sum(EmbeddingChat.batches, []).count("a") == 1
+
+
+def test_batches_run_concurrently(handler):
+    barrier = threading.Barrier(2, timeout=2)
+
+    class WaitingChat(EmbeddingChat):
+        def embed(self, texts, provider_config):
+            barrier.wait()
+            return super().embed(texts, provider_config)
+
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    _PROVIDER_SPECS["mock"] = ProviderSpec(provider="mock", config_cls=SmallBatchConfig, chat_cls=WaitingChat)
+    assert handler.embed(["w", "x", "y", "z"], concurrency=2).shape == (4, 3)
+    assert len(EmbeddingChat.threads) == 2
+
+
+def test_aembed_matches_embed(handler):
+    texts = ["one", "two", "three", "two"]
+    assert np.array_equal(asyncio.run(handler.aembed(texts)), handler.embed(texts))
+
+
+def test_embedding_cache_skips_known_texts(handler, tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite")
+    handler.embedding_cache = cache
+    first = handler.embed(["alpha", "beta"])
+    EmbeddingChat.batches = []
+    second = handler.embed(["beta", "gamma", "alpha"])
+
+    assert EmbeddingChat.batches == [["gamma"]]
+    assert np.array_equal(second[[0, 2]], first[[1, 0]])
+    assert len(cache) == 3
+    reopened = EmbeddingCache(tmp_path / "embeddings.sqlite")
+    assert set(reopened.get_many("mock:fake-embedding", ["alpha", "zeta"])) == {"alpha"}
+    assert reopened.get_many("mock:other-model", ["alpha"]) == {}
+    handler.close()
+    reopened.close()
+
+
+def test_empty_input_and_provider_errors(handler):
+    assert handler.embed([]).shape == (0, 0)
+
+    class ShortChat(EmbeddingChat):
+        def embed(self, texts, provider_config):
+            return super().embed(texts, provider_config)[:-1]
+
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    _PROVIDER_SPECS["mock"] = ProviderSpec(provider="mock", config_cls=SmallBatchConfig, chat_cls=ShortChat)
+    with pytest.raises(ex.ProviderError):
+        handler.embed(["a", "b"])
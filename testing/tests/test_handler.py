@@ -1,4 +1,7 @@
+import asyncio
+
 import llmterface as llm
+import llmterface.exceptions as ex
 import pytest
 
 from testing.helpers.fakes import FakeProviderConfig, mock_all_prov
@@ -68,3 +71,66 @@ def test_response_model_types(response_model):
     handler = llm.LLMterface(config=config)
     res = handler.ask("return a value of the correct type")
     assert isinstance(res, response_model), f"Response should be of type {response_model}"
+
+
+def test_aask_with_temp_chat():
+    mock_all_prov()
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER,
+        api_key="test_api_key",
+        response_model=str,
+    )
+    handler = llm.LLMterface(config=config)
+    response = asyncio.run(handler.aask("What is the airspeed velocity of an unladen swallow?"))
+    assert "African or European swallow" in response, "Response text should contain expected answer"
+
+
+def test_aask_with_chat_id():
+    mock_all_prov()
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER,
+        api_key="test_api_key",
+        response_model=int,
+    )
+    handler = llm.LLMterface(config=config)
+    chat = handler.create_chat(provider=FakeProviderConfig.PROVIDER, config=config)
+    response = asyncio.run(handler.aask("return a value of the correct type", chat_id=chat.id))
+    assert isinstance(response, int), "Response should be an int"
+
+
+def test_ask_many_keeps_order_and_collects_errors():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=int))
+    broken = llm.Question(question="no provider", config=llm.GenericConfig(provider=None))
+    questions = ["first", llm.Question(question="second", config=llm.GenericConfig(provider="mock")), broken, "last"]
+
+    results = handler.ask_many(questions, concurrency=2)
+
+    assert results[0] == 42
+    assert results[1] == "mock response"
+    assert isinstance(results[2], ex.ClientError)
+    assert results[3] == 42
+
+
+def test_iter_ask_many_yields_every_index():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+    seen = dict(handler.iter_ask_many([f"q{i}" for i in range(10)], concurrency=4))
+    assert sorted(seen) == list(range(10))
+    assert all(res == "mock response" for res in seen.values())
+
+
+def test_aask_many_keeps_order_and_collects_errors():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=bool))
+    broken = llm.Question(question="no provider", config=llm.GenericConfig(provider=None))
+    results = asyncio.run(handler.aask_many(["a", broken, "b"], concurrency=2))
+    assert results[0] is True
+    assert isinstance(results[1], ex.ClientError)
+    assert results[2] is True
+
+
+def test_ask_many_rejects_invalid_concurrency():
+    handler = llm.LLMterface()
+    with pytest.raises(ValueError, match="concurrency must be at least 1"):
+        handler.ask_many(["a"], concurrency=0)
@@ -0,0 +1,43 @@
+import pytest
+from llmterface.helpers import LRUCache, make_hashable
+from pydantic import BaseModel
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_get_or_set_builds_once():
+    cache = LRUCache()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("k", factory) == "value"
+    assert cache.get_or_set("k", factory) == "value"
+    assert len(calls) == 1
+
+
+def test_lru_cache_invalid_size_raises():
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        LRUCache(max_size=0)
+
+
+def test_make_hashable_handles_nested_values():
+    class Model(BaseModel):
+        x: int
+
+    value = {"b": [1, {"c": 2}], "a": {3, 4}, "m": Model(x=1), "t": str}
+    hashed = make_hashable(value)
+    hash(hashed)
+    assert hashed == make_hashable(dict(reversed(value.items())))
@@ -0,0 +1,164 @@
+import llmterface as llm
+import pytest
+from llmterface.instrumentation import Event, Phase, add_hook, clear_hooks, emit, span
+from llmterface.instrumentation.prometheus import PrometheusExporter
+from pydantic import BaseModel
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+@pytest.fixture(autouse=True)
+def fresh_hooks():
+    clear_hooks()
+    yield
+    clear_hooks()
+
+
+def _chat(config: llm.GenericConfig) -> llm.GenericChat:
+    return llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+
+
+def test_ask_emits_one_event_per_phase():
+    mock_all_prov()
+    events: list[Event] = []
+    add_hook(events.append)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER)
+
+    _chat(config).ask(llm.Question(question="hello"))
+
+    assert [e.phase for e in events] == [Phase.provider_config, Phase.request, Phase.parse, Phase.validate]
+    assert all(e.chat_id == "c" and e.provider == "mock" for e in events)
+    assert all(e.duration >= 0 and e.error is None for e in events)
+
+
+def test_model_validation_is_timed_with_parsing():
+    mock_all_prov()
+    events: list[Event] = []
+    add_hook(events.append)
+
+    class Weather(BaseModel):
+        temperature_c: float
+        condition: str
+
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=Weather)
+    _chat(config).ask(llm.Question(question="What is the current weather in Paris?"))
+
+    validate = [e for e in events if e.phase == Phase.validate]
+    assert len(validate) == 1
+    assert validate[0].duration == 0.0
+
+
+def test_validation_error_is_reported_on_validate_phase(monkeypatch):
+    mock_all_prov()
+    events: list[Event] = []
+    add_hook(events.append)
+    monkeypatch.setattr(
+        FakeChat,
+        "ask",
+        lambda self, question, provider_config: llm.GenericResponse(original=None, text='{"response": "nan?"}'),
+    )
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, response_model=int)
+
+    with pytest.raises(llm.exceptions.ClientError):
+        _chat(config).ask(llm.Question(question="hello", max_retries=0))
+
+    parse = [e for e in events if e.phase == Phase.parse]
+    validate = [e for e in events if e.phase == Phase.validate]
+    assert parse[0].error is None
+    assert validate[0].error is not None
+
+
+def test_retry_event_carries_error_and_attempt(monkeypatch):
+    mock_all_prov()
+    events: list[Event] = []
+    add_hook(events.append)
+    calls = {"n": 0}
+    original_ask = FakeChat.ask
+
+    def flaky_ask(self, question, provider_config):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("boom")
+        return original_ask(self, question, provider_config)
+
+    monkeypatch.setattr(FakeChat, "ask", flaky_ask)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, retry_policy=None)
+
+    _chat(config).ask(llm.Question(question="hello", max_retries=1))
+
+    retries = [e for e in events if e.phase == Phase.retry]
+    assert len(retries) == 1
+    assert retries[0].attempt == 0
+    assert isinstance(retries[0].error, llm.exceptions.ProviderError)
+    failed = [e for e in events if e.phase == Phase.request and e.error is not None]
+    assert len(failed) == 1
+
+
+def test_failing_hook_is_logged_not_raised():
+    def broken(event: Event) -> None:
+        raise RuntimeError("hook failure")
+
+    seen: list[Event] = []
+    add_hook(broken)
+    add_hook(seen.append)
+    emit(Event(phase=Phase.request))
+
+    assert len(seen) == 1
+
+
+def test_span_fills_extra_fields():
+    events: list[Event] = []
+    add_hook(events.append)
+    with span(Phase.request, provider="p") as extra:
+        extra["prompt_tokens"] = 7
+
+    assert events[0].provider == "p"
+    assert events[0].prompt_tokens == 7
+
+
+def test_span_without_hooks_emits_nothing():
+    with span(Phase.request) as extra:
+        extra["prompt_tokens"] = 1
+
+
+def test_prometheus_exporter_renders_metrics():
+    exporter = PrometheusExporter(buckets=(0.1, 1.0))
+    exporter(Event(phase=Phase.request, duration=0.05, provider="gemini", prompt_tokens=10, output_tokens=3))
+    exporter(Event(phase=Phase.request, duration=0.5, provider="gemini", error=RuntimeError()))
+
+    text = exporter.render()
+
+    assert 'llmterface_events_total{phase="request",provider="gemini",outcome="ok"} 1' in text
+    assert 'llmterface_events_total{phase="request",provider="gemini",outcome="error"} 1' in text
+    assert 'llmterface_phase_duration_seconds_bucket{phase="request",provider="gemini",le="0.1"} 1' in text
+    assert 'llmterface_phase_duration_seconds_bucket{phase="request",provider="gemini",le="+Inf"} 2' in text
+    assert 'llmterface_phase_duration_seconds_count{phase="request",provider="gemini"} 2' in text
+    assert 'llmterface_tokens_total{provider="gemini",kind="prompt"} 10' in text
+    assert 'llmterface_tokens_total{provider="gemini",kind="output"} 3' in text
+
+
+def test_otel_exporter_records_spans():
+    pytest.importorskip("opentelemetry")
+    from llmterface.instrumentation.otel import OpenTelemetryExporter
+
+    started = []
+
+    class _Span:
+        def record_exception(self, e):
+            pass
+
+        def set_status(self, status):
+            pass
+
+        def end(self, end_time=None):
+            pass
+
+    class _Tracer:
+        def start_span(self, name, start_time=None, attributes=None):
+            started.append((name, attributes))
+            return _Span()
+
+    exporter = OpenTelemetryExporter(tracer=_Tracer())
+    exporter(Event(phase=Phase.request, duration=0.1, provider="gemini", attempt=0))
+
+    assert started == [("llmterface.request", {"llmterface.provider": "gemini", "llmterface.attempt": 0})]
@@ -77,3 +77,48 @@ def test_provider_chat_instantiation(provider_spec: ProviderSpec):
         assert callable(getattr(chat, "close", None)), "'close' method of ProviderChat instance is not callable"
         assert hasattr(chat, "id"), "ProviderChat instance does not have an 'id' attribute"
         assert hasattr(chat, "config"), "ProviderChat instance does not have a 'config' attribute"
+
+
+def test_discovery_does_not_import_provider_plugins():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from llmterface.providers.discovery import available_providers, get_provider_chat\n"
+        "assert 'gemini' in available_providers()\n"
+        "assert 'llmterface_gemini.plugin' not in sys.modules and 'google.genai' not in sys.modules\n"
+        "get_provider_chat('gemini')\n"
+        "assert 'google.genai' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_entry_point_is_loaded_on_first_request(monkeypatch):
+    from llmterface.providers import discovery
+
+    spec = next(iter(_PROVIDER_SPECS.values()))
+    loads = []
+
+    class LazyEntryPoint:
+        name = "lazy"
+
+        def load(self):
+            loads.append(self.name)
+            return ProviderSpec(provider="lazy", config_cls=spec.config_cls, chat_cls=spec.chat_cls)
+
+    monkeypatch.setitem(discovery._PROVIDER_ENTRY_POINTS, "lazy", LazyEntryPoint())
+
+    assert "lazy" in discovery.available_providers()
+    assert loads == []
+    assert get_provider_config("lazy") is spec.config_cls
+    assert discovery.get_provider_chat("lazy") is spec.chat_cls
+    assert loads == ["lazy"]
+    assert "lazy" not in discovery._PROVIDER_ENTRY_POINTS
+    _PROVIDER_SPECS.pop("lazy")
+
+
+@pytest.mark.parametrize("provider", [None, 1, ["gemini"]])
+def test_provider_must_be_a_string(provider):
+    with pytest.raises(TypeError, match="provider must be a str"):
+        get_provider_config(provider)
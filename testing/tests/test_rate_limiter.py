@@ -0,0 +1,125 @@
+import asyncio
+
+import llmterface as llm
+import pytest
+from llmterface.providers.rate_limiter import RateLimiter, TokenBucket, clear_rate_limiters, get_rate_limiter
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    clear_rate_limiters()
+    yield
+    clear_rate_limiters()
+
+
+def test_token_bucket_goes_into_debt_and_reports_wait():
+    bucket = TokenBucket(capacity=2, refill_per_second=1.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_rate_limiter_uses_longest_wait_of_both_budgets():
+    limiter = RateLimiter(llm.RateLimit(requests_per_minute=60, tokens_per_minute=600))
+    assert limiter.reserve(tokens=600) == 0.0
+    assert limiter.reserve(tokens=300) == pytest.approx(30.0, abs=0.1)
+
+
+def test_adjust_tokens_refunds_overestimates():
+    limiter = RateLimiter(llm.RateLimit(tokens_per_minute=100))
+    limiter.reserve(tokens=100)
+    limiter.adjust_tokens(reserved=100, actual=40)
+    assert limiter.reserve(tokens=60) == 0.0
+
+
+def test_limiters_are_shared_per_provider_model_and_limit():
+    limit = llm.RateLimit(requests_per_minute=10)
+    assert get_rate_limiter("p", "m", limit) is get_rate_limiter("p", "m", llm.RateLimit(requests_per_minute=10))
+    assert get_rate_limiter("p", "other", limit) is not get_rate_limiter("p", "m", limit)
+
+
+def test_generic_chat_waits_for_capacity(monkeypatch):
+    import llmterface.providers.rate_limiter as rate_limiter_mod
+
+    mock_all_prov()
+    sleeps = []
+    monkeypatch.setattr(rate_limiter_mod.time, "sleep", sleeps.append)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, rate_limit=llm.RateLimit(requests_per_minute=1))
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+
+    chat.ask(llm.Question(question="one"))
+    chat.ask(llm.Question(question="two"))
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(60.0, abs=0.5)
+
+
+def test_provider_override_limit_takes_precedence(monkeypatch):
+    import llmterface.providers.rate_limiter as rate_limiter_mod
+
+    mock_all_prov()
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(rate_limiter_mod.asyncio, "sleep", fake_sleep)
+    override = FakeProviderConfig(rate_limit=llm.RateLimit(requests_per_minute=1))
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER,
+        rate_limit=llm.RateLimit(requests_per_minute=1000),
+        provider_overrides={FakeProviderConfig.PROVIDER: override},
+    )
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+
+    async def ask_twice():
+        await chat.aask(llm.Question(question="one"))
+        await chat.aask(llm.Question(question="two"))
+
+    asyncio.run(ask_twice())
+    assert len(waits) == 1
+    assert waits[0] == pytest.approx(60.0, abs=0.5)
+
+
+def test_requests_rejected_by_an_open_circuit_keep_their_budget():
+    import llmterface.exceptions as ex
+    from llmterface.providers.circuit_breaker import clear_circuit_breakers, get_circuit_breaker
+
+    mock_all_prov()
+    clear_circuit_breakers()
+    limit, policy = llm.RateLimit(requests_per_minute=1), llm.CircuitBreakerPolicy(min_calls=1)
+    breaker = get_circuit_breaker(FakeProviderConfig.PROVIDER, None, policy)
+    breaker.before_call()
+    breaker.record_failure()
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, rate_limit=limit, circuit_breaker=policy)
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+
+    try:
+        for _ in range(3):
+            with pytest.raises(ex.ClientError) as exc_info:
+                chat.ask(llm.Question(question="hi"))
+            assert isinstance(exc_info.value.__cause__, ex.CircuitOpenError)
+        with pytest.raises(ex.ClientError):
+            list(chat.stream(llm.Question(question="hi")))
+    finally:
+        clear_circuit_breakers()
+
+    assert get_rate_limiter(FakeProviderConfig.PROVIDER, None, limit).reserve() == 0.0
+
+
+def test_stream_reconciles_reserved_tokens(monkeypatch):
+    mock_all_prov()
+
+    def stream(self, question, provider_config):
+        yield llm.GenericResponse(original=None, text='{"response": "hi"}', metadata={"prompt_tokens": 1})
+
+    monkeypatch.setattr(FakeChat, "stream", stream)
+    limit = llm.RateLimit(tokens_per_minute=100)
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER, rate_limit=limit)
+    chat = llm.GenericChat("c", client_chat=FakeChat(id="c", config=config), config=config)
+
+    assert list(chat.stream(llm.Question(question="x" * 360)))[-1].result == "hi"
+    assert get_rate_limiter(FakeProviderConfig.PROVIDER, None, limit).reserve(tokens=95) == 0.0
@@ -106,3 +106,37 @@ def test_readme_strucutured_response():
     assert res.condition is not None
     assert isinstance(res.temperature_c, float)
     assert isinstance(res.condition, str)
+
+
+def test_readme_production_features(tmp_path):
+    mock_all_prov()
+    from llmterface.chat_store import MemoryChatStore
+    from llmterface.providers.circuit_breaker import clear_circuit_breakers
+    from llmterface.providers.rate_limiter import clear_rate_limiters
+    from llmterface.response_cache import SQLiteResponseCache
+
+    config = llm.GenericConfig(
+        provider="gemini",
+        api_key="<YOUR GEMINI API KEY>",
+        timeout=10.0,
+        deadline=30.0,
+        rate_limit=llm.RateLimit(requests_per_minute=60, tokens_per_minute=100_000),
+        circuit_breaker=llm.CircuitBreakerPolicy(failure_rate=0.5, open_duration=30.0),
+    )
+    router = llm.Router(["gemini", llm.Route(provider="openai", weight=2)], strategy="weighted", hedge_after=5.0)
+    handler = llm.LLMterface(
+        config=config,
+        router=router,
+        response_cache=SQLiteResponseCache(tmp_path / "responses.db", ttl=3600),
+        chats=MemoryChatStore(max_size=1000, idle_ttl=3600),
+    )
+
+    try:
+        assert handler.ask(llm.Question(question="Quick one?", timeout=2.0)) == "mock response"
+        chunks = list(handler.stream("Tell me a story."))
+        assert chunks[-1].done and chunks[-1].result == "mock response"
+        assert handler.ask_many(["What is 2 + 2?", "What is 3 + 3?"], concurrency=4) == ["mock response"] * 2
+    finally:
+        handler.close()
+        clear_rate_limiters()
+        clear_circuit_breakers()
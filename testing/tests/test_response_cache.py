@@ -0,0 +1,95 @@
+import asyncio
+
+import llmterface as llm
+from llmterface.response_cache import MemoryResponseCache, SQLiteResponseCache, make_cache_key
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+class CountingChat(FakeChat):
+    calls: int = 0
+
+    def ask(self, question, provider_config):
+        type(self).calls += 1
+        return super().ask(question, provider_config)
+
+
+def use_counting_chat():
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+    from llmterface.providers.provider_spec import ProviderSpec
+
+    mock_all_prov()
+    CountingChat.calls = 0
+    _PROVIDER_SPECS["mock"] = ProviderSpec(provider="mock", config_cls=FakeProviderConfig, chat_cls=CountingChat)
+
+
+def test_temp_chat_asks_hit_the_cache():
+    use_counting_chat()
+    handler = llm.LLMterface(
+        config=llm.GenericConfig(provider="mock", temperature=0.0, response_model=int),
+        response_cache=MemoryResponseCache(),
+    )
+    assert handler.ask("same question") == 42
+    assert handler.ask("same question") == 42
+    assert asyncio.run(handler.aask("same question")) == 42
+    assert CountingChat.calls == 1
+    handler.ask("another question")
+    assert CountingChat.calls == 2
+
+
+def test_persistent_chats_bypass_the_cache():
+    use_counting_chat()
+    config = llm.GenericConfig(provider="mock")
+    handler = llm.LLMterface(config=config, response_cache=MemoryResponseCache())
+    chat = handler.create_chat("mock", config=config)
+    handler.ask("same question", chat_id=chat.id)
+    handler.ask("same question", chat_id=chat.id)
+    assert CountingChat.calls == 2
+
+
+def test_cache_key_depends_on_schema_temperature_and_instruction():
+    mock_all_prov()
+    provider_config = FakeProviderConfig()
+
+    def key(**overrides):
+        config = llm.GenericConfig(provider="mock", **overrides)
+        return make_cache_key("mock", llm.Question(question="q", config=config), provider_config)
+
+    assert key() == key()
+    assert key() != key(response_model=int)
+    assert key() != key(temperature=0.9)
+    assert key() != key(system_instruction="be terse")
+
+
+def test_sqlite_cache_persists_between_instances(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = SQLiteResponseCache(path)
+    cache.set("k", '{"response": "cached"}')
+    cache.close()
+
+    reopened = SQLiteResponseCache(path)
+    assert reopened.get("k") == '{"response": "cached"}'
+    assert reopened.get("missing") is None
+    reopened.close()
+
+    expired = SQLiteResponseCache(path, ttl=-1)
+    assert expired.get("k") is None
+    expired.close()
+
+
+def test_invalid_cached_text_falls_back_to_provider():
+    use_counting_chat()
+    cache = MemoryResponseCache()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider="mock", response_model=int), response_cache=cache)
+    handler.ask("q")
+    for key in list(cache._cache._data):
+        cache.set(key, "corrupt")
+    assert handler.ask("q") == 42
+    assert CountingChat.calls == 2
+
+
+def test_cache_hits_are_flagged_in_metadata():
+    use_counting_chat()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider="mock"), response_cache=MemoryResponseCache())
+    assert "from_cache" not in handler.ask_with_metadata("q").metadata
+    assert handler.ask_with_metadata("q").metadata["from_cache"] is True
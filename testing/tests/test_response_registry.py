@@ -0,0 +1,66 @@
+import llmterface as llm
+import pytest
+from llmterface.models.response_registry import get_response_spec
+from llmterface.models.simple_answers import SimpleInteger
+from pydantic import BaseModel, ValidationError
+
+
+class Entity(BaseModel):
+    name: str
+    score: float
+
+
+class Entities(BaseModel):
+    items: list[Entity]
+
+
+def test_schema_is_compiled_once_per_response_model():
+    calls = []
+
+    class Entity(BaseModel):
+        name: str
+
+        @classmethod
+        def model_json_schema(cls, *args, **kwargs):
+            calls.append(cls)
+            return super().model_json_schema(*args, **kwargs)
+
+    config = llm.GenericConfig(response_model=Entity)
+    assert config.get_response_schema() is config.get_response_schema()
+    assert get_response_spec(Entity) is get_response_spec(Entity)
+    assert len(calls) == 1
+
+
+def test_simple_types_use_wrapper():
+    spec = get_response_spec(int)
+    assert spec.wrapper is SimpleInteger
+    assert spec.json_schema == SimpleInteger.model_json_schema()
+    assert llm.GenericConfig(response_model=int).validate_response({"response": 7}) == 7
+
+
+def test_pydantic_models_validate_directly():
+    class Entity(BaseModel):
+        name: str
+
+    config = llm.GenericConfig(response_model=Entity)
+    assert config.validate_response({"name": "x"}) == Entity(name="x")
+    with pytest.raises(ValidationError):
+        config.validate_response({"nope": 1})
+
+
+def test_unsupported_type_raises():
+    with pytest.raises(NotImplementedError, match="Response handling not implemented"):
+        get_response_spec(list)
+
+
+def test_validate_json_single_pass_for_models():
+    config = llm.GenericConfig(response_model=Entities)
+    payload = Entities(items=[Entity(name=f"e{i}", score=i) for i in range(100)])
+    assert config.validate_response_json(payload.model_dump_json()) == payload
+
+
+def test_validate_json_simple_types_and_malformed_json():
+    assert llm.GenericConfig(response_model=float).validate_response_json('{"response": 1.5}') == 1.5
+    for response_model in (str, Entities):
+        with pytest.raises(ValueError):
+            llm.GenericConfig(response_model=response_model).validate_response_json("{not json")
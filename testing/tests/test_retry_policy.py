@@ -0,0 +1,107 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.models.retry_policy import get_retry_after
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+def provider_error(original: Exception | None = None) -> ex.ProviderError:
+    return ex.ProviderError("boom", original_exception=original or RuntimeError("boom"))
+
+
+def test_delay_grows_exponentially_and_is_capped():
+    policy = llm.RetryPolicy(initial_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0.0)
+    assert [policy.get_delay(n, provider_error()) for n in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_jitter_stays_within_bounds():
+    policy = llm.RetryPolicy(initial_delay=1.0, jitter=0.5)
+    for _ in range(50):
+        assert 0.5 <= policy.get_delay(0, provider_error()) <= 1.0
+
+
+def test_schema_errors_retry_immediately_by_default():
+    policy = llm.RetryPolicy(initial_delay=1.0, jitter=0.0)
+    assert policy.get_delay(3, ex.SchemaError("bad")) == 0.0
+    assert llm.RetryPolicy(initial_delay=1.0, jitter=0.0, backoff_schema_errors=True).get_delay(
+        0, ex.SchemaError("bad")
+    ) == pytest.approx(1.0)
+
+
+def test_retry_after_hints_are_honored():
+    class Response:
+        headers = {"Retry-After": "7"}
+
+    class HttpError(Exception):
+        response = Response()
+
+    class DetailsError(Exception):
+        details = {"error": {"details": [{"@type": "RetryInfo", "retryDelay": "3.5s"}]}}
+
+    assert get_retry_after(provider_error(HttpError())) == 7.0
+    assert get_retry_after(provider_error(DetailsError())) == 3.5
+    assert get_retry_after(provider_error()) is None
+
+    when = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+
+    class DateError(Exception):
+        headers = {"retry-after": when}
+
+    assert 25 <= get_retry_after(provider_error(DateError())) <= 30
+
+    policy = llm.RetryPolicy(initial_delay=0.1, jitter=0.0)
+    assert policy.get_delay(0, provider_error(HttpError())) == 7.0
+
+
+def test_max_elapsed_budget():
+    policy = llm.RetryPolicy(max_elapsed=10.0)
+    assert policy.allows(elapsed=4.0, delay=5.0)
+    assert not policy.allows(elapsed=6.0, delay=5.0)
+    assert llm.RetryPolicy(max_elapsed=None).allows(elapsed=1e9, delay=1e9)
+
+
+class FailingOnceChat(FakeChat):
+    calls: int = 0
+
+    def ask(self, question, provider_config):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("rate limited")
+        return super().ask(question, provider_config)
+
+
+def test_generic_chat_sleeps_between_provider_retries(monkeypatch):
+    import llmterface.models.generic_chat as generic_chat_mod
+
+    mock_all_prov()
+    sleeps = []
+    monkeypatch.setattr(generic_chat_mod.time, "sleep", sleeps.append)
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER,
+        retry_policy=llm.RetryPolicy(initial_delay=2.0, jitter=0.0),
+    )
+    client = FailingOnceChat(id="c", config=config)
+    chat = llm.GenericChat("c", client_chat=client, config=config)
+
+    assert chat.ask(llm.Question(question="hi")) == "mock response"
+    assert sleeps == [2.0]
+
+
+def test_generic_chat_stops_when_budget_is_spent(monkeypatch):
+    import llmterface.models.generic_chat as generic_chat_mod
+
+    mock_all_prov()
+    monkeypatch.setattr(generic_chat_mod.time, "sleep", lambda s: pytest.fail("should not sleep"))
+    config = llm.GenericConfig(
+        provider=FakeProviderConfig.PROVIDER,
+        retry_policy=llm.RetryPolicy(initial_delay=2.0, jitter=0.0, max_elapsed=1.0),
+    )
+    chat = llm.GenericChat("c", client_chat=FailingOnceChat(id="c", config=config), config=config)
+
+    with pytest.raises(ex.ClientError) as exc_info:
+        chat.ask(llm.Question(question="hi"))
+    assert isinstance(exc_info.value.__cause__, ex.ProviderError)
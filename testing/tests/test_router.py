@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import llmterface as llm
+import llmterface.exceptions as ex
+import pytest
+from llmterface.providers.provider_spec import ProviderSpec
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+def _question(prompt: str = "hello") -> llm.Question:
+    return llm.Question(question=prompt, config=llm.GenericConfig(provider="primary"), max_retries=0)
+
+
+def test_fails_over_on_provider_error():
+    router = llm.Router(["primary", "secondary"])
+    seen = []
+
+    def ask(question):
+        seen.append(question.config.provider)
+        if question.config.provider == "primary":
+            raise ex.ClientError("wrapped") from ex.ProviderError("down")
+        return question.config.provider
+
+    assert router.ask(ask, _question()) == "secondary"
+    assert seen == ["primary", "secondary"]
+    stats = router.stats()
+    assert stats["primary"].error_rate == 1.0 and stats["secondary"].error_rate == 0.0
+
+
+def test_schema_errors_do_not_fail_over():
+    router = llm.Router(["primary", "secondary"])
+    seen = []
+
+    def ask(question):
+        seen.append(question.config.provider)
+        raise ex.ClientError("wrapped") from ex.SchemaError("bad json")
+
+    with pytest.raises(ex.ClientError):
+        router.ask(ask, _question())
+    assert seen == ["primary"]
+    assert router.stats()["primary"].error_rate == 0.0
+
+
+def test_raises_last_error_when_every_route_fails():
+    router = llm.Router(["primary", "secondary"])
+
+    def ask(question):
+        raise ex.ProviderError(question.config.provider)
+
+    with pytest.raises(ex.ProviderError, match="secondary"):
+        router.ask(ask, _question())
+
+
+def test_unhealthy_routes_move_to_the_back():
+    router = llm.Router(["primary", "secondary"], min_samples=3, max_error_rate=0.5)
+
+    def ask(question):
+        if question.config.provider == "primary":
+            raise ex.ProviderError("down")
+        return question.config.provider
+
+    for _ in range(3):
+        router.ask(ask, _question())
+    assert [route.provider for route in router.order()] == ["secondary", "primary"]
+
+
+def test_latency_strategy_prefers_the_fastest_route():
+    router = llm.Router(["slow", "fast"], strategy="latency", min_samples=1)
+    router._stats["slow"].record(0.5, error=False)
+    router._stats["fast"].record(0.1, error=False)
+    assert [route.provider for route in router.order()] == ["fast", "slow"]
+    snapshot = router.stats()["slow"]
+    assert snapshot.samples == 1 and snapshot.p50 == snapshot.p99 == 0.5
+
+
+def test_weighted_strategy_follows_weights():
+    router = llm.Router([llm.Route(provider="heavy", weight=9), llm.Route(provider="light", weight=1)], "weighted")
+    firsts = [router.order()[0].provider for _ in range(500)]
+    assert 0.8 < firsts.count("heavy") / len(firsts) < 0.97
+
+
+def test_route_applies_model_tier():
+    route = llm.Route(provider="secondary", model=llm.GenericModelType.text_lite)
+    question = route.apply(_question())
+    assert question.config.provider == "secondary"
+    assert question.config.model == llm.GenericModelType.text_lite
+    assert route.key == f"secondary:{llm.GenericModelType.text_lite.value}"
+
+
+def test_hedged_request_returns_the_faster_answer():
+    router = llm.Router(["slow", "fast"], hedge_after=0.02)
+    release = threading.Event()
+
+    def ask(question):
+        if question.config.provider == "slow":
+            release.wait(1)
+        return question.config.provider
+
+    try:
+        assert router.ask(ask, _question()) == "fast"
+    finally:
+        release.set()
+        router.close()
+
+
+def test_async_hedge_cancels_the_loser():
+    router = llm.Router(["slow", "fast"], hedge_after=0.02)
+    cancelled = []
+
+    async def ask(question):
+        if question.config.provider == "slow":
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(question.config.provider)
+                raise
+        return question.config.provider
+
+    assert asyncio.run(router.aask(ask, _question())) == "fast"
+    assert cancelled == ["slow"]
+
+
+def test_llmterface_routes_stateless_asks(monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    class DownChat(FakeChat):
+        def ask(self, question, provider_config):
+            raise ex.ProviderError("down")
+
+    mock_all_prov()
+    monkeypatch.setitem(
+        _PROVIDER_SPECS, "primary", ProviderSpec(provider="primary", config_cls=FakeProviderConfig, chat_cls=DownChat)
+    )
+    monkeypatch.setitem(
+        _PROVIDER_SPECS,
+        "secondary",
+        ProviderSpec(provider="secondary", config_cls=FakeProviderConfig, chat_cls=FakeChat),
+    )
+    handler = llm.LLMterface(router=llm.Router(["primary", "secondary"]))
+    started = time.perf_counter()
+    assert handler.ask(llm.Question(question="hi", max_retries=0)) == "mock response"
+    assert time.perf_counter() - started < 1
+    assert asyncio.run(handler.aask(llm.Question(question="hi", max_retries=0))) == "mock response"
+    assert handler.router.stats()["primary"].samples == 2
+    handler.close()
@@ -0,0 +1,128 @@
+import asyncio
+import typing as t
+
+import llmterface as llm
+import pytest
+from llmterface.deadline import remaining_time
+from llmterface.providers.provider_spec import ProviderSpec
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+np = pytest.importorskip("numpy")
+
+from llmterface.semantic_cache import SemanticCache  # noqa: E402
+
+VOCAB = ["capital", "france", "paris", "weather", "swallow", "speed", "the", "what", "is", "of"]
+
+
+def bag_of_words(text: str) -> list[float]:
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(word)) for word in VOCAB]
+
+
+class EmbeddingChat(FakeChat):
+    asks: t.ClassVar[int] = 0
+    embed_budgets: t.ClassVar[list[float | None]] = []
+
+    def ask(self, question, provider_config):
+        EmbeddingChat.asks += 1
+        return super().ask(question, provider_config)
+
+    def embed(self, texts, provider_config):
+        EmbeddingChat.embed_budgets.append(remaining_time())
+        return [bag_of_words(text) for text in texts]
+
+
+@pytest.fixture
+def embedding_provider(monkeypatch):
+    from llmterface.providers.discovery import _PROVIDER_SPECS
+
+    mock_all_prov()
+    EmbeddingChat.asks = 0
+    EmbeddingChat.embed_budgets = []
+    monkeypatch.setitem(
+        _PROVIDER_SPECS, "mock", ProviderSpec(provider="mock", config_cls=FakeProviderConfig, chat_cls=EmbeddingChat)
+    )
+
+
+def test_similar_vectors_hit_within_their_scope():
+    cache = SemanticCache(threshold=0.9)
+    cache.set("a", [1.0, 0.0, 0.0], "first")
+    cache.set("a", [0.0, 1.0, 0.0], "second")
+    cache.set("b", [1.0, 0.05, 0.0], "other scope")
+
+    assert cache.get("a", [0.98, 0.1, 0.0]) == "first"
+    assert cache.get("a", [0.0, 0.0, 1.0]) is None
+    assert cache.get("c", [1.0, 0.0, 0.0]) is None
+    assert cache.stats.hits == 1 and cache.stats.misses == 2
+    with pytest.raises(ValueError):
+        cache.set("a", [1.0, 0.0], "wrong dimension")
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = SemanticCache(threshold=0.99, max_size=2)
+    cache.set("s", [1.0, 0.0, 0.0], "x")
+    cache.set("s", [0.0, 1.0, 0.0], "y")
+    assert cache.get("s", [1.0, 0.0, 0.0]) == "x"
+    cache.set("s", [0.0, 0.0, 1.0], "z")
+
+    assert len(cache) == 2 and cache.stats.evictions == 1
+    assert cache.get("s", [0.0, 1.0, 0.0]) is None
+    assert cache.get("s", [1.0, 0.0, 0.0]) == "x"
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "semantic.npz"
+    cache = SemanticCache(path=path)
+    for i in range(3):
+        cache.set(f"scope-{i % 2}", np.eye(3)[i], f"text-{i}")
+    cache.close()
+
+    restored = SemanticCache(path=path)
+    assert len(restored) == 3
+    assert restored.get("scope-0", [0.0, 0.0, 1.0]) == "text-2"
+    assert SemanticCache(path=path, max_size=1).get("scope-0", [1.0, 0.0, 0.0]) is None
+
+
+def test_hnsw_index_matches_flat_results():
+    pytest.importorskip("hnswlib")
+    cache = SemanticCache(threshold=0.9, index="hnsw")
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8))
+    for i, vector in enumerate(vectors):
+        cache.set("s" if i % 2 else "t", vector, str(i))
+    assert cache.get("s", vectors[7] + 0.01) == "7"
+    assert cache.get("t", vectors[7]) != "7"
+
+
+def test_paraphrased_questions_are_answered_from_cache(embedding_provider):
+    cache = SemanticCache(threshold=0.8)
+    handler = llm.LLMterface(config=llm.GenericConfig(provider="mock"), semantic_cache=cache)
+
+    first = handler.ask_with_metadata("What is the capital of France?")
+    second = handler.ask_with_metadata("what is the capital of france")
+    third = asyncio.run(handler.aask_with_metadata("What's the capital of France?"))
+    handler.ask("What is the weather in Paris?")
+
+    assert first.result == second.result == third.result
+    assert second.response.metadata.get("from_cache") and third.response.metadata.get("from_cache")
+    assert EmbeddingChat.asks == 2
+    assert len(cache) == 2
+
+
+def test_embedding_probe_runs_within_the_deadline(embedding_provider):
+    handler = llm.LLMterface(config=llm.GenericConfig(provider="mock", deadline=5.0), semantic_cache=SemanticCache())
+
+    handler.ask("What is the capital of France?")
+    asyncio.run(handler.aask("What is the weather in Paris?"))
+
+    assert len(EmbeddingChat.embed_budgets) == 2
+    assert all(0 < budget <= 5.0 for budget in EmbeddingChat.embed_budgets)
+
+
+def test_providers_without_embeddings_skip_the_cache():
+    mock_all_prov()
+    cache = SemanticCache()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider="mock"), semantic_cache=cache)
+    assert handler.ask("hello") == "mock response"
+    assert len(cache) == 0 and cache.stats.misses == 0
@@ -0,0 +1,66 @@
+import typing as t
+
+import llmterface as llm
+from llmterface.providers.provider_chat import _TOKEN_COUNTS
+from llmterface.tokens import estimate_tokens
+
+from testing.helpers.fakes import FakeChat, FakeProviderConfig, mock_all_prov
+
+
+class DenseConfig(FakeProviderConfig):
+    CHARS_PER_TOKEN: t.ClassVar[float] = 2.0
+
+
+class CountingChat(FakeChat):
+    remote_calls: t.ClassVar[int] = 0
+
+    def count_tokens_remote(self, question, provider_config, history=()):
+        type(self).remote_calls += 1
+        return 7
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("abcde", chars_per_token=1) == 5
+
+
+def test_local_count_uses_provider_calibration():
+    question = llm.Question(question="x" * 40, config=llm.GenericConfig(system_instruction="y" * 8))
+    assert FakeProviderConfig().count_tokens(question) == 12
+    assert DenseConfig().count_tokens(question) == 24
+
+
+def test_exact_count_falls_back_to_local_estimate():
+    mock_all_prov()
+    handler = llm.LLMterface(config=llm.GenericConfig(provider=FakeProviderConfig.PROVIDER))
+    assert handler.count_tokens("x" * 40, exact=True) == handler.count_tokens("x" * 40) == 10
+
+
+def test_exact_counts_are_cached():
+    _TOKEN_COUNTS.clear()
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER)
+    chat = CountingChat(id="c", config=config)
+    question = llm.Question(question="hello", config=config)
+
+    assert chat.count_tokens(question, FakeProviderConfig(), exact=True) == 7
+    assert chat.count_tokens(question, FakeProviderConfig(), exact=True) == 7
+    assert CountingChat.remote_calls == 1
+    assert chat.count_tokens(question, FakeProviderConfig()) == 2
+
+
+def test_counts_include_the_chat_history():
+    _TOKEN_COUNTS.clear()
+    mock_all_prov()
+    config = llm.GenericConfig(provider=FakeProviderConfig.PROVIDER)
+    chat = llm.GenericChat("c", client_chat=CountingChat(id="c", config=config), config=config)
+    question = llm.Question(question="x" * 40)
+    assert chat.count_tokens(question) == 10
+    assert chat.count_tokens(question, exact=True) == 7
+    calls = CountingChat.remote_calls
+
+    chat.history.add_exchange("y" * 8, "z" * 12)
+    assert chat.count_tokens(question) == 15
+    chat.count_tokens(question, exact=True)
+    assert CountingChat.remote_calls == calls + 1
+    assert all(isinstance(key[2], str) and len(key[2]) == 64 for key in _TOKEN_COUNTS._data)